@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: per-call cost of the SDK's JSON hot paths with each
+installed backend (see cloudcruise.utils.serializer).
+
+    python benchmarks/bench_json.py
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+from typing import Callable, List
+
+from cloudcruise.utils import serializer
+from cloudcruise.utils.sse import SSEParser
+from cloudcruise.vault.utils import decrypt_data, encrypt_data
+from cloudcruise.webhook.utils import verify_message
+
+KEY = "a" * 64
+SECRET = "webhook-secret"
+
+REQUEST = {
+    "workflow_id": "wf",
+    "run_input_variables": {"url": "https://example.com", "items": [{"sku": i, "qty": i % 7} for i in range(50)]},
+    "webhook": None,
+    "client_id": "c-1",
+}
+RESPONSE = json.dumps({"session_id": "s-1", "status": "execution.success", "data": REQUEST}).encode()
+FRAME = b"event: run.event\ndata: " + json.dumps({"data": {"event": "execution.step", "payload": REQUEST}}).encode() + b"\n\n"
+WEBHOOK = json.dumps({"event": "execution.success", "expires_at": 4102444800, "payload": REQUEST}).encode()
+SIGNATURE = "sha256=" + hmac.new(SECRET.encode(), WEBHOOK, hashlib.sha256).hexdigest()
+
+
+def _per_call(fn: Callable[[], object], calls: int = 2000, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / calls * 1e6
+
+
+def main() -> None:
+    backends: List[str] = ["json"]
+    for name in ("orjson", "ujson"):
+        try:
+            serializer.load_backend(name)  # type: ignore[arg-type]
+            backends.append(name)
+        except ImportError:
+            print(f"({name} not installed)")
+    secret = encrypt_data(REQUEST, KEY)
+    cases = [
+        ("request body encode", lambda: serializer.dumps_bytes(REQUEST)),
+        ("response decode", lambda: serializer.loads(RESPONSE)),
+        ("SSE frame parse", lambda: SSEParser().feed(FRAME)),
+        ("vault encrypt+decrypt", lambda: decrypt_data(encrypt_data(REQUEST, KEY), KEY)),
+        ("vault decrypt", lambda: decrypt_data(secret, KEY)),
+        ("webhook verify", lambda: verify_message(WEBHOOK, SIGNATURE, SECRET)),
+    ]
+    print(f"{'us per call':<24}" + "".join(f"{b:>10}" for b in backends))
+    for title, fn in cases:
+        row = []
+        for name in backends:
+            serializer.set_json_backend(name)  # type: ignore[arg-type]
+            row.append(_per_call(fn))
+        print(f"{title:<24}" + "".join(f"{us:10.2f}" for us in row))
+    serializer.set_json_backend("auto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark: reader-thread CPU per 10k mux frames, decoding every frame
+up front (previous behaviour) vs. routing on the raw text and decoding a
+run event's body only when a consumer reads it.
+
+    python benchmarks/bench_routing.py
+"""
+from __future__ import annotations
+
+import json
+import time
+from typing import Callable, List, Set
+
+from cloudcruise.events.run_event import RunEvent
+from cloudcruise.utils.connection_manager import _decoded, route_frame, route_run_event
+from cloudcruise.utils.sse import SSEParser
+
+FRAMES = 10_000
+
+
+def _stream(subscribed_share: float) -> bytes:
+    frames = []
+    for i in range(FRAMES):
+        if i % 5 == 0:
+            frames.append(f"id: {i}\nevent: ping\ndata: {json.dumps({'ts': i})}\n\n")
+            continue
+        session = f"s-{i % 40}" if (i % 100) / 100 < subscribed_share else f"other-{i % 400}"
+        data = {
+            "data": {
+                "event": "execution.step",
+                "payload": {
+                    "session_id": session,
+                    "workflow_id": "wf",
+                    "current_step": f"step {i}",
+                    "next_step": f"step {i + 1}",
+                    "context": {"items": list(range(20)), "note": "x" * 200},
+                },
+                "timestamp": i,
+            }
+        }
+        frames.append(f"id: {i}\nevent: run.event\ndata: {json.dumps(data)}\n\n")
+    return "".join(frames).encode("utf-8")
+
+
+def eager(body: bytes, subscribed: Set[str], read_payload: bool) -> int:
+    routed = 0
+    for evt in SSEParser().feed(body):
+        if evt["event"] != "run.event":
+            continue
+        hit = route_run_event(evt)
+        if hit is None:
+            continue
+        session_id, data = hit
+        msg = RunEvent(data)
+        if session_id in subscribed:
+            routed += 1
+            if read_payload:
+                msg.payload
+    return routed
+
+
+def lazy(body: bytes, subscribed: Set[str], read_payload: bool) -> int:
+    routed = 0
+    for evt in SSEParser(decode_json=False).feed(body):
+        if evt["event"] == "ping":
+            if not subscribed:
+                continue
+            _decoded(evt)
+            continue
+        hit = route_frame(evt["data"])
+        if hit is None:
+            continue
+        session_id, msg = hit
+        if session_id in subscribed:
+            routed += 1
+            if read_payload:
+                msg.payload
+    return routed
+
+
+def _cpu(fn: Callable[[], int], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        fn()
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def main() -> None:
+    subscribed = {f"s-{i}" for i in range(40)}
+    scenarios: List[tuple] = [
+        ("10% of run events for this process, payloads unread", 0.1, False),
+        ("10% of run events for this process, payloads read", 0.1, True),
+        ("all run events for this process, payloads read", 1.0, True),
+    ]
+    print(f"CPU per {FRAMES} frames (20% pings)")
+    for title, share, read_payload in scenarios:
+        body = _stream(share)
+        assert eager(body, subscribed, read_payload) == lazy(body, subscribed, read_payload)
+        before = _cpu(lambda: eager(body, subscribed, read_payload))
+        after = _cpu(lambda: lazy(body, subscribed, read_payload))
+        print(title)
+        print(f"  eager decode {before * 1000:9.2f} ms")
+        print(f"  lazy routing {after * 1000:9.2f} ms")
+        print(f"  saved        {(before - after) * 1000:9.2f} ms ({(1 - after / before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
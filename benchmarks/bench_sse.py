@@ -0,0 +1,70 @@
+"""
+Micro-benchmark: incremental SSEParser vs. the previous string-buffer path
+(decode each chunk, re.split the whole pending buffer, _parse_frame).
+
+    python benchmarks/bench_sse.py
+"""
+from __future__ import annotations
+
+import json
+import re
+import time
+from typing import Callable, List
+
+from cloudcruise.utils.sse import SSEParser, _parse_frame
+
+
+def legacy_parse(chunks: List[bytes]) -> int:
+    count = 0
+    buffer = ""
+    for chunk in chunks:
+        text = chunk.decode("utf-8", errors="ignore")
+        parts = re.split(r"\r?\n\r?\n", buffer + text)
+        buffer = parts.pop() if parts else ""
+        for frame in parts:
+            _parse_frame(frame)
+            count += 1
+    return count
+
+
+def incremental_parse(chunks: List[bytes]) -> int:
+    parser = SSEParser()
+    return sum(len(parser.feed(chunk)) for chunk in chunks)
+
+
+def _chunked(data: bytes, size: int) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _run_event(i: int) -> bytes:
+    data = {"event": "execution.step", "payload": {"session_id": f"s-{i % 50}", "step": i}, "timestamp": i}
+    return f"event: run.event\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def _bench(name: str, fn: Callable[[List[bytes]], int], chunks: List[bytes], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(chunks)
+        best = min(best, time.perf_counter() - started)
+    print(f"  {name:<12} {best * 1000:9.2f} ms")
+    return best
+
+
+def main() -> None:
+    small = b"".join(_run_event(i) for i in range(20_000))
+    large = b"data: " + json.dumps({"blob": "x" * 2_000_000}).encode() + b"\n\n"
+    scenarios = [
+        ("20k small events, 4 KiB chunks", _chunked(small, 4096)),
+        ("20k small events, 64 B chunks", _chunked(small, 64)),
+        ("one 2 MB event, 4 KiB chunks", _chunked(large, 4096)),
+    ]
+    for title, chunks in scenarios:
+        print(title)
+        legacy = _bench("legacy", legacy_parse, chunks)
+        incremental = _bench("incremental", incremental_parse, chunks)
+        print(f"  speedup      {legacy / incremental:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,28 @@
 from .cloudcruise import CloudCruise, CloudCruiseParams
+from .async_cloudcruise import AsyncCloudCruise
+from .utils.transport import TransportOptions, TransportStats
+from .utils.retry import RetryPolicy
+from .utils.serializer import set_json_backend
+from .utils.connection_manager import ResumeStats, ShardStats
+from .utils.pending_events import PendingEventStats
+from .utils.dispatch import DispatchOptions, DispatchStats
+from .utils.heartbeat import HeartbeatOptions, HeartbeatStats
+from .utils.reconnect import ReconnectPolicy, ReconnectStats
+from .utils.polling_connection_manager import PollingOptions, PollingStats
+from .utils.runtime import RuntimeStats
+from .runs.cache import ResultCacheOptions, ResultCacheStats
+from .utils.sharded_connection_manager import ShardingOptions
+from .errors import (
+    CloudCruiseError,
+    APIError,
+    BadRequestError,
+    AuthenticationError,
+    NotFoundError,
+    RateLimitError,
+    ServerError,
+    APIConnectionError,
+    APITimeoutError,
+)
 
 from .vault.types import (
     VaultEntry,
@@ -13,6 +37,7 @@ from .workflows.types import (
     WorkflowMetadata,
     InputValidationError,
 )
+from .workflows.cache import MetadataCacheStats
 
 from .runs.types import (
     EventType,
@@ -31,6 +56,13 @@ from .runs.types import (
     WebhookEvent,
     WebhookReplayResponse,
     RunHandle,
+    AsyncRunHandle,
+    StartManyResult,
+    CompletedRun,
+    RunTimeoutError,
+    RunCancelledError,
+    CancellationToken,
+    QueueStats,
     RunStreamOptions,
     SseEventName,
     SseMessage,
@@ -50,6 +82,7 @@ from .runs.types import (
     ScreenshotUploadedPayload,
     EventWebhookMessage,
     RunEventMessage,
+    RunEvent,
 )
 
 from .webhook.types import WebhookPayload, WebhookVerificationOptions, VerificationError, WebhookMessage
@@ -58,6 +91,36 @@ from ._default import get_client as client
 __all__ = [
     "CloudCruise",
     "CloudCruiseParams",
+    "AsyncCloudCruise",
+    "TransportOptions",
+    "TransportStats",
+    "RetryPolicy",
+    "set_json_backend",
+    "ResumeStats",
+    "PendingEventStats",
+    "DispatchOptions",
+    "DispatchStats",
+    "ShardingOptions",
+    "ShardStats",
+    "HeartbeatOptions",
+    "HeartbeatStats",
+    "ReconnectPolicy",
+    "ReconnectStats",
+    "RuntimeStats",
+    "PollingOptions",
+    "PollingStats",
+    "ResultCacheOptions",
+    "ResultCacheStats",
+    # Errors
+    "CloudCruiseError",
+    "APIError",
+    "BadRequestError",
+    "AuthenticationError",
+    "NotFoundError",
+    "RateLimitError",
+    "ServerError",
+    "APIConnectionError",
+    "APITimeoutError",
     # Default client helper
     "client",
     # Vault Types
@@ -70,6 +133,7 @@ __all__ = [
     "WorkflowInputSchema",
     "WorkflowMetadata",
     "InputValidationError",
+    "MetadataCacheStats",
     # Run Types
     "EventType",
     "DryRun",
@@ -87,6 +151,13 @@ __all__ = [
     "WebhookEvent",
     "WebhookReplayResponse",
     "RunHandle",
+    "AsyncRunHandle",
+    "StartManyResult",
+    "CompletedRun",
+    "RunTimeoutError",
+    "RunCancelledError",
+    "CancellationToken",
+    "QueueStats",
     "RunStreamOptions",
     "SseEventName",
     "SseMessage",
@@ -106,6 +177,7 @@ __all__ = [
     "ScreenshotUploadedPayload",
     "EventWebhookMessage",
     "RunEventMessage",
+    "RunEvent",
     # Webhook Types
     "WebhookPayload",
     "WebhookVerificationOptions",
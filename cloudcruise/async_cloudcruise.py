@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from .cloudcruise import (
+    CloudCruiseParams,
+    _attempt_timeout,
+    _is_idempotent,
+    _prepare_request,
+    _resolve_credentials,
+    _workflows_kwargs,
+)
+from .errors import CloudCruiseError
+from .utils.retry import RetryPolicy, RetryState
+from .utils.transport import ApiResponse, HttpTransport, decode_response
+from .utils.async_connection_manager import AsyncConnectionManager
+from .vault.async_client import AsyncVaultClient
+from .workflows.async_client import AsyncWorkflowsClient
+from .runs.async_client import AsyncRunsClient
+from .webhook.async_client import AsyncWebhookClient
+
+
+# CloudCruiseParams fields only the threaded client implements
+_SYNC_ONLY = ("polling", "sharding", "event_dispatch")
+
+
+def _reject_sync_only(params: CloudCruiseParams) -> None:
+    unsupported = [name for name in _SYNC_ONLY if getattr(params, name) is not None]
+    if unsupported:
+        raise ValueError(
+            f"AsyncCloudCruise does not support {', '.join(unsupported)}; use CloudCruise for these options"
+        )
+
+
+class AsyncCloudCruise:
+    """
+    asyncio flavour of the CloudCruise client.
+
+    Run streams are multiplexed over one SSE connection read directly on the
+    event loop, so any number of runs can be tracked without extra threads.
+    REST calls go through the pooled HTTP transport on a small executor sized
+    to the connection pool. `polling`, `sharding` and `event_dispatch` are
+    not supported (ValueError); `shared_runtime` has no effect.
+    """
+
+    # Expose typed attributes for IDE autocomplete
+    vault: AsyncVaultClient
+    workflows: AsyncWorkflowsClient
+    runs: AsyncRunsClient
+    webhook: AsyncWebhookClient
+    transport: HttpTransport
+
+    def __init__(self, params: Optional[CloudCruiseParams] = None) -> None:
+        params = params or CloudCruiseParams()
+        _reject_sync_only(params)
+        api_key, base_url, encryption_key = _resolve_credentials(params)
+
+        self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._encryption_key = encryption_key
+
+        self.transport = HttpTransport(params.transport)
+        self._retry_policy = params.retry or RetryPolicy()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.transport.options.pool_maxsize,
+            thread_name_prefix="cloudcruise-http",
+        )
+        # Identical GETs in flight, keyed like HttpTransport.coalesce_key
+        self._in_flight: Dict[Any, "asyncio.Future[Any]"] = {}
+
+        # Initialize namespace clients
+        self._connection_manager = AsyncConnectionManager(
+            self._base_url, self._api_key, heartbeat=params.heartbeat, reconnect=params.reconnect
+        )
+        self.vault = AsyncVaultClient(self._make_request, self._encryption_key)
+        self.workflows = AsyncWorkflowsClient(self._make_request, **_workflows_kwargs(params))
+        self.runs = AsyncRunsClient(
+            self._connection_manager, self._make_request, self.workflows, result_cache=params.result_cache
+        )
+        self.webhook = AsyncWebhookClient()
+
+    async def __aenter__(self) -> "AsyncCloudCruise":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the SSE mux connection and releases pooled HTTP connections."""
+        await self._connection_manager.aclose()
+        self._executor.shutdown(wait=False)
+        self.transport.close()
+
+    def _send(
+        self, method: str, url: str, headers: Dict[str, str], data: Optional[str], timeout: float, raw: bool
+    ) -> Any:
+        resp = self.transport.send(method, url, headers=headers, data=data, timeout=timeout)
+        body = decode_response(resp)
+        return ApiResponse(resp.status_code, resp.headers, body) if raw else body
+
+    async def _make_request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Any] = None,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        raw: bool = False,
+    ) -> Any:
+        """
+        Makes an HTTP request to the CloudCruise API
+        Automatically adds the cc-key header for authentication and retries
+        transient failures according to the configured RetryPolicy
+        With raw=True the decoded body is wrapped in an ApiResponse together
+        with the status code and response headers
+        Concurrent identical GETs share one in-flight request (see
+        TransportOptions.coalesce_gets); each caller gets its own copy of
+        the decoded body
+        """
+        url, req_headers, data = _prepare_request(self._base_url, self._api_key, path, body, headers)
+        key = self.transport.coalesce_key(method, path, url, req_headers)
+        if key is None:
+            return await self._send_with_retries(method, url, req_headers, data, raw)
+        key = (key, raw)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(
+                self._send_with_retries(method, url, req_headers, data, raw)
+            )
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # A cancelled caller must not cancel the request the others wait for
+            return await asyncio.shield(task)
+        self.transport.record_coalesced()
+        # The caller that started the request owns the original; mutations must not leak
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _send_with_retries(
+        self, method: str, url: str, req_headers: Dict[str, str], data: Optional[Any], raw: bool
+    ) -> Any:
+        state = RetryState(self._retry_policy, method, _is_idempotent(self._retry_policy, method, req_headers))
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                timeout = _attempt_timeout(state, self.transport.options.timeout)
+                return await loop.run_in_executor(
+                    self._executor, self._send, method, url, req_headers, data, timeout, raw
+                )
+            except CloudCruiseError as e:
+                delay = state.next_delay(e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
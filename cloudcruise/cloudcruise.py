@@ -1,22 +1,105 @@
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass
-from typing import Any, Optional
-import json
-import requests
+from typing import Any, Dict, Optional, Tuple
+import time
 
+from .errors import CloudCruiseError
 from .utils.env import get_env
+from .utils.serializer import dumps_bytes
+from .utils.retry import IDEMPOTENCY_KEY_HEADER, RetryPolicy, RetryState
+from .utils.transport import ApiResponse, HttpTransport, TransportOptions, decode_response
 from .vault.client import VaultClient
 from .workflows.client import WorkflowsClient
+from .runs.cache import ResultCacheOptions
 from .runs.client import RunsClient
 from .webhook.client import WebhookClient
 from .utils.connection_manager import ConnectionManager
+from .utils.dispatch import DispatchOptions
+from .utils.heartbeat import HeartbeatOptions
+from .utils.reconnect import ReconnectPolicy
+from .utils.polling_connection_manager import PollingConnectionManager, PollingOptions
+from .utils.runtime import get_runtime
+from .utils.sharded_connection_manager import ShardedConnectionManager, ShardingOptions
 
 @dataclass
 class CloudCruiseParams:
     api_key: Optional[str] = None
     base_url: Optional[str] = None
     encryption_key: Optional[str] = None
+    transport: Optional[TransportOptions] = None
+    retry: Optional[RetryPolicy] = None
+    # Seconds workflow metadata is reused before being revalidated
+    workflow_metadata_ttl: Optional[float] = None
+    # How run event callbacks are executed; see DispatchOptions. Sync client only
+    event_dispatch: Optional[DispatchOptions] = None
+    # Spread runs over several event streams; None keeps a single stream. Sync client only
+    sharding: Optional[ShardingOptions] = None
+    # Ping-based stall detection on run event streams; see HeartbeatOptions
+    heartbeat: Optional[HeartbeatOptions] = None
+    # Backoff of event stream reconnects, which never give up; see ReconnectPolicy
+    reconnect: Optional[ReconnectPolicy] = None
+    # Read event streams and run reconnect/heartbeat timers on the SDK's one
+    # shared I/O thread; False gives every stream its own threads. The async
+    # client reads on its own event loop and ignores this
+    shared_runtime: bool = True
+    # Poll run statuses instead of streaming events, for networks that block
+    # long-lived SSE; see PollingOptions. Takes precedence over sharding. Sync client only
+    polling: Optional[PollingOptions] = None
+    # Cache final run results in memory (see ResultCacheOptions); None disables it
+    result_cache: Optional[ResultCacheOptions] = None
+
+
+def _resolve_credentials(params: CloudCruiseParams) -> Tuple[str, str, str]:
+    api_key = params.api_key or get_env("CLOUDCRUISE_API_KEY")
+    base_url = params.base_url or get_env("CLOUDCRUISE_BASE_URL") or "https://api.cloudcruise.com"
+    encryption_key = params.encryption_key or get_env("CLOUDCRUISE_ENCRYPTION_KEY")
+
+    if not api_key:
+        raise ValueError("Missing apiKey. Provide via params.api_key or CLOUDCRUISE_API_KEY env var.")
+    if not encryption_key:
+        raise ValueError(
+            "Missing encryptionKey. Provide via params.encryption_key or CLOUDCRUISE_ENCRYPTION_KEY env var."
+        )
+    return api_key, base_url, encryption_key
+
+
+def _prepare_request(
+    base_url: str,
+    api_key: str,
+    path: str,
+    body: Optional[Any],
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Tuple[str, Dict[str, str], Optional[bytes]]:
+    url = f"{base_url}{path}"
+    headers = {
+        **(extra_headers or {}),
+        "cc-key": api_key,
+    }
+    # Only send Content-Type when we have a JSON body
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+    return url, headers, (dumps_bytes(body) if body is not None else None)
+
+
+def _is_idempotent(policy: RetryPolicy, method: str, headers: Dict[str, str]) -> bool:
+    if method.upper() in policy.idempotent_methods:
+        return True
+    # Replaying a keyed POST relies on the server de-duplicating it, so it is opt-in
+    return policy.retry_idempotency_keyed and IDEMPOTENCY_KEY_HEADER in headers
+
+
+def _workflows_kwargs(params: CloudCruiseParams) -> Dict[str, Any]:
+    if params.workflow_metadata_ttl is None:
+        return {}
+    return {"metadata_ttl": params.workflow_metadata_ttl}
+
+
+def _attempt_timeout(state: RetryState, timeout: float) -> float:
+    # Never let a single attempt outlive the overall retry deadline
+    remaining = state.remaining()
+    return timeout if remaining is None else max(min(timeout, remaining), 0.001)
 
 
 class CloudCruise:
@@ -30,67 +113,112 @@ class CloudCruise:
     workflows: WorkflowsClient
     runs: RunsClient
     webhook: WebhookClient
+    transport: HttpTransport
 
     def __init__(self, params: Optional[CloudCruiseParams] = None) -> None:
         params = params or CloudCruiseParams()
-        api_key = params.api_key or get_env("CLOUDCRUISE_API_KEY")
-        base_url = params.base_url or get_env("CLOUDCRUISE_BASE_URL") or "https://api.cloudcruise.com"
-        encryption_key = params.encryption_key or get_env("CLOUDCRUISE_ENCRYPTION_KEY")
-
-        if not api_key:
-            raise ValueError("Missing apiKey. Provide via params.api_key or CLOUDCRUISE_API_KEY env var.")
-        if not encryption_key:
-            raise ValueError(
-                "Missing encryptionKey. Provide via params.encryption_key or CLOUDCRUISE_ENCRYPTION_KEY env var."
-            )
+        api_key, base_url, encryption_key = _resolve_credentials(params)
 
         self._api_key = api_key
         self._base_url = base_url.rstrip("/")
         self._encryption_key = encryption_key
 
+        # One pooled keep-alive transport shared by every namespace client
+        self.transport = HttpTransport(params.transport)
+        self._retry_policy = params.retry or RetryPolicy()
+
         # Initialize namespace clients
-        self._connection_manager = ConnectionManager(self._base_url, self._api_key)
+        runtime = get_runtime() if params.shared_runtime else None
+        if params.polling is not None:
+            self._connection_manager = PollingConnectionManager(
+                self._base_url,
+                self._api_key,
+                lambda session_id: self._make_request("GET", f"/run/{session_id}"),
+                params.polling,
+                params.event_dispatch,
+                runtime=runtime,
+            )
+        elif params.sharding is not None:
+            self._connection_manager = ShardedConnectionManager(
+                self._base_url,
+                self._api_key,
+                params.sharding,
+                params.event_dispatch,
+                heartbeat=params.heartbeat,
+                reconnect=params.reconnect,
+                runtime=runtime,
+            )
+        else:
+            self._connection_manager = ConnectionManager(
+                self._base_url,
+                self._api_key,
+                params.event_dispatch,
+                heartbeat=params.heartbeat,
+                reconnect=params.reconnect,
+                runtime=runtime,
+            )
         self.vault = VaultClient(self._make_request, self._encryption_key)
-        self.workflows = WorkflowsClient(self._make_request)
-        self.runs = RunsClient(self._connection_manager, self._make_request, self.workflows)
+        self.workflows = WorkflowsClient(self._make_request, **_workflows_kwargs(params))
+        self.runs = RunsClient(
+            self._connection_manager, self._make_request, self.workflows, result_cache=params.result_cache
+        )
         self.webhook = WebhookClient()
 
-    def _make_request(self, method: str, path: str, body: Optional[Any] = None) -> Any:
+    def __enter__(self) -> "CloudCruise":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the event streams, stops their reconnects and releases pooled HTTP connections."""
+        self._connection_manager.close()
+        self.transport.close()
+
+    def _make_request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Any] = None,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        raw: bool = False,
+    ) -> Any:
         """
         Makes an HTTP request to the CloudCruise API
-        Automatically adds the cc-key header for authentication
+        Automatically adds the cc-key header for authentication and retries
+        transient failures according to the configured RetryPolicy
+        With raw=True the decoded body is wrapped in an ApiResponse together
+        with the status code and response headers
+        Concurrent identical GETs share one in-flight request (see
+        TransportOptions.coalesce_gets); each caller gets its own copy of
+        the decoded body
         """
-        url = f"{self._base_url}{path}"
-        headers = {
-            "cc-key": self._api_key,
-        }
-        try:
-            # Only send Content-Type when we have a JSON body
-            if body is not None:
-                headers["Content-Type"] = "application/json"
-
-            resp = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                data=(json.dumps(body) if body is not None else None),
-                timeout=60,
-            )
-            if not resp.ok:
-                error_text = resp.text
-                error_message = f"HTTP {resp.status_code}: {resp.reason}"
-                try:
-                    error_json = resp.json()
-                    error_message = error_json.get("message") or error_json.get("error") or error_message
-                except Exception:
-                    pass
-                raise RuntimeError(error_message)
-
-            ctype = resp.headers.get("content-type", "")
-            if "application/json" in ctype:
-                return resp.json()
-
-            else:
-                return resp.text
-        except Exception as e:
-            raise e
+        url, req_headers, data = _prepare_request(self._base_url, self._api_key, path, body, headers)
+        key = self.transport.coalesce_key(method, path, url, req_headers)
+        if key is None:
+            return self._send_with_retries(method, url, req_headers, data, raw)
+        result, shared = self.transport.flights.do(
+            (key, raw), lambda: self._send_with_retries(method, url, req_headers, data, raw)
+        )
+        if shared:
+            self.transport.record_coalesced()
+            # The leader's caller owns the original; mutations must not leak
+            result = copy.deepcopy(result)
+        return result
+
+    def _send_with_retries(
+        self, method: str, url: str, req_headers: Dict[str, str], data: Optional[Any], raw: bool
+    ) -> Any:
+        state = RetryState(self._retry_policy, method, _is_idempotent(self._retry_policy, method, req_headers))
+        while True:
+            try:
+                timeout = _attempt_timeout(state, self.transport.options.timeout)
+                resp = self.transport.send(method, url, headers=req_headers, data=data, timeout=timeout)
+                body = decode_response(resp)
+                return ApiResponse(resp.status_code, resp.headers, body) if raw else body
+            except CloudCruiseError as e:
+                delay = state.next_delay(e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
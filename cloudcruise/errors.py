@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+class CloudCruiseError(RuntimeError):
+    """Base class for errors raised by the CloudCruise HTTP layer."""
+
+
+class APIError(CloudCruiseError):
+    """The API answered with a non-2xx status code."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int,
+        body: Optional[Any] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.statusCode = status_code
+        self.body = body
+        self.retryAfter = retry_after
+
+
+class BadRequestError(APIError):
+    """400/422: the request was rejected as invalid."""
+
+
+class AuthenticationError(APIError):
+    """401/403: missing or invalid API key."""
+
+
+class NotFoundError(APIError):
+    """404: the requested resource does not exist."""
+
+
+class RateLimitError(APIError):
+    """429: too many requests."""
+
+
+class ServerError(APIError):
+    """5xx: the API failed to handle the request."""
+
+
+class APIConnectionError(CloudCruiseError):
+    """The request never produced a response (DNS, refused, reset, ...)."""
+
+
+class APITimeoutError(APIConnectionError):
+    """The request timed out before a response arrived."""
+
+
+def api_error_for(
+    status_code: int,
+    message: str,
+    body: Optional[Any] = None,
+    retry_after: Optional[float] = None,
+) -> APIError:
+    cls: type[APIError] = APIError
+    if status_code in (400, 422):
+        cls = BadRequestError
+    elif status_code in (401, 403):
+        cls = AuthenticationError
+    elif status_code == 404:
+        cls = NotFoundError
+    elif status_code == 429:
+        cls = RateLimitError
+    elif status_code >= 500:
+        cls = ServerError
+    return cls(message, status_code, body, retry_after)
+
+
+__all__ = [
+    "CloudCruiseError",
+    "APIError",
+    "BadRequestError",
+    "AuthenticationError",
+    "NotFoundError",
+    "RateLimitError",
+    "ServerError",
+    "APIConnectionError",
+    "APITimeoutError",
+]
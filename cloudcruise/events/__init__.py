@@ -19,6 +19,7 @@ from .types import (
     RunEventMessage,
     RunEventMessageData,
 )
+from .run_event import RunEvent
 
 __all__ = [
     # Event payload types
@@ -40,4 +41,6 @@ __all__ = [
     "WebhookMessage",
     "RunEventMessage",
     "RunEventMessageData",
+    # Delivered run events
+    "RunEvent",
 ]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, cast
+
+from ..utils.serializer import loads
+from .types import (
+    AgentErrorAnalysisPayload,
+    EndRunPayload,
+    ExecutionQueuedPayload,
+    ExecutionRequeuedPayload,
+    ExecutionStartPayload,
+    ExecutionStepPayload,
+    FileUploadedPayload,
+    InteractionFinishedPayload,
+    InteractionWaitingPayload,
+    ScreenshotUploadedPayload,
+)
+
+_TERMINAL = ("execution.success", "execution.failed", "execution.stopped")
+_KEYS = ("event", "data", "type", "payload", "timestamp", "expires_at", "_raw")
+
+
+class RunEvent(Mapping):
+    """
+    One run event, built once per stream frame and shared by the handle's
+    listeners and its iteration queue. Immutable.
+
+    Reads like both shapes earlier versions produced: the envelope
+    (`evt["event"] == "run.event"`, `evt["data"]["event"]`) and the flattened
+    listener dict (`evt["type"]`, `evt["payload"]`, `evt["_raw"]`). When
+    built from JSON text, the body is only decoded on first access.
+    """
+
+    __slots__ = ("_type", "_data", "_text")
+
+    def __init__(self, data: Dict[str, Any], event_type: Optional[str] = None) -> None:
+        if event_type is None:
+            event_type = data.get("event")
+        object.__setattr__(self, "_type", event_type)
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_text", None)
+
+    @classmethod
+    def from_json(cls, text: str, event_type: Optional[str] = None) -> "RunEvent":
+        """
+        A RunEvent whose JSON `text` is decoded lazily. The text is the inner
+        event data or a mux envelope wrapping it as {"data": {...}}.
+        """
+        evt = cls.__new__(cls)
+        object.__setattr__(evt, "_type", event_type)
+        object.__setattr__(evt, "_data", None)
+        object.__setattr__(evt, "_text", text)
+        return evt
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("RunEvent is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("RunEvent is immutable")
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The inner event data: {'event', 'payload', 'timestamp', 'expires_at'}."""
+        # Read the text first: a concurrent decode sets _data before clearing it
+        text = self._text
+        data = self._data
+        if data is None:
+            decoded = loads(text)
+            data = decoded if isinstance(decoded, dict) else {}
+            if isinstance(data.get("data"), dict):
+                data = data["data"]
+            if self._type is None:
+                object.__setattr__(self, "_type", data.get("event"))
+            object.__setattr__(self, "_data", data)
+            object.__setattr__(self, "_text", None)
+        return data
+
+    @property
+    def type(self) -> Optional[str]:
+        if self._type is None:
+            return self.data.get("event")
+        return self._type
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        payload = self.data.get("payload")
+        return payload if isinstance(payload, dict) else {}
+
+    @property
+    def timestamp(self) -> Any:
+        return self.data.get("timestamp")
+
+    @property
+    def expires_at(self) -> Any:
+        return self.data.get("expires_at")
+
+    @property
+    def session_id(self) -> Optional[str]:
+        payload = self.payload
+        return payload.get("session_id") or payload.get("sessionId") or self.data.get("session_id")
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.type in _TERMINAL
+
+    # Typed payload accessors: the payload when the event has that type, else None
+
+    def _payload_if(self, *types: str) -> Any:
+        return self.payload if self.type in types else None
+
+    def queued(self) -> Optional[ExecutionQueuedPayload]:
+        return cast(Optional[ExecutionQueuedPayload], self._payload_if("execution.queued"))
+
+    def started(self) -> Optional[ExecutionStartPayload]:
+        return cast(Optional[ExecutionStartPayload], self._payload_if("execution.start"))
+
+    def step(self) -> Optional[ExecutionStepPayload]:
+        return cast(Optional[ExecutionStepPayload], self._payload_if("execution.step"))
+
+    def requeued(self) -> Optional[ExecutionRequeuedPayload]:
+        return cast(Optional[ExecutionRequeuedPayload], self._payload_if("execution.requeued"))
+
+    def interaction_waiting(self) -> Optional[InteractionWaitingPayload]:
+        return cast(Optional[InteractionWaitingPayload], self._payload_if("interaction.waiting"))
+
+    def interaction_finished(self) -> Optional[InteractionFinishedPayload]:
+        return cast(Optional[InteractionFinishedPayload], self._payload_if("interaction.finished"))
+
+    def error_analysis(self) -> Optional[AgentErrorAnalysisPayload]:
+        return cast(Optional[AgentErrorAnalysisPayload], self._payload_if("agent.error_analysis"))
+
+    def file_uploaded(self) -> Optional[FileUploadedPayload]:
+        return cast(Optional[FileUploadedPayload], self._payload_if("file.uploaded"))
+
+    def screenshot_uploaded(self) -> Optional[ScreenshotUploadedPayload]:
+        return cast(Optional[ScreenshotUploadedPayload], self._payload_if("screenshot.uploaded"))
+
+    def ended(self) -> Optional[EndRunPayload]:
+        return cast(Optional[EndRunPayload], self._payload_if(*_TERMINAL))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The plain message dict earlier versions delivered: {'event': 'run.event', 'data': {...}}."""
+        return {"event": "run.event", "data": self.data}
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "event":
+            return "run.event"
+        if key == "data":
+            return self.data
+        if key == "type":
+            return self.type
+        if key == "payload":
+            return self.payload
+        if key == "timestamp":
+            return self.timestamp
+        if key == "expires_at":
+            return self.expires_at
+        if key == "_raw":
+            return self.to_dict()
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RunEvent):
+            return self.data == other.data
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"RunEvent(type={self.type!r}, session_id={self.session_id!r})"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional
 
 from .types import *  # re-export types for convenience
 
@@ -26,12 +26,23 @@ __all__ = [
     "WebhookEvent",
     "WebhookReplayResponse",
     "RunHandle",
+    "AsyncRunHandle",
+    "StartManyResult",
+    "CompletedRun",
     "RunStreamOptions",
+    "RunTimeoutError",
+    "RunCancelledError",
+    "CancellationToken",
+    "OverflowPolicy",
+    "QueueStats",
     "SseEventName",
     "SseMessage",
     "RunEventEnvelope",
     # Convenience APIs
     "start",
+    "start_many",
+    "wait_all",
+    "as_completed",
     "subscribe_to_session",
     "submit_user_interaction",
     "get_results",
@@ -44,6 +55,27 @@ def start(request: StartRunRequest, options: Optional[RunStreamOptions] = None)
     return _client().runs.start(request, options)
 
 
+def start_many(
+    requests: Iterable[StartRunRequest],
+    options: Optional[RunStreamOptions] = None,
+    max_concurrency: int = 8,
+    rate_limit: Optional[float] = None,
+) -> Iterator[StartManyResult]:
+    return _client().runs.start_many(requests, options, max_concurrency=max_concurrency, rate_limit=rate_limit)
+
+
+def wait_all(
+    handles: Iterable[RunHandle], timeout: Optional[float] = None, max_fetch_concurrency: int = 8
+) -> List[CompletedRun]:
+    return _client().runs.wait_all(handles, timeout=timeout, max_fetch_concurrency=max_fetch_concurrency)
+
+
+def as_completed(
+    handles: Iterable[RunHandle], timeout: Optional[float] = None, max_fetch_concurrency: int = 8
+) -> Iterator[CompletedRun]:
+    return _client().runs.as_completed(handles, timeout=timeout, max_fetch_concurrency=max_fetch_concurrency)
+
+
 def subscribe_to_session(session_id: str, options: Optional[RunStreamOptions] = None) -> RunHandle:
     return _client().runs.subscribe_to_session(session_id, options)
 
@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from ..events.run_event import RunEvent
+from ..utils.async_connection_manager import AsyncConnectionManager, AsyncSessionSubscription
+from ..utils.connection_manager import ResumeStats
+from ..utils.async_queue import AsyncioEventQueue, QueueStats
+from ..utils.cancellation import CancellationToken
+from ..utils.events import SimpleEventEmitter
+from ..utils.lru import LRUCache
+from ..utils.heartbeat import HeartbeatStats
+from ..utils.pending_events import PendingEventStats
+from ..utils.rate_limit import RateLimiter
+from ..utils.reconnect import ReconnectStats
+from ..utils.retry import IDEMPOTENCY_KEY_HEADER
+from ..workflows.async_client import AsyncWorkflowsClient
+from .cache import ResultCacheOptions, ResultCacheStats, RunResultCache
+from .client import _session_id_of, _start_payload, _stream_queue_args, _timeout_message
+from .types import (
+    AsyncRunHandle,
+    RunResult,
+    RunStreamOptions,
+    SseMessage,
+    CompletedRun,
+    RunCancelledError,
+    RunTimeoutError,
+    StartManyResult,
+    StartRunRequest,
+    UserInteractionData,
+    WebhookReplayResponse,
+)
+
+
+def _is_terminal(status: Optional[str]) -> bool:
+    return status in {"execution.success", "execution.failed", "execution.stopped"}
+
+
+class AsyncRunsClient:
+    def __init__(
+        self,
+        connection_manager: AsyncConnectionManager,
+        make_request,
+        workflows: Optional[AsyncWorkflowsClient] = None,
+        idempotency_cache_size: int = 1024,
+        result_cache: Optional[ResultCacheOptions] = None,
+    ) -> None:
+        self._make_request = make_request
+        self._workflows = workflows
+        self._connection_manager = connection_manager
+        # idempotency key -> session_id of runs started by this client
+        self._started: LRUCache[str, str] = LRUCache(idempotency_cache_size)
+        # Final run results by session_id; None keeps every get_results a request
+        self._results = RunResultCache(result_cache) if result_cache is not None else None
+        # session_id -> end callback of open handles whose stream dropped mid-run
+        self._lost: Dict[str, Callable[[str], None]] = {}
+        connection_manager.add_outage_check(self._check_lost_sessions)
+
+    async def _check_lost_sessions(self, reconnected: bool) -> None:
+        """
+        Runs once per reconnect attempt for all sessions that lost their
+        stream: without Last-Event-ID resume, their statuses are fetched in
+        one concurrent pass and runs that ended meanwhile are finished.
+        """
+        lost = dict(self._lost)
+        if not lost:
+            return
+        if not self._connection_manager.can_resume:
+            sem = asyncio.Semaphore(8)
+
+            async def status_of(session_id: str) -> Optional[str]:
+                async with sem:
+                    try:
+                        snapshot = await self.get_results(session_id)
+                    except Exception:
+                        return None
+                return snapshot.get("status") if isinstance(snapshot, dict) else getattr(snapshot, "status", None)
+
+            statuses = await asyncio.gather(*(status_of(session_id) for session_id in lost))
+            for session_id, status in zip(lost, statuses):
+                if _is_terminal(status):
+                    lost[session_id](status)
+        if reconnected:
+            # The stream is back (and replays what it can); stop checking these
+            for session_id in lost:
+                self._lost.pop(session_id, None)
+
+    async def start(self, request: StartRunRequest, options: Optional[RunStreamOptions] = None) -> AsyncRunHandle:
+        existing = self._started.get(request.idempotency_key) if request.idempotency_key else None
+        if existing is not None:
+            # Already launched with this key; re-attach instead of starting again
+            return await self.subscribe_to_session(existing, options)
+
+        if self._workflows is not None:
+            # Validate input variables proactively
+            await self._workflows.validate_workflow_input(request.workflow_id, request.run_input_variables)
+
+        client_id = self._connection_manager.ensure_client_id()
+        self._connection_manager.connect_if_needed()
+        return await self._launch(request, client_id, options)
+
+    async def _launch(
+        self, request: StartRunRequest, client_id: str, options: Optional[RunStreamOptions]
+    ) -> AsyncRunHandle:
+        existing = self._started.get(request.idempotency_key) if request.idempotency_key else None
+        if existing is not None:
+            return await self.subscribe_to_session(existing, options)
+        request.client_id = client_id
+        key, payload = _start_payload(request)
+        resp = await self._make_request("POST", "/run", payload, headers={IDEMPOTENCY_KEY_HEADER: key})
+        session_id = _session_id_of(resp)
+        self._started.put(key, session_id)
+        return await self.subscribe_to_session(session_id, options)
+
+    async def _validate_batch(self, requests: List[StartRunRequest]) -> Dict[int, Exception]:
+        failures: Dict[int, Exception] = {}
+        if self._workflows is None:
+            return failures
+        by_workflow: Dict[str, List[int]] = {}
+        for i, request in enumerate(requests):
+            by_workflow.setdefault(request.workflow_id, []).append(i)
+        for workflow_id, indexes in by_workflow.items():
+            try:
+                results = await self._workflows.validate_many(
+                    workflow_id, [requests[i].run_input_variables for i in indexes]
+                )
+            except Exception as e:
+                results = [e] * len(indexes)
+            for i, error in zip(indexes, results):
+                if error is not None:
+                    failures[i] = error
+        return failures
+
+    async def start_many(
+        self,
+        requests: Iterable[StartRunRequest],
+        options: Optional[RunStreamOptions] = None,
+        max_concurrency: int = 8,
+        rate_limit: Optional[float] = None,
+    ) -> AsyncIterator[StartManyResult]:
+        """Async counterpart of RunsClient.start_many; yields results as they complete."""
+        batch = list(requests)
+        if not batch:
+            return
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        failures = await self._validate_batch(batch)
+        for i in sorted(failures):
+            yield StartManyResult(index=i, request=batch[i], error=failures[i])
+
+        client_id = self._connection_manager.ensure_client_id()
+        self._connection_manager.connect_if_needed()
+        limiter = RateLimiter(rate_limit) if rate_limit else None
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def launch(i: int) -> StartManyResult:
+            async with slots:
+                if limiter is not None:
+                    delay = limiter.reserve()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                try:
+                    handle = await self._launch(batch[i], client_id, options)
+                except Exception as e:
+                    return StartManyResult(index=i, request=batch[i], error=e)
+                return StartManyResult(index=i, request=batch[i], handle=handle)
+
+        tasks = [asyncio.ensure_future(launch(i)) for i in range(len(batch)) if i not in failures]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def subscribe_to_session(
+        self, session_id: str, options: Optional[RunStreamOptions] = None
+    ) -> AsyncRunHandle:
+        emitter = SimpleEventEmitter()
+        stream: AsyncioEventQueue[SseMessage] = AsyncioEventQueue(**_stream_queue_args(options))
+        loop = asyncio.get_running_loop()
+
+        ended = False
+        closed = False
+        sub: Optional[AsyncSessionSubscription] = None
+
+        reconnect_enabled = True if options is None or options.reconnect_enabled is None else options.reconnect_enabled
+        wait_timeout = options.wait_timeout if options else None
+        idle_timeout_default = options.idle_timeout if options else None
+        interrupt_default = options.interrupt_on_timeout if options else False
+
+        def emit(event: str, payload: Any | None = None) -> None:
+            emitter.emit(event, payload)
+            if event in ("run.event", "ping"):
+                emitter.emit("message", payload)
+
+        def end_and_cleanup(status: str) -> None:
+            nonlocal ended, closed
+            if ended:
+                return
+            ended = True
+            closed = True
+            self._lost.pop(session_id, None)
+            try:
+                if sub is not None:
+                    sub.close()
+            except Exception:
+                pass
+            emit("end", {"type": status})
+            stream.close()
+            emitter.clear()
+
+        def on_run_event(evt: Any) -> None:
+            if not isinstance(evt, RunEvent):
+                return
+            event_type = evt.type
+            stream.push(evt)  # type: ignore
+            emit("run.event", evt)
+            if event_type and isinstance(event_type, str):
+                emit(event_type, evt)
+                if _is_terminal(event_type):
+                    end_and_cleanup(event_type)
+
+        def on_error(err: Any) -> None:
+            emit("error", err)
+            if not reconnect_enabled or ended or closed:
+                return
+            # The connection manager reconnects the mux and checks the
+            # statuses of all lost sessions in one batch per attempt
+            self._lost[session_id] = end_and_cleanup
+
+        sub = self._connection_manager.subscribe(session_id, deferred=True)
+        sub.on("open", lambda _=None: emit("open"))
+        sub.on("ping", lambda evt: emit("ping", evt))
+        sub.on("run.event", on_run_event)
+        sub.on("error", on_error)
+        sub.on("reconnect", lambda e: emit("reconnect", e))
+        sub.on("stale", lambda stats: emit("stale", stats))
+        sub.on("end", lambda e: end_and_cleanup((e or {}).get("type", "execution.stopped")))
+        sub.start()
+
+        client = self
+
+        class _AsyncRunHandle:
+            sessionId = session_id
+
+            @property
+            def done(self) -> bool:
+                return ended
+
+            def on(self, event: str, handler):
+                return emitter.on(event, handler)
+
+            async def wait(
+                self,
+                timeout: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+                interrupt_on_timeout: Optional[bool] = None,
+            ) -> RunResult:
+                # Await the end of the run and then fetch results
+                if ended:
+                    return await client.get_results(session_id)
+                timeout = wait_timeout if timeout is None else timeout
+
+                done: asyncio.Future[Any] = loop.create_future()
+
+                def on_end(_):
+                    if not done.done():
+                        done.set_result(None)
+
+                def on_err(err):
+                    if reconnect_enabled and client._connection_manager.can_resume:
+                        return
+                    if not done.done():
+                        done.set_exception(err if isinstance(err, Exception) else RuntimeError(f"SSE error: {err}"))
+
+                off_end = self.on("end", on_end)
+                off_err = self.on("error", on_err)
+                off_cancel = (
+                    cancel_token.on_cancel(lambda: loop.call_soon_threadsafe(on_end, None))
+                    if cancel_token is not None
+                    else None
+                )
+                try:
+                    await asyncio.wait_for(asyncio.shield(done), timeout)
+                except asyncio.TimeoutError:
+                    # A TimeoutError the stream failed with is not the wait timing out
+                    if done.done() and done.exception() is not None:
+                        raise done.exception()  # type: ignore[misc]
+                finally:
+                    off_end()
+                    off_err()
+                    if off_cancel is not None:
+                        off_cancel()
+                if not ended:
+                    cancelled = cancel_token is not None and cancel_token.cancelled
+                    raise await self._give_up(cancelled, timeout, interrupt_on_timeout)
+                return await client.get_results(session_id)
+
+            async def _give_up(self, cancelled: bool, timeout: Optional[float], interrupt: Optional[bool]) -> Exception:
+                interrupted = False
+                if interrupt_default if interrupt is None else interrupt:
+                    try:
+                        await client.interrupt(session_id)
+                        interrupted = True
+                    except Exception:
+                        pass
+                    self.close()
+                if cancelled:
+                    return RunCancelledError(f"Waiting on run {session_id} was cancelled", session_id, interrupted)
+                return RunTimeoutError(_timeout_message(session_id, timeout), session_id, timeout, interrupted)
+
+            async def events(
+                self,
+                idle_timeout: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+                interrupt_on_timeout: Optional[bool] = None,
+            ) -> AsyncIterator[SseMessage]:
+                idle = idle_timeout_default if idle_timeout is None else idle_timeout
+                is_cancelled = (lambda: cancel_token.cancelled) if cancel_token is not None else None
+                off_cancel = (
+                    cancel_token.on_cancel(lambda: loop.call_soon_threadsafe(stream.wake))
+                    if cancel_token is not None
+                    else None
+                )
+                try:
+                    while True:
+                        try:
+                            msg = await stream.get(idle, is_cancelled)
+                        except StopAsyncIteration:
+                            return
+                        except InterruptedError:
+                            raise await self._give_up(True, None, interrupt_on_timeout)
+                        except TimeoutError:
+                            raise await self._give_up(False, idle, interrupt_on_timeout)
+                        yield msg
+                finally:
+                    if off_cancel is not None:
+                        off_cancel()
+
+            def close(self) -> None:
+                nonlocal closed
+                closed = True
+                client._lost.pop(session_id, None)
+                try:
+                    if sub is not None:
+                        sub.close()
+                except Exception:
+                    pass
+                stream.close()
+                emitter.clear()
+
+            def buffer_stats(self) -> QueueStats:
+                return stream.stats()
+
+            def __aiter__(self) -> AsyncIterator[SseMessage]:
+                return self.events()
+
+        return _AsyncRunHandle()
+
+    async def as_completed(
+        self,
+        handles: Iterable[AsyncRunHandle],
+        timeout: Optional[float] = None,
+        max_fetch_concurrency: int = 8,
+    ) -> AsyncIterator[CompletedRun]:
+        """Async counterpart of RunsClient.as_completed."""
+        pending = list({id(h): h for h in handles}.values())
+        if not pending:
+            return
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        completions: asyncio.Queue[CompletedRun] = asyncio.Queue()
+        slots = asyncio.Semaphore(max_fetch_concurrency)
+        ended: set = set()
+        fetches: List[asyncio.Task] = []
+
+        async def fetch(handle: AsyncRunHandle) -> None:
+            async with slots:
+                try:
+                    completions.put_nowait(CompletedRun(handle, result=await self.get_results(handle.sessionId)))
+                except Exception as e:
+                    completions.put_nowait(CompletedRun(handle, error=e))
+
+        def mark_ended(handle: AsyncRunHandle) -> None:
+            if id(handle) in ended:
+                return
+            ended.add(id(handle))
+            fetches.append(loop.create_task(fetch(handle)))
+
+        offs = []
+        for handle in pending:
+            offs.append(handle.on("end", lambda _=None, h=handle: mark_ended(h)))
+            if handle.done:
+                mark_ended(handle)
+
+        remaining = len(pending)
+        try:
+            while remaining:
+                wait_for = None if deadline is None else max(0.0, deadline - loop.time())
+                try:
+                    completed = await asyncio.wait_for(completions.get(), wait_for)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"{remaining} of {len(pending)} runs did not complete within {timeout}s"
+                    ) from None
+                remaining -= 1
+                yield completed
+        finally:
+            for task in fetches:
+                task.cancel()
+            for off in offs:
+                off()
+
+    async def wait_all(
+        self,
+        handles: Iterable[AsyncRunHandle],
+        timeout: Optional[float] = None,
+        max_fetch_concurrency: int = 8,
+    ) -> List[CompletedRun]:
+        """Waits for every run and returns their CompletedRuns in input order."""
+        pending = list(handles)
+        by_handle = {
+            id(c.handle): c
+            async for c in self.as_completed(pending, timeout=timeout, max_fetch_concurrency=max_fetch_concurrency)
+        }
+        return [by_handle[id(h)] for h in pending]
+
+    def resume_stats(self) -> ResumeStats:
+        """Reconnect, Last-Event-ID resume, duplicate and gap counters of the event stream"""
+        return self._connection_manager.resume_stats()
+
+    def pending_event_stats(self) -> PendingEventStats:
+        """Size and eviction counters of the buffer holding events for not-yet-subscribed runs"""
+        return self._connection_manager.pending_event_stats()
+
+    def heartbeat_stats(self) -> HeartbeatStats:
+        """Learned ping interval, jitter and stall count of the event stream"""
+        return self._connection_manager.heartbeat_stats()
+
+    def reconnect_stats(self) -> ReconnectStats:
+        """Attempts, outages, downtime and batched status checks of stream reconnects"""
+        return self._connection_manager.reconnect_stats()
+
+    async def submit_user_interaction(self, session_id: str, data: UserInteractionData) -> None:
+        path = f"/run/{session_id}/user_interaction"
+        await self._make_request("POST", path, data)
+
+    async def get_results(self, session_id: str) -> RunResult:
+        path = f"/run/{session_id}"
+        if self._results is None:
+            return await self._make_request("GET", path)
+        return await self._results.fetch_async(session_id, lambda: self._make_request("GET", path))
+
+    def result_cache_stats(self) -> Optional[ResultCacheStats]:
+        """Hits, misses, shared fetches and evictions of the result cache; None unless enabled"""
+        return self._results.stats() if self._results is not None else None
+
+    async def interrupt(self, session_id: str) -> None:
+        path = f"/run/{session_id}/interrupt"
+        await self._make_request("POST", path)
+
+    async def replay_webhooks(self, session_id: str) -> WebhookReplayResponse:
+        path = f"/webhooks/{session_id}/replay"
+        return await self._make_request("POST", path)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..utils.serializer import dumps_bytes, loads
+from ..utils.single_flight import SingleFlight
+
+_TERMINAL = ("execution.success", "execution.failed", "execution.stopped")
+
+
+@dataclass
+class ResultCacheOptions:
+    # Bounds on cached results; the least recently used go first
+    max_entries: int = 1024
+    max_bytes: int = 16 * 1024 * 1024
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int
+    misses: int
+    # Fetches that joined one already in flight for the same session
+    shared: int
+    evictions: int
+    size: int
+    bytes: int
+
+
+def _status_of(result: Any) -> Optional[str]:
+    return result.get("status") if isinstance(result, dict) else getattr(result, "status", None)
+
+
+class RunResultCache:
+    """
+    LRU cache of run results keyed by session_id, bounded in entries and
+    bytes. Only results with a final status are stored: they never change.
+    Entries are kept encoded, so each hit returns a fresh copy; callers that
+    share one in-flight fetch get the same object.
+    """
+
+    def __init__(self, options: Optional[ResultCacheOptions] = None) -> None:
+        self.options = options or ResultCacheOptions()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._flights: SingleFlight[Any] = SingleFlight()
+        self._tasks: Dict[str, "asyncio.Future[Any]"] = {}
+        self._async_shared = 0
+
+    def get(self, session_id: str) -> Optional[Any]:
+        with self._lock:
+            encoded = self._entries.get(session_id)
+            if encoded is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._hits += 1
+        return loads(encoded)
+
+    def store(self, session_id: str, result: Any) -> bool:
+        """Caches `result` if its status is final; returns whether it was stored."""
+        if _status_of(result) not in _TERMINAL or not isinstance(result, dict):
+            return False
+        encoded = dumps_bytes(result)
+        if len(encoded) > self.options.max_bytes:
+            return False
+        with self._lock:
+            previous = self._entries.pop(session_id, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[session_id] = encoded
+            self._bytes += len(encoded)
+            while len(self._entries) > self.options.max_entries or self._bytes > self.options.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+        return True
+
+    def fetch(self, session_id: str, fetch: Callable[[], Any]) -> Any:
+        """The cached result, else fetch()'s, run once for concurrent callers."""
+        cached = self.get(session_id)
+        if cached is not None:
+            return cached
+
+        def load() -> Any:
+            result = fetch()
+            self.store(session_id, result)
+            return result
+
+        return self._flights.do(session_id, load)[0]
+
+    async def fetch_async(self, session_id: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """asyncio counterpart of fetch(); concurrent callers await one task."""
+        cached = self.get(session_id)
+        if cached is not None:
+            return cached
+        task = self._tasks.get(session_id)
+        if task is None:
+            async def load() -> Any:
+                result = await fetch()
+                self.store(session_id, result)
+                return result
+
+            task = self._tasks[session_id] = asyncio.ensure_future(load())
+            task.add_done_callback(lambda _: self._tasks.pop(session_id, None))
+        else:
+            self._async_shared += 1
+        # A cancelled caller must not cancel the fetch the others wait for
+        return await asyncio.shield(task)
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                shared=self._flights.shared + self._async_shared,
+                evictions=self._evictions,
+                size=len(self._entries),
+                bytes=self._bytes,
+            )
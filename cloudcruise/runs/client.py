@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import queue
 import threading
 import time
-from typing import Any, Dict, Iterator, Optional
-
-from ..utils.async_queue import AsyncEventQueue
+import uuid
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..events.run_event import RunEvent
+from ..utils.async_queue import AsyncEventQueue, QueueStats
+from ..utils.cancellation import CancellationToken
+from ..utils.dispatch import DispatchStats
+from ..utils.lru import LRUCache
+from ..utils.heartbeat import HeartbeatStats
+from ..utils.pending_events import PendingEventStats
+from ..utils.rate_limit import RateLimiter
+from ..utils.reconnect import ReconnectStats
+from ..utils.polling_connection_manager import PollingConnectionManager, PollingStats
+from ..utils.runtime import RuntimeStats, get_runtime
+from ..utils.retry import IDEMPOTENCY_KEY_HEADER
 from ..utils.events import SimpleEventEmitter
-from ..utils.connection_manager import ConnectionManager, SessionSubscription
+from ..utils.connection_manager import ConnectionManager, ResumeStats, SessionSubscription, ShardStats
 from ..workflows.client import WorkflowsClient
+from .cache import ResultCacheOptions, ResultCacheStats, RunResultCache
 from .types import (
     StartRunRequest,
     UserInteractionData,
@@ -16,85 +33,229 @@ from .types import (
     RunStreamOptions,
     SseMessage,
     RunHandle,
+    StartManyResult,
+    CompletedRun,
+    RunTimeoutError,
+    RunCancelledError,
 )
 
+def _start_payload(request: StartRunRequest) -> Tuple[str, Dict[str, Any]]:
+    """
+    Ensures the request carries an idempotency key and returns it together
+    with the POST /run body (the key travels as a header, not in the body).
+    """
+    if not request.idempotency_key:
+        request.idempotency_key = str(uuid.uuid4())
+    payload = asdict(request) if is_dataclass(request) else (
+        dict(request) if isinstance(request, dict) else dict(request.__dict__)
+    )
+    payload.pop("idempotency_key", None)
+    return request.idempotency_key, payload
+
+
+def _event_type_of(msg: Any) -> Any:
+    if isinstance(msg, RunEvent):
+        return msg.type
+    data = msg.get("data") if isinstance(msg, Mapping) else None
+    return data.get("event") if isinstance(data, Mapping) else None
+
+
+def _stream_queue_args(options: Optional[RunStreamOptions]) -> Dict[str, Any]:
+    """Keyword arguments for a handle's event queue from RunStreamOptions."""
+    if options is None or not options.max_buffered_events:
+        return {}
+    return {
+        "maxsize": options.max_buffered_events,
+        "overflow": options.overflow_policy,
+        "coalesce_key": options.coalesce_key or _event_type_of,
+    }
+
+
+def _timeout_message(session_id: str, timeout: Optional[float]) -> str:
+    within = "" if timeout is None else f" within {timeout}s"
+    return f"Run {session_id} did not finish{within}"
+
+
+def _session_id_of(resp: Any) -> str:
+    session_id: Optional[str]
+    if isinstance(resp, dict):
+        session_id = resp.get("session_id") or resp.get("sessionId")
+    else:
+        session_id = getattr(resp, "session_id", None) or getattr(resp, "sessionId", None)
+    if not session_id:
+        raise RuntimeError("CloudCruise start run response did not include session_id")
+    return session_id
+
+
 class RunsClient:
     def __init__(
         self,
         connection_manager: ConnectionManager,
         make_request,
         workflows: Optional[WorkflowsClient] = None,
+        idempotency_cache_size: int = 1024,
+        result_cache: Optional[ResultCacheOptions] = None,
     ) -> None:
         self._make_request = make_request
         self._workflows = workflows
         self._connection_manager = connection_manager
+        # idempotency key -> session_id of runs started by this client
+        self._started: LRUCache[str, str] = LRUCache(idempotency_cache_size)
+        # Final run results by session_id; None keeps every get_results a request
+        self._results = RunResultCache(result_cache) if result_cache is not None else None
+        # session_id -> end callback of open handles whose stream dropped mid-run
+        self._lost: Dict[str, Callable[[str], None]] = {}
+        self._lost_lock = threading.Lock()
+        connection_manager.add_outage_check(self._check_lost_sessions)
 
     def start(self, request: StartRunRequest, options: Optional[RunStreamOptions] = None) -> RunHandle:
+        existing = self._started.get(request.idempotency_key) if request.idempotency_key else None
+        if existing is not None:
+            # Already launched with this key; re-attach instead of starting again
+            return self.subscribe_to_session(existing, options)
+
         if self._workflows is not None:
             # Validate input variables proactively
             self._workflows.validate_workflow_input(request.workflow_id, request.run_input_variables)
 
-        client_id = self._connection_manager.ensure_client_id()
-        self._connection_manager.connect_if_needed()
-        request.client_id = client_id
-        from dataclasses import is_dataclass, asdict
-        payload = asdict(request) if is_dataclass(request) else (
-            dict(request) if isinstance(request, dict) else request.__dict__
-        )
-        resp = self._make_request("POST", "/run", payload)
-        session_id: Optional[str]
-        if isinstance(resp, dict):
-            session_id = resp.get("session_id") or resp.get("sessionId")
-        else:
-            session_id = getattr(resp, "session_id", None) or getattr(resp, "sessionId", None)
-        if not session_id:
-            raise RuntimeError("CloudCruise start run response did not include session_id")
+        return self._launch(request, options)
+
+    def _launch(self, request: StartRunRequest, options: Optional[RunStreamOptions]) -> RunHandle:
+        """POSTs an already validated request on the stream its key maps to."""
+        existing = self._started.get(request.idempotency_key) if request.idempotency_key else None
+        if existing is not None:
+            return self.subscribe_to_session(existing, options)
+        if not request.idempotency_key:
+            request.idempotency_key = str(uuid.uuid4())
+        # Routing by the idempotency key keeps a retried start on the same client_id
+        request.client_id = self._connection_manager.client_id_for(request.idempotency_key)
+        key, payload = _start_payload(request)
+        resp = self._make_request("POST", "/run", payload, headers={IDEMPOTENCY_KEY_HEADER: key})
+        session_id = _session_id_of(resp)
+        self._started.put(key, session_id)
+        self._connection_manager.bind(session_id, request.client_id)
         return self.subscribe_to_session(session_id, options)
 
+    def _check_lost_sessions(self, reconnected: bool) -> None:
+        """
+        Runs once per reconnect attempt for all sessions that lost their
+        stream: without Last-Event-ID resume, their statuses are fetched in
+        one concurrent pass and runs that ended meanwhile are finished.
+        """
+        with self._lost_lock:
+            lost = dict(self._lost)
+        if not lost:
+            return
+        if not self._connection_manager.can_resume:
+            def status_of(session_id: str) -> Optional[str]:
+                try:
+                    snapshot = self.get_results(session_id)
+                except Exception:
+                    return None
+                return snapshot.get("status") if isinstance(snapshot, dict) else getattr(snapshot, "status", None)
+
+            with ThreadPoolExecutor(
+                max_workers=min(8, len(lost)), thread_name_prefix="cloudcruise-recover"
+            ) as pool:
+                statuses = dict(zip(lost, pool.map(status_of, lost)))
+            for session_id, status in statuses.items():
+                if status in ("execution.success", "execution.failed", "execution.stopped"):
+                    lost[session_id](status)
+        if reconnected:
+            # The stream is back (and replays what it can); stop checking these
+            with self._lost_lock:
+                for session_id in lost:
+                    self._lost.pop(session_id, None)
+
+    def _validate_batch(self, requests: List[StartRunRequest]) -> Dict[int, Exception]:
+        """Validates requests grouped by workflow; returns failures by index."""
+        failures: Dict[int, Exception] = {}
+        if self._workflows is None:
+            return failures
+        by_workflow: Dict[str, List[int]] = {}
+        for i, request in enumerate(requests):
+            by_workflow.setdefault(request.workflow_id, []).append(i)
+        for workflow_id, indexes in by_workflow.items():
+            try:
+                results = self._workflows.validate_many(
+                    workflow_id, [requests[i].run_input_variables for i in indexes]
+                )
+            except Exception as e:  # e.g. the workflow does not exist
+                results = [e] * len(indexes)
+            for i, error in zip(indexes, results):
+                if error is not None:
+                    failures[i] = error
+        return failures
+
+    def start_many(
+        self,
+        requests: Iterable[StartRunRequest],
+        options: Optional[RunStreamOptions] = None,
+        max_concurrency: int = 8,
+        rate_limit: Optional[float] = None,
+    ) -> Iterator[StartManyResult]:
+        """
+        Starts many runs over the shared mux connection. Inputs are validated
+        in one pass per workflow, then up to `max_concurrency` POSTs are kept
+        in flight (at most `rate_limit` per second when given). Yields a
+        StartManyResult per request as soon as it is accepted or fails;
+        failures never abort the rest of the batch.
+        """
+        batch = list(requests)
+        if not batch:
+            return
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        failures = self._validate_batch(batch)
+        for i in sorted(failures):
+            yield StartManyResult(index=i, request=batch[i], error=failures[i])
+
+        pending = iter([i for i in range(len(batch)) if i not in failures])
+        limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        def launch(i: int) -> RunHandle:
+            if limiter is not None:
+                limiter.acquire()
+            return self._launch(batch[i], options)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="cloudcruise-start") as pool:
+            in_flight: Dict[Future, int] = {}
+
+            def refill() -> None:
+                while len(in_flight) < max_concurrency:
+                    i = next(pending, None)
+                    if i is None:
+                        return
+                    in_flight[pool.submit(launch, i)] = i
+
+            refill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    i = in_flight.pop(fut)
+                    error = fut.exception()
+                    if error is None:
+                        yield StartManyResult(index=i, request=batch[i], handle=fut.result())
+                    else:
+                        yield StartManyResult(index=i, request=batch[i], error=error)
+                refill()
+
     def subscribe_to_session(self, session_id: str, options: Optional[RunStreamOptions] = None) -> RunHandle:
         emitter = SimpleEventEmitter()
-        stream: AsyncEventQueue[SseMessage] = AsyncEventQueue()
+        stream: AsyncEventQueue[SseMessage] = AsyncEventQueue(**_stream_queue_args(options))
 
         ended = False
         closed = False
         sub: Optional[SessionSubscription] = None
 
         reconnect_enabled = True if options is None or options.reconnect_enabled is None else options.reconnect_enabled
-        reconnect_delays = options.reconnect_delays if options and options.reconnect_delays else [1.0, 3.0, 10.0]
+        wait_timeout = options.wait_timeout if options else None
+        idle_timeout_default = options.idle_timeout if options else None
+        interrupt_default = options.interrupt_on_timeout if options else False
 
         def is_terminal(status: Optional[str]) -> bool:
             return status in {"execution.success", "execution.failed", "execution.stopped"}
 
-        def flatten_event(msg: Dict[str, Any]) -> Dict[str, Any]:
-            """
-            Flatten the nested SSE event structure for better UX.
-            Transforms:
-              {
-                'event': 'run.event',
-                'data': {
-                  'event': 'execution.start',
-                  'payload': {...},
-                  'timestamp': ...
-                }
-              }
-            Into:
-              {
-                'type': 'execution.start',
-                'payload': {...},
-                'timestamp': ...,
-                '_raw': {...}  # original message
-              }
-            """
-            data = msg.get("data", {})
-            flattened = {
-                "type": data.get("event"),
-                "payload": data.get("payload", {}),
-                "timestamp": data.get("timestamp"),
-                "expires_at": data.get("expires_at"),
-                "_raw": msg,
-            }
-            return flattened
-
         def emit(event: str, payload: Any | None = None) -> None:
             emitter.emit(event, payload)
             if event in ("run.event", "ping"):
@@ -106,6 +267,8 @@ class RunsClient:
                 return
             ended = True
             closed = True
+            with self._lost_lock:
+                self._lost.pop(session_id, None)
             try:
                 if sub is not None:
                     sub.close()
@@ -117,32 +280,26 @@ class RunsClient:
 
         def connect() -> None:
             nonlocal sub
-            sub = self._connection_manager.subscribe(session_id)
+            sub = self._connection_manager.subscribe(session_id, deferred=True)
             s = sub
             s.on("open", lambda _=None: emit("open"))
             s.on("ping", lambda evt: emit("ping", evt))
 
-            def on_run_event(msg: Any) -> None:
-                nonlocal ended
-                m = msg  # expected dict
-                if not isinstance(m, dict) or m.get("event") != "run.event":
+            def on_run_event(evt: Any) -> None:
+                if not isinstance(evt, RunEvent):
                     return
+                event_type = evt.type
 
-                # Flatten the event for better UX
-                flattened = flatten_event(m)
-                event_type = flattened.get("type")
-
-                # Push original message to stream for iteration
-                stream.push(m)  # type: ignore
-
-                # Emit flattened event to 'run.event' listeners
-                emit("run.event", flattened)
+                # The same immutable event feeds iteration and every listener;
+                # it reads both as the envelope and as the flattened event
+                stream.push(evt)  # type: ignore
+                emit("run.event", evt)
 
                 # Also emit to type-specific listeners (e.g., 'execution.start')
                 # This matches the JS SDK behavior and provides better DX
                 if event_type and isinstance(event_type, str):
                     try:
-                        emit(event_type, flattened)
+                        emit(event_type, evt)
                     except Exception:
                         pass  # Ignore errors in type-specific emission
 
@@ -152,31 +309,19 @@ class RunsClient:
             s.on("run.event", on_run_event)
             s.on("error", lambda err: _on_error(err))
             s.on("reconnect", lambda e: emit("reconnect", e))
+            s.on("stale", lambda stats: emit("stale", stats))
             s.on("end", lambda e: end_and_cleanup((e or {}).get("type", "execution.stopped")))
+            # Listeners are in place; deliver anything that arrived early
+            s.start()
 
         def _on_error(err: Any) -> None:
             emit("error", err)
             if not reconnect_enabled or ended or closed:
                 return
-            def worker():
-                for base in reconnect_delays:
-                    if ended or closed:
-                        return
-                    time.sleep(base)
-                    if ended or closed:
-                        return
-                    try:
-                        snapshot = self.get_results(session_id)
-                        status = snapshot.get("status") if isinstance(snapshot, dict) else snapshot.status
-                        if isinstance(status, str) and is_terminal(status):
-                            end_and_cleanup(status)
-                            return
-                    except Exception:
-                        pass
-                    emit("reconnect", {"attemptDelayMs": int(base * 1000)})
-                    return  # Connection manager handles reconnect of mux
-            t = threading.Thread(target=worker, name="cloudcruise-run-reconnect", daemon=True)
-            t.start()
+            # The connection manager reconnects the mux and checks the
+            # statuses of all lost sessions in one batch per attempt
+            with self._lost_lock:
+                self._lost[session_id] = end_and_cleanup
 
         connect()
 
@@ -185,13 +330,29 @@ class RunsClient:
         class _RunHandle:
             sessionId = session_id
 
+            @property
+            def done(self) -> bool:
+                return ended
+
             def on(self, event: str, handler):
                 return emitter.on(event, handler)
 
-            def wait(self) -> RunResult:
+            def wait(
+                self,
+                timeout: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+                interrupt_on_timeout: Optional[bool] = None,
+            ) -> RunResult:
+                """
+                Blocks until the run ends and returns its results. Raises
+                RunTimeoutError after `timeout` seconds or RunCancelledError
+                when `cancel_token` is cancelled; with `interrupt_on_timeout`
+                the run is interrupted and the handle closed first.
+                """
                 # Block until end and then fetch results
                 if ended:
                     return client.get_results(session_id)
+                timeout = wait_timeout if timeout is None else timeout
 
                 done = threading.Event()
                 result_container: Dict[str, Any] = {}
@@ -203,17 +364,27 @@ class RunsClient:
                         done.set()
 
                 def on_error(err):
+                    if reconnect_enabled and client._connection_manager.can_resume:
+                        # Transient: the mux resumes and replays missed events
+                        return
                     result_container["error"] = err
                     done.set()
 
                 off_end = self.on("end", on_end)
                 off_err = self.on("error", on_error)
-                done.wait()
+                off_cancel = cancel_token.on_cancel(done.set) if cancel_token is not None else None
+                done.wait(timeout)
                 try:
                     if "error" in result_container:
                         err = result_container["error"]
                         raise err if isinstance(err, Exception) else RuntimeError(f"SSE error: {err}")
-                    return result_container["result"]
+                    if "result" in result_container:
+                        return result_container["result"]
+                    if ended:
+                        # Finished just as the wait gave up
+                        return client.get_results(session_id)
+                    cancelled = cancel_token is not None and cancel_token.cancelled
+                    raise self._give_up(cancelled, timeout, interrupt_on_timeout)
                 finally:
                     try:
                         off_end()
@@ -223,10 +394,56 @@ class RunsClient:
                         off_err()
                     except Exception:
                         pass
+                    if off_cancel is not None:
+                        off_cancel()
+
+            def _give_up(self, cancelled: bool, timeout: Optional[float], interrupt: Optional[bool]) -> Exception:
+                interrupted = False
+                if interrupt_default if interrupt is None else interrupt:
+                    try:
+                        client.interrupt(session_id)
+                        interrupted = True
+                    except Exception:
+                        pass
+                    self.close()
+                if cancelled:
+                    return RunCancelledError(f"Waiting on run {session_id} was cancelled", session_id, interrupted)
+                return RunTimeoutError(_timeout_message(session_id, timeout), session_id, timeout, interrupted)
+
+            def events(
+                self,
+                idle_timeout: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None,
+                interrupt_on_timeout: Optional[bool] = None,
+            ) -> Iterator[SseMessage]:
+                """
+                Iterates raw SSE messages until the run ends. Raises
+                RunTimeoutError when no message arrives for `idle_timeout`
+                seconds and RunCancelledError once `cancel_token` is cancelled.
+                """
+                idle = idle_timeout_default if idle_timeout is None else idle_timeout
+                is_cancelled = (lambda: cancel_token.cancelled) if cancel_token is not None else None
+                off_cancel = cancel_token.on_cancel(stream.wake) if cancel_token is not None else None
+                try:
+                    while True:
+                        try:
+                            msg = stream.get(idle, is_cancelled)
+                        except StopIteration:
+                            return
+                        except InterruptedError:
+                            raise self._give_up(True, None, interrupt_on_timeout)
+                        except TimeoutError:
+                            raise self._give_up(False, idle, interrupt_on_timeout)
+                        yield msg
+                finally:
+                    if off_cancel is not None:
+                        off_cancel()
 
             def close(self) -> None:
                 nonlocal closed, sub
                 closed = True
+                with client._lost_lock:
+                    client._lost.pop(session_id, None)
                 try:
                     if sub is not None:
                         sub.close()
@@ -235,19 +452,142 @@ class RunsClient:
                 stream.close()
                 emitter.clear()
 
+            def buffer_stats(self) -> QueueStats:
+                """Depth and drop/coalesce counters of the iteration buffer"""
+                return stream.stats()
+
             def __iter__(self) -> Iterator[SseMessage]:
-                for msg in stream:
-                    yield msg
+                return self.events()
 
         return _RunHandle()
 
+    def as_completed(
+        self,
+        handles: Iterable[RunHandle],
+        timeout: Optional[float] = None,
+        max_fetch_concurrency: int = 8,
+    ) -> Iterator[CompletedRun]:
+        """
+        Yields a CompletedRun for each handle as its run finishes. All handles
+        feed one completion queue from their terminal events, and results are
+        fetched by at most `max_fetch_concurrency` threads. Raises TimeoutError
+        if runs are still pending after `timeout` seconds.
+        """
+        pending = list({id(h): h for h in handles}.values())
+        if not pending:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # ("ended", handle) from SSE threads, ("fetched", CompletedRun) from fetch workers
+        completions: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        ended: set = set()
+        ended_lock = threading.Lock()
+
+        def mark_ended(handle: RunHandle) -> None:
+            with ended_lock:
+                if id(handle) in ended:
+                    return
+                ended.add(id(handle))
+            completions.put(("ended", handle))
+
+        def fetch(handle: RunHandle) -> None:
+            try:
+                completions.put(("fetched", CompletedRun(handle, result=self.get_results(handle.sessionId))))
+            except Exception as e:
+                completions.put(("fetched", CompletedRun(handle, error=e)))
+
+        offs = []
+        for handle in pending:
+            offs.append(handle.on("end", lambda _=None, h=handle: mark_ended(h)))
+            if handle.done:
+                mark_ended(handle)
+
+        pool = ThreadPoolExecutor(max_workers=max_fetch_concurrency, thread_name_prefix="cloudcruise-results")
+        remaining = len(pending)
+        try:
+            while remaining:
+                wait_for = None if deadline is None else deadline - time.monotonic()
+                try:
+                    if wait_for is not None and wait_for <= 0:
+                        raise queue.Empty
+                    kind, item = completions.get(timeout=wait_for)
+                except queue.Empty:
+                    raise TimeoutError(f"{remaining} of {len(pending)} runs did not complete within {timeout}s")
+                if kind == "ended":
+                    pool.submit(fetch, item)
+                else:
+                    remaining -= 1
+                    yield item
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            for off in offs:
+                try:
+                    off()
+                except Exception:
+                    pass
+
+    def wait_all(
+        self,
+        handles: Iterable[RunHandle],
+        timeout: Optional[float] = None,
+        max_fetch_concurrency: int = 8,
+    ) -> List[CompletedRun]:
+        """Waits for every run and returns their CompletedRuns in input order."""
+        pending = list(handles)
+        by_handle = {
+            id(c.handle): c
+            for c in self.as_completed(pending, timeout=timeout, max_fetch_concurrency=max_fetch_concurrency)
+        }
+        return [by_handle[id(h)] for h in pending]
+
+    def resume_stats(self) -> ResumeStats:
+        """Reconnect, Last-Event-ID resume, duplicate and gap counters of the event stream"""
+        return self._connection_manager.resume_stats()
+
+    def pending_event_stats(self) -> PendingEventStats:
+        """Size and eviction counters of the buffer holding events for not-yet-subscribed runs"""
+        return self._connection_manager.pending_event_stats()
+
+    def heartbeat_stats(self) -> HeartbeatStats:
+        """Learned ping interval, jitter and stall count of the event stream"""
+        return self._connection_manager.heartbeat_stats()
+
+    def reconnect_stats(self) -> ReconnectStats:
+        """Attempts, outages, downtime and batched status checks of stream reconnects"""
+        return self._connection_manager.reconnect_stats()
+
+    def polling_stats(self) -> Optional[PollingStats]:
+        """Polls, status changes and errors in polling mode; None when runs are streamed"""
+        if isinstance(self._connection_manager, PollingConnectionManager):
+            return self._connection_manager.polling_stats()
+        return None
+
+    def runtime_stats(self) -> RuntimeStats:
+        """SDK thread count, streams on the shared I/O thread and timer wheel load"""
+        return get_runtime().stats()
+
+    def shard_stats(self) -> List[ShardStats]:
+        """Per-stream sessions, throughput and callback lag (one entry unless sharded)"""
+        return self._connection_manager.shard_stats()
+
+    def dispatch_stats(self) -> DispatchStats:
+        """Queue depth and throughput of the pool running event callbacks"""
+        return self._connection_manager.dispatch_stats()
+
     def submit_user_interaction(self, session_id: str, data: UserInteractionData) -> None:
         path = f"/run/{session_id}/user_interaction"
         self._make_request("POST", path, data)
+        # The run resumes now; in polling mode check on it right away
+        self._connection_manager.poke(session_id)
 
     def get_results(self, session_id: str) -> RunResult:
         path = f"/run/{session_id}"
-        return self._make_request("GET", path)
+        if self._results is None:
+            return self._make_request("GET", path)
+        return self._results.fetch(session_id, lambda: self._make_request("GET", path))
+
+    def result_cache_stats(self) -> Optional[ResultCacheStats]:
+        """Hits, misses, shared fetches and evictions of the result cache; None unless enabled"""
+        return self._results.stats() if self._results is not None else None
 
     def interrupt(self, session_id: str) -> None:
         path = f"/run/{session_id}/interrupt"
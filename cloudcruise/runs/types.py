@@ -1,7 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, List, Literal, Optional, Protocol, TypedDict, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    TypedDict,
+    Union,
+)
+
+from ..utils.async_queue import OverflowPolicy, QueueStats
+from ..utils.cancellation import CancellationToken
 
 # Import event payload types for re-export
 from ..events.types import (
@@ -20,6 +36,7 @@ from ..events.types import (
     WebhookMessage as EventWebhookMessage,
     RunEventMessage,
 )
+from ..events.run_event import RunEvent
 
 
 EventType = Literal[
@@ -71,6 +88,10 @@ class StartRunRequest:
     webhook: Optional[PayloadWebhook] = None
     additional_context: Optional[Dict[str, Any]] = None
     client_id: Optional[str] = None
+    # Sent as the Idempotency-Key header, never in the body. Generated on the
+    # first start() when omitted, so retrying start() with the same request
+    # object re-attaches to the run instead of launching a second one.
+    idempotency_key: Optional[str] = None
 
 
 @dataclass
@@ -180,25 +201,139 @@ class RunStreamOptions:
     # In Python, use a threading.Event to signal stop if desired
     # headers and with_credentials are not used directly in SSE manager
     reconnect_enabled: Optional[bool] = None
+    # Unused: reconnect backoff is shared per stream, see CloudCruiseParams.reconnect
     reconnect_delays: Optional[List[float]] = None
+    # Defaults for RunHandle.wait() and iteration; None waits forever
+    wait_timeout: Optional[float] = None
+    idle_timeout: Optional[float] = None
+    # Interrupt the run server-side when a wait times out or is cancelled
+    interrupt_on_timeout: bool = False
+    # Bound on events buffered for iteration (None = unbounded) and what to
+    # do when it is reached: "block" (sync only; stalls the shared event
+    # stream until the handle is iterated), "drop_oldest", "drop_newest" or
+    # "coalesce" (keep the latest event per coalesce_key, by default the
+    # event type)
+    max_buffered_events: Optional[int] = None
+    overflow_policy: OverflowPolicy = "drop_oldest"
+    coalesce_key: Optional[Callable[[SseMessage], Hashable]] = None
+
+
+class RunTimeoutError(TimeoutError):
+    """A run did not finish (or went idle) within the allowed time."""
+
+    def __init__(self, message: str, session_id: str, timeout: Optional[float], interrupted: bool = False) -> None:
+        super().__init__(message)
+        self.sessionId = session_id
+        self.timeout = timeout
+        self.interrupted = interrupted
+
+
+class RunCancelledError(RuntimeError):
+    """Waiting on a run was cancelled through a CancellationToken."""
+
+    def __init__(self, message: str, session_id: str, interrupted: bool = False) -> None:
+        super().__init__(message)
+        self.sessionId = session_id
+        self.interrupted = interrupted
 
 
 class RunHandle(Protocol):
     sessionId: str
 
+    @property
+    def done(self) -> bool:
+        ...
+
     def on(self, event: str, handler) -> Any:
         ...
 
-    def wait(self) -> RunResult:
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        interrupt_on_timeout: Optional[bool] = None,
+    ) -> RunResult:
+        ...
+
+    def events(
+        self,
+        idle_timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        interrupt_on_timeout: Optional[bool] = None,
+    ) -> Iterator[SseMessage]:
         ...
 
     def close(self) -> None:
         ...
 
+    def buffer_stats(self) -> QueueStats:
+        ...
+
     def __iter__(self) -> Iterator[SseMessage]:
         ...
 
 
+class AsyncRunHandle(Protocol):
+    sessionId: str
+
+    @property
+    def done(self) -> bool:
+        ...
+
+    def on(self, event: str, handler) -> Any:
+        ...
+
+    async def wait(
+        self,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        interrupt_on_timeout: Optional[bool] = None,
+    ) -> RunResult:
+        ...
+
+    def events(
+        self,
+        idle_timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        interrupt_on_timeout: Optional[bool] = None,
+    ) -> AsyncIterator[SseMessage]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def buffer_stats(self) -> QueueStats:
+        ...
+
+    def __aiter__(self) -> AsyncIterator[SseMessage]:
+        ...
+
+
+@dataclass
+class StartManyResult:
+    """Outcome of one request passed to `RunsClient.start_many`."""
+    index: int
+    request: StartRunRequest
+    handle: Optional[Union[RunHandle, AsyncRunHandle]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class CompletedRun:
+    """A finished run yielded by `as_completed` / returned by `wait_all`."""
+    handle: Union[RunHandle, AsyncRunHandle]
+    result: Optional[RunResult] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 # Export all types including event payloads
 __all__ = [
     # Core types
@@ -223,7 +358,15 @@ __all__ = [
     "PingEnvelope",
     "SseMessage",
     "RunStreamOptions",
+    "RunTimeoutError",
+    "RunCancelledError",
+    "CancellationToken",
+    "OverflowPolicy",
+    "QueueStats",
     "RunHandle",
+    "AsyncRunHandle",
+    "StartManyResult",
+    "CompletedRun",
     # Event payload types (re-exported from events.types)
     "ExecutionQueuedPayload",
     "ExecutionStartPayload",
@@ -239,5 +382,6 @@ __all__ = [
     "ScreenshotUploadedPayload",
     "EventWebhookMessage",
     "RunEventMessage",
+    "RunEvent",
 ]
 
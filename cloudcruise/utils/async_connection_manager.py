@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from .async_queue import AsyncioEventQueue
+from .async_sse import AsyncSSEConnection, open_async_sse
+from .connection_manager import EventResume, ResumeStats, _decoded, _is_final_event, route_frame
+from .events import SimpleEventEmitter
+from ..events.run_event import RunEvent
+from .heartbeat import HeartbeatMonitor, HeartbeatOptions, HeartbeatStats
+from .pending_events import PendingEventBuffer, PendingEventStats
+from .reconnect import OutageTracker, ReconnectPolicy, ReconnectStats
+from .sse import SSEHandlers
+
+
+class AsyncSessionSubscription:
+    def __init__(
+        self,
+        emitter: SimpleEventEmitter,
+        queue: AsyncioEventQueue[Dict[str, Any]],
+        on_close: Callable[[], None],
+        on_start: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._emitter = emitter
+        self._queue = queue
+        self._on_close = on_close
+        self._on_start = on_start
+
+    def on(self, event: str, handler):
+        return self._emitter.on(event, handler)
+
+    def start(self) -> None:
+        if self._on_start is not None:
+            self._on_start()
+
+    def close(self) -> None:
+        try:
+            self._queue.close()
+        finally:
+            self._on_close()
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._queue.__aiter__()
+
+
+class _AsyncSessionChannel:
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.emitter = SimpleEventEmitter()
+        self.subscribers: Set[AsyncioEventQueue[Dict[str, Any]]] = set()
+        self.ended = False
+        self.backlog: Optional[List[RunEvent]] = None
+
+
+# Like OutageCheck; may return an awaitable
+AsyncOutageCheck = Callable[[bool], Union[None, Awaitable[None]]]
+
+
+class AsyncConnectionManager:
+    """
+    asyncio counterpart of ConnectionManager: one multiplexed SSE stream per
+    client_id, read on the event loop and fanned out to session subscribers.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        heartbeat: Optional[HeartbeatOptions] = None,
+        reconnect: Optional[ReconnectPolicy] = None,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._api_key = api_key
+        self._client_id: Optional[str] = None
+        self._conn: Optional[AsyncSSEConnection] = None
+        self._connecting = False
+        self._connected = False
+        self._reconnect_task: Optional["asyncio.Task[None]"] = None
+        self._outages = OutageTracker(reconnect)
+        self._outage_checks: List[AsyncOutageCheck] = []
+        self._check_task: Optional["asyncio.Task[None]"] = None
+        self._sessions: Dict[str, _AsyncSessionChannel] = {}
+        self._closed = False
+        self._resume = EventResume()
+        self._pending = PendingEventBuffer()
+        self._heartbeat = HeartbeatMonitor(heartbeat)
+        self._watchdog: Optional["asyncio.Task[None]"] = None
+
+    def ensure_client_id(self) -> str:
+        if self._client_id:
+            return self._client_id
+        self._client_id = str(uuid.uuid4())
+        return self._client_id
+
+    def connect_if_needed(self) -> None:
+        if self._connected or self._connecting or self._closed:
+            return
+        self.ensure_client_id()
+        self._open_mux_connection()
+
+    def subscribe(self, session_id: str, deferred: bool = False) -> AsyncSessionSubscription:
+        """See ConnectionManager.subscribe."""
+        try:
+            self.connect_if_needed()
+        except Exception:
+            pass
+
+        replay: List[RunEvent] = []
+        ch = self._sessions.get(session_id)
+        if not ch:
+            ch = _AsyncSessionChannel(session_id)
+            self._sessions[session_id] = ch
+            early = self._pending.take(session_id)
+            if deferred:
+                ch.backlog = early
+            else:
+                replay = early
+
+        q: AsyncioEventQueue[Dict[str, Any]] = AsyncioEventQueue()
+        ch.subscribers.add(q)
+
+        def _on_close() -> None:
+            q.close()
+            ch.subscribers.discard(q)
+            if not ch.subscribers and ch.ended:
+                self._sessions.pop(session_id, None)
+
+        sub = AsyncSessionSubscription(ch.emitter, q, _on_close, lambda: self._release(ch))
+        for msg in replay:
+            self._dispatch(ch, msg)
+        return sub
+
+    def pending_event_stats(self) -> PendingEventStats:
+        return self._pending.stats()
+
+    def _release(self, ch: _AsyncSessionChannel) -> None:
+        backlog, ch.backlog = ch.backlog, None
+        for msg in backlog or ():
+            self._deliver(ch, msg)
+
+    def _dispatch(self, ch: _AsyncSessionChannel, msg: RunEvent) -> None:
+        if ch.backlog is not None:
+            ch.backlog.append(msg)
+        else:
+            self._deliver(ch, msg)
+
+    def _deliver(self, ch: _AsyncSessionChannel, msg: RunEvent) -> None:
+        for q in list(ch.subscribers):
+            q.push(msg)
+        ch.emitter.emit("run.event", msg)
+        ev_type = msg.type
+        if isinstance(ev_type, str) and _is_final_event(ev_type):
+            ch.ended = True
+            ch.emitter.emit("end", {"type": ev_type})
+            for q in list(ch.subscribers):
+                q.close()
+            ch.subscribers.clear()
+            self._sessions.pop(ch.session_id, None)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+        if self._check_task is not None:
+            self._check_task.cancel()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def can_resume(self) -> bool:
+        return self._resume.last_event_id is not None
+
+    def resume_stats(self) -> ResumeStats:
+        return self._resume.stats()
+
+    def _emit_all(self, event: str, payload: Any | None = None) -> None:
+        for ch in list(self._sessions.values()):
+            ch.emitter.emit(event, payload)
+
+    def _open_mux_connection(self) -> None:
+        if self._connecting or self._connected or self._closed:
+            return
+        self._connecting = True
+        url = f"{self._base_url}/run/clients/{self._client_id}/events"
+        headers = {"cc-key": self._api_key, **self._resume.request_headers()}
+
+        def on_open() -> None:
+            self._connected = True
+            self._connecting = False
+            if self._outages.down:
+                self._outages.recovered()
+                self._run_checks(True)
+            self._heartbeat.reset()
+            self._start_watchdog()
+            self._emit_all("open")
+
+        def on_event(evt: Dict[str, Any]) -> None:
+            if evt.get("event") == "ping":
+                self._heartbeat.ping()
+            else:
+                self._heartbeat.frame()
+            if not self._resume.accept(evt.get("id")):
+                return
+            if evt.get("event") == "ping":
+                if self._sessions:
+                    self._emit_all("ping", _decoded(evt))
+                return
+            if evt.get("event") == "run.event":
+                routed = route_frame(evt.get("data"))
+                if routed is None:
+                    return
+                session_id, msg = routed
+                ch = self._sessions.get(session_id)
+                if not ch:
+                    self._pending.add(session_id, msg, len(evt.get("raw") or ""))
+                    return
+                self._dispatch(ch, msg)
+
+        def on_error(err: Exception) -> None:
+            self._emit_all("error", err)
+
+        def on_close() -> None:
+            self._connected = False
+            self._connecting = False
+            self._conn = None
+            self._emit_all("close")
+            # A stream that closes mid-outage is a failed reconnect attempt
+            failed_attempt = self._outages.down
+            self._outages.lost(len(self._sessions))
+            if failed_attempt:
+                self._run_checks(False)
+            self._schedule_reconnect()
+
+        self._conn = open_async_sse(
+            url,
+            SSEHandlers(
+                on_open=on_open,
+                on_event=on_event,
+                on_error=on_error,
+                on_close=on_close,
+                on_retry=self._outages.set_server_retry,
+            ),
+            headers=headers,
+            decode_json=False,
+        )
+
+    def heartbeat_stats(self) -> HeartbeatStats:
+        return self._heartbeat.stats()
+
+    def _start_watchdog(self) -> None:
+        if not self._heartbeat.options.enabled or (self._watchdog is not None and not self._watchdog.done()):
+            return
+        self._watchdog = asyncio.get_running_loop().create_task(self._watch(), name="cloudcruise-async-heartbeat")
+
+    async def _watch(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self._heartbeat.options.check_interval)
+            conn = self._conn
+            if self._connected and conn is not None and self._heartbeat.is_stale():
+                self._heartbeat.record_stall()
+                self._emit_all("stale", self._heartbeat.stats())
+                # on_close then schedules the reconnect, resuming from Last-Event-ID
+                conn.close()
+
+    def _schedule_reconnect(self) -> None:
+        if self._closed or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+
+        delay = self._outages.next_delay()
+
+        async def worker() -> None:
+            self._emit_all("reconnect", {"attemptDelayMs": int(delay * 1000)})
+            await asyncio.sleep(delay)
+            if not (self._closed or self._connected or self._connecting):
+                self._open_mux_connection()
+
+        self._reconnect_task = asyncio.get_running_loop().create_task(worker(), name="cloudcruise-async-reconnect")
+
+    def add_outage_check(self, check: AsyncOutageCheck) -> None:
+        """
+        Registers `check(reconnected)`, run once after every failed reconnect
+        attempt and once when the stream is back; it may be a coroutine function.
+        """
+        self._outage_checks.append(check)
+
+    def _run_checks(self, reconnected: bool) -> None:
+        if not self._outage_checks or self._closed:
+            return
+        self._outages.checked()
+
+        previous = self._check_task
+
+        async def run() -> None:
+            if previous is not None and not previous.done():
+                # Keep checks in order: a success check must not overtake a failure one
+                await asyncio.wait([previous])
+            for check in list(self._outage_checks):
+                try:
+                    result = check(reconnected)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception:
+                    pass
+
+        self._check_task = asyncio.get_running_loop().create_task(run(), name="cloudcruise-async-outage-check")
+
+    def reconnect_stats(self) -> ReconnectStats:
+        return self._outages.stats()
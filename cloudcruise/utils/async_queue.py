@@ -1,27 +1,160 @@
 from __future__ import annotations
 
+import asyncio
 import threading
-from typing import Generic, Iterator, Optional, TypeVar
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    TypeVar,
+)
 
 
 T = TypeVar("T")
 
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest", "coalesce"]
+_POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+
+@dataclass
+class QueueStats:
+    depth: int
+    high_water: int
+    pushed: int
+    dropped: int
+    coalesced: int
+
+
+class _Cell:
+    __slots__ = ("key", "item")
+
+    def __init__(self, key: Hashable, item: Any) -> None:
+        self.key = key
+        self.item = item
+
+
+class _EventBuffer(Generic[T]):
+    """
+    Deque storage with O(1) overflow handling shared by both queues. With
+    "coalesce", an item whose key is still queued replaces that entry in
+    place; when full and nothing matches, the oldest entry is dropped.
+    Callers implement "block" by not offering while full().
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = "block",
+        coalesce_key: Optional[Callable[[T], Hashable]] = None,
+    ) -> None:
+        if overflow not in _POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}; expected one of {', '.join(_POLICIES)}")
+        if overflow == "coalesce" and coalesce_key is None:
+            raise ValueError("The coalesce overflow policy requires a coalesce_key")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._key = coalesce_key if overflow == "coalesce" else None
+        self._items: Deque[Any] = deque()
+        self._cells: Dict[Hashable, _Cell] = {}
+        self._high_water = 0
+        self._pushed = 0
+        self._dropped = 0
+        self._coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def full(self) -> bool:
+        return self.maxsize > 0 and len(self._items) >= self.maxsize
+
+    def offer(self, item: T) -> None:
+        self._pushed += 1
+        if self._key is not None:
+            key = self._key(item)
+            cell = self._cells.get(key)
+            if cell is not None:
+                cell.item = item
+                self._coalesced += 1
+                return
+            if self.full():
+                self._drop_oldest()
+            cell = self._cells[key] = _Cell(key, item)
+            self._items.append(cell)
+        else:
+            if self.full():
+                if self.overflow == "drop_newest":
+                    self._dropped += 1
+                    return
+                self._drop_oldest()
+            self._items.append(item)
+        if len(self._items) > self._high_water:
+            self._high_water = len(self._items)
+
+    def take(self) -> T:
+        return self._unwrap(self._items.popleft())
+
+    def _drop_oldest(self) -> None:
+        self._unwrap(self._items.popleft())
+        self._dropped += 1
+
+    def _unwrap(self, entry: Any) -> T:
+        if self._key is None:
+            return entry
+        if self._cells.get(entry.key) is entry:
+            del self._cells[entry.key]
+        return entry.item
+
+    def stats(self) -> QueueStats:
+        return QueueStats(
+            depth=len(self._items),
+            high_water=self._high_water,
+            pushed=self._pushed,
+            dropped=self._dropped,
+            coalesced=self._coalesced,
+        )
+
 
 class AsyncEventQueue(Generic[T]):
     """
     A thread-cooperative queue that supports iteration until closed.
+
+    `maxsize` (0 = unbounded) and `overflow` bound memory for slow consumers:
+    "block" makes push() wait for space, "drop_oldest"/"drop_newest" discard
+    events and "coalesce" keeps only the latest queued item per
+    `coalesce_key(item)`.
     """
 
-    def __init__(self) -> None:
-        self._items: list[T] = []
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = "block",
+        coalesce_key: Optional[Callable[[T], Hashable]] = None,
+    ) -> None:
+        self._buffer: _EventBuffer[T] = _EventBuffer(maxsize, overflow, coalesce_key)
         self._closed = False
-        self._cv = threading.Condition()
+        lock = threading.Lock()
+        self._cv = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
 
     def push(self, item: T) -> None:
         with self._cv:
+            if self._buffer.overflow == "block":
+                while self._buffer.full() and not self._closed:
+                    self._not_full.wait()
             if self._closed:
                 return
-            self._items.append(item)
+            self._buffer.offer(item)
             self._cv.notify()
 
     def close(self) -> None:
@@ -30,15 +163,156 @@ class AsyncEventQueue(Generic[T]):
                 return
             self._closed = True
             self._cv.notify_all()
+            self._not_full.notify_all()
+
+    def wake(self) -> None:
+        """Wakes blocked get() calls so they re-check their `interrupted` predicate."""
+        with self._cv:
+            self._cv.notify_all()
+
+    def _wait_for_item(self, timeout: Optional[float], interrupted: Optional[Callable[[], bool]]) -> bool:
+        # Called with the lock held; False once closed and drained
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._buffer:
+            if self._closed:
+                return False
+            if interrupted is not None and interrupted():
+                raise InterruptedError
+            if deadline is None:
+                self._cv.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            self._cv.wait(remaining)
+        return True
+
+    def get(self, timeout: Optional[float] = None, interrupted: Optional[Callable[[], bool]] = None) -> T:
+        """
+        Returns the next item. Raises StopIteration once closed and drained,
+        TimeoutError when nothing arrives within `timeout` seconds and
+        InterruptedError when `interrupted()` turns true after a wake().
+        """
+        with self._cv:
+            if not self._wait_for_item(timeout, interrupted):
+                raise StopIteration
+            item = self._buffer.take()
+            self._not_full.notify()
+            return item
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[T]:
+        """
+        Waits like get() for at least one item, then drains up to `max_items`
+        under a single lock acquisition. Returns [] once closed and drained.
+        """
+        with self._cv:
+            if not self._wait_for_item(timeout, None):
+                return []
+            batch = [self._buffer.take() for _ in range(min(max_items, len(self._buffer)))]
+            self._not_full.notify_all()
+            return batch
+
+    def stats(self) -> QueueStats:
+        with self._cv:
+            return self._buffer.stats()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
 
     def __iter__(self) -> Iterator[T]:
         while True:
-            with self._cv:
-                while not self._items and not self._closed:
-                    self._cv.wait()
-                if self._items:
-                    item = self._items.pop(0)
-                    yield item
-                elif self._closed:
-                    return
+            try:
+                item = self.get()
+            except StopIteration:
+                return
+            yield item
+
+
+class AsyncioEventQueue(Generic[T]):
+    """
+    An asyncio queue that supports `async for` iteration until closed.
+    Must only be used from the event loop that consumes it. Accepts the same
+    bounds as AsyncEventQueue except "block": push() runs on the event loop
+    and cannot wait, so a bounded queue must pick a drop or coalesce policy.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: OverflowPolicy = "drop_oldest",
+        coalesce_key: Optional[Callable[[T], Hashable]] = None,
+    ) -> None:
+        if maxsize > 0 and overflow == "block":
+            raise ValueError("AsyncioEventQueue cannot block producers; use a drop or coalesce policy")
+        self._buffer: _EventBuffer[T] = _EventBuffer(maxsize, overflow, coalesce_key)
+        self._closed = False
+        self._waiter: Optional[asyncio.Future[None]] = None
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+        self._waiter = None
+
+    def push(self, item: T) -> None:
+        if self._closed:
+            return
+        self._buffer.offer(item)
+        self._wake()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake()
+
+    def wake(self) -> None:
+        """Wakes a pending get() so it re-checks its `interrupted` predicate."""
+        self._wake()
+
+    async def _wait_for_item(self, timeout: Optional[float], interrupted: Optional[Callable[[], bool]]) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not self._buffer:
+            if self._closed:
+                return False
+            if interrupted is not None and interrupted():
+                raise InterruptedError
+            if self._waiter is None:
+                self._waiter = loop.create_future()
+            if deadline is None:
+                await self._waiter
+                continue
+            try:
+                await asyncio.wait_for(asyncio.shield(self._waiter), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                raise TimeoutError from None
+        return True
+
+    async def get(self, timeout: Optional[float] = None, interrupted: Optional[Callable[[], bool]] = None) -> T:
+        """
+        Returns the next item; raises StopAsyncIteration once closed and
+        drained, TimeoutError after `timeout` idle seconds and
+        InterruptedError when `interrupted()` turns true after a wake().
+        """
+        if not await self._wait_for_item(timeout, interrupted):
+            raise StopAsyncIteration
+        return self._buffer.take()
+
+    async def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[T]:
+        """Awaits at least one item and drains up to `max_items`; [] once closed and drained."""
+        if not await self._wait_for_item(timeout, None):
+            return []
+        return [self._buffer.take() for _ in range(min(max_items, len(self._buffer)))]
+
+    def stats(self) -> QueueStats:
+        return self._buffer.stats()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
 
+    async def __anext__(self) -> T:
+        return await self.get()
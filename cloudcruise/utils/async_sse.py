@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .sse import SSEHandlers, SSEParser, notify_retry
+
+
+class AsyncSSEConnection:
+    def __init__(self, task: "asyncio.Task[None]") -> None:
+        self._task = task
+
+    def close(self) -> None:
+        if not self._task.done():
+            self._task.cancel()
+
+
+async def _read_response_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+    status_line = await reader.readline()
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise RuntimeError("SSE invalid HTTP response")
+    status = int(parts[1])
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _iter_body(
+    reader: asyncio.StreamReader, headers: Dict[str, str], read_timeout: float
+) -> AsyncIterator[bytes]:
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await asyncio.wait_for(reader.readline(), read_timeout)
+            if not size_line:
+                # Dropped before the terminating chunk
+                raise ConnectionError("SSE connection closed mid-stream")
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                return
+            chunk = await asyncio.wait_for(reader.readexactly(size), read_timeout)
+            await reader.readline()
+            yield chunk
+    else:
+        while True:
+            chunk = await asyncio.wait_for(reader.read(65536), read_timeout)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def stream_sse(
+    url: str,
+    handlers: SSEHandlers,
+    headers: Optional[Dict[str, str]] = None,
+    read_timeout: float = 60.0,
+    decode_json: bool = True,
+) -> None:
+    """Reads one SSE connection to its end; cancelling it closes the stream without on_error."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    host = parts.hostname or ""
+    port = parts.port or (443 if secure else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += f"?{parts.query}"
+
+    req_headers = {
+        "Host": parts.netloc,
+        "Accept": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+    }
+    if headers:
+        req_headers.update(headers)
+
+    writer: Optional[asyncio.StreamWriter] = None
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl.create_default_context() if secure else None),
+            read_timeout,
+        )
+        head = f"GET {target} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in req_headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        await writer.drain()
+
+        status, resp_headers = await asyncio.wait_for(_read_response_head(reader), read_timeout)
+        if not 200 <= status < 300:
+            raise RuntimeError(f"SSE HTTP {status}")
+        if handlers.on_open:
+            try:
+                handlers.on_open()
+            except Exception:
+                pass
+        parser = SSEParser(decode_json)
+        retry: Optional[int] = None
+        async for chunk in _iter_body(reader, resp_headers, read_timeout):
+            for evt in parser.feed(chunk):
+                if handlers.on_event:
+                    try:
+                        handlers.on_event(evt)
+                    except Exception:
+                        pass
+            retry = notify_retry(parser, handlers, retry)
+            # Backpressure without blocking the loop: TCP holds the rest back
+            while handlers.paused is not None and handlers.paused():
+                await asyncio.sleep(0.01)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        if handlers.on_error:
+            try:
+                handlers.on_error(e)
+            except Exception:
+                pass
+    finally:
+        if writer is not None:
+            writer.close()
+        if handlers.on_close:
+            try:
+                handlers.on_close()
+            except Exception:
+                pass
+
+
+def open_async_sse(
+    url: str,
+    handlers: SSEHandlers,
+    headers: Optional[Dict[str, str]] = None,
+    read_timeout: float = 60.0,
+    decode_json: bool = True,
+) -> AsyncSSEConnection:
+    """
+    Opens an SSE connection on the running event loop using asyncio streams.
+    Handlers are invoked on the loop; no threads are started.
+    """
+    task = asyncio.get_running_loop().create_task(
+        stream_sse(url, handlers, headers, read_timeout, decode_json), name="cloudcruise-async-sse"
+    )
+    return AsyncSSEConnection(task)
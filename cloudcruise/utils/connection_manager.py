@@ -1,28 +1,238 @@
 from __future__ import annotations
 
+import re
 import threading
 import time
 import uuid
-from typing import Any, Dict, Optional, Set, Iterator
+from dataclasses import dataclass
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Iterator, Tuple
 
 from .sse import open_sse, SSEHandlers, SSEConnection
 from .events import SimpleEventEmitter
+from ..events.run_event import RunEvent
 from .async_queue import AsyncEventQueue
+from .lru import LRUCache
+from .serializer import loads
+from .pending_events import PendingEventBuffer, PendingEventStats
+from .dispatch import DispatchOptions, DispatchStats, EventDispatcher
+from .heartbeat import HeartbeatMonitor, HeartbeatOptions, HeartbeatStats
+from .reconnect import OutageCheck, OutageTracker, ReconnectPolicy, ReconnectScheduler, ReconnectStats
+from .runtime import Runtime, Timer
 
 
 def _is_final_event(event_type: Optional[str]) -> bool:
     return event_type in {"execution.success", "execution.failed", "execution.stopped"}
 
 
+def route_run_event(evt: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Extracts the target session_id and the inner event data from a mux
+    'run.event' frame. Returns None when the frame carries no session id.
+    """
+    raw_data = evt.get("data")
+    data: Dict[str, Any] = {}
+    if isinstance(raw_data, dict):
+        inner = raw_data.get("data")
+        if isinstance(inner, dict):
+            data = inner
+        else:
+            data = raw_data
+    payload = data.get("payload") if isinstance(data, dict) else None
+    session_id = None
+    if isinstance(payload, dict):
+        val = payload.get("session_id") or payload.get("sessionId")
+        if isinstance(val, str):
+            session_id = val
+    if session_id is None and isinstance(data, dict):
+        val = data.get("session_id") or data.get("sessionId")
+        if isinstance(val, str):
+            session_id = val
+    if not session_id:
+        return None
+    return session_id, data
+
+
+_SESSION_ID = re.compile(r'"(?:session_id|sessionId)"\s*:\s*"([^"\\]*)"')
+_EVENT_NAME = re.compile(r'"event"\s*:\s*"([^"\\]*)"')
+
+
+def peek_run_event(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Finds the session id and event type of a 'run.event' frame's JSON text
+    without decoding it. Returns None when either is missing or ambiguous
+    (several different values), in which case the caller decodes.
+    """
+    sessions = set(_SESSION_ID.findall(text))
+    if len(sessions) != 1:
+        return None
+    events = set(_EVENT_NAME.findall(text))
+    if len(events) != 1:
+        return None
+    session_id = sessions.pop()
+    return (session_id, events.pop()) if session_id else None
+
+
+def route_frame(data: Any) -> Optional[Tuple[str, RunEvent]]:
+    """
+    Routes a 'run.event' frame whose data may still be JSON text. The fast
+    path builds a RunEvent that decodes its body only when a consumer reads
+    it; anything it cannot classify is decoded and routed as before.
+    """
+    if isinstance(data, str):
+        peeked = peek_run_event(data)
+        if peeked is not None:
+            session_id, event_type = peeked
+            return session_id, RunEvent.from_json(data, event_type)
+        try:
+            data = loads(data)
+        except ValueError:
+            return None
+    routed = route_run_event({"data": data})
+    if routed is None:
+        return None
+    session_id, inner = routed
+    return session_id, RunEvent(inner)
+
+
+def _decoded(evt: Dict[str, Any]) -> Dict[str, Any]:
+    """The SSE event with its JSON data decoded, as open_sse delivers by default."""
+    data = evt.get("data")
+    if isinstance(data, str):
+        try:
+            evt["data"] = None if data == "" else loads(data)
+        except ValueError:
+            pass
+    return evt
+
+
+@dataclass
+class ResumeStats:
+    last_event_id: Optional[str]
+    reconnects: int
+    # Reconnects that asked the server to replay from Last-Event-ID
+    resumed: int
+    # Replayed frames dropped because they had already been delivered
+    duplicates: int
+    # Jumps in numeric event ids, and how many ids they skipped
+    gaps: int
+    missed_events: int
+
+
+class EventResume:
+    """
+    Last-Event-ID bookkeeping for a mux stream: remembers the newest event
+    id for reconnects, drops replayed frames already delivered and counts
+    gaps in numeric ids.
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        self.last_event_id: Optional[str] = None
+        self._seen: LRUCache[str, bool] = LRUCache(window)
+        self._last_numeric: Optional[int] = None
+        self._connects = 0
+        self._resumed = 0
+        self._duplicates = 0
+        self._gaps = 0
+        self._missed = 0
+
+    def request_headers(self) -> Dict[str, str]:
+        """Headers for the next stream request; counts it as a (resumed) reconnect."""
+        self._connects += 1
+        if self._connects > 1 and self.last_event_id is not None:
+            self._resumed += 1
+            return {"Last-Event-ID": self.last_event_id}
+        return {}
+
+    def accept(self, event_id: Optional[str]) -> bool:
+        """Records a frame's id; returns False for a replayed duplicate."""
+        if event_id is None:
+            return True
+        if event_id in self._seen:
+            self._duplicates += 1
+            return False
+        self._seen.put(event_id, True)
+        self.last_event_id = event_id
+        if event_id.isdigit():
+            n = int(event_id)
+            if self._last_numeric is not None and n > self._last_numeric + 1:
+                self._gaps += 1
+                self._missed += n - self._last_numeric - 1
+            if self._last_numeric is None or n > self._last_numeric:
+                self._last_numeric = n
+        return True
+
+    def stats(self) -> ResumeStats:
+        return ResumeStats(
+            last_event_id=self.last_event_id,
+            reconnects=max(0, self._connects - 1),
+            resumed=self._resumed,
+            duplicates=self._duplicates,
+            gaps=self._gaps,
+            missed_events=self._missed,
+        )
+
+
+@dataclass
+class ShardStats:
+    index: int
+    client_id: Optional[str]
+    connected: bool
+    # Sessions currently subscribed through this stream
+    sessions: int
+    events: int
+    # Run events per second over the last few seconds
+    events_per_sec: float
+    # Smoothed seconds between reading an event and running its callbacks
+    lag: float
+    reconnects: int
+
+
+class _EventRate:
+    """Counts events in one-second buckets over a short sliding window."""
+
+    def __init__(self, window: int = 5, clock: Callable[[], float] = time.monotonic) -> None:
+        self._window = window
+        self._clock = clock
+        self._buckets: Deque[List[int]] = deque()
+        self.total = 0
+
+    def add(self) -> None:
+        second = int(self._clock())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([second, 1])
+            while len(self._buckets) > self._window:
+                self._buckets.popleft()
+        self.total += 1
+
+    def per_second(self) -> float:
+        horizon = int(self._clock()) - self._window
+        return sum(n for second, n in list(self._buckets) if second > horizon) / self._window
+
+
 class SessionSubscription:
-    def __init__(self, emitter: SimpleEventEmitter, queue: AsyncEventQueue[Dict[str, Any]], on_close: callable):
+    def __init__(
+        self,
+        emitter: SimpleEventEmitter,
+        queue: AsyncEventQueue[Dict[str, Any]],
+        on_close: callable,
+        on_start: Optional[Callable[[], None]] = None,
+    ):
         self._emitter = emitter
         self._queue = queue
         self._on_close = on_close
+        self._on_start = on_start
 
     def on(self, event: str, handler):
         return self._emitter.on(event, handler)
 
+    def start(self) -> None:
+        """Releases events held for a deferred subscription, in order."""
+        if self._on_start is not None:
+            self._on_start()
+
     def close(self) -> None:
         try:
             self._queue.close()
@@ -39,20 +249,53 @@ class _SessionChannel:
         self.emitter = SimpleEventEmitter()
         self.subscribers: Set[AsyncEventQueue[Dict[str, Any]]] = set()
         self.ended = False
+        # Events held until a deferred subscriber has attached its listeners
+        self.backlog: Optional[List[RunEvent]] = None
+        self.delivery = threading.RLock()
 
 
 class ConnectionManager:
-    def __init__(self, base_url: str, api_key: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        dispatch: Optional[DispatchOptions] = None,
+        dispatcher: Optional[EventDispatcher] = None,
+        heartbeat: Optional[HeartbeatOptions] = None,
+        reconnect: Optional[ReconnectPolicy] = None,
+        runtime: Optional[Runtime] = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
+        # Shared I/O thread and timer wheel; None gives the stream its own threads
+        self._runtime = runtime
         self._api_key = api_key
         self._client_id: Optional[str] = None
         self._conn: Optional[SSEConnection] = None
         self._connecting = False
         self._connected = False
-        self._reconnecting = False
-        self._reconnect_delays = [1.0, 3.0, 10.0]
+        self._closed = False
         self._sessions: Dict[str, _SessionChannel] = {}
         self._lock = threading.Lock()
+        self._resume = EventResume()
+        self._pending = PendingEventBuffer()
+        # Session callbacks run here, serially per session, off the reader thread
+        self._dispatcher = dispatcher or EventDispatcher(dispatch)
+        # Streams read on the shared I/O thread must never block it: inline
+        # callbacks would stall every stream, so those streams keep a thread
+        self._shared_reader = runtime is not None and not self._dispatcher.inline
+        self._rate = _EventRate()
+        self._lag = 0.0
+        self._heartbeat = HeartbeatMonitor(heartbeat)
+        self._watchdog: Optional[Any] = None
+        self._outages = OutageTracker(reconnect)
+        self._reconnector = ReconnectScheduler(
+            self._try_connect,
+            self._outages,
+            on_attempt=lambda delay: self._emit_all("reconnect", {"attemptDelayMs": int(delay * 1000)}),
+            call_later=(lambda delay, fn: runtime.call_later(delay, fn, blocking=True)) if runtime else None,
+        )
+        # Set once a reconnect attempt has either opened or failed
+        self._attempt_done = threading.Event()
 
     def ensure_client_id(self) -> str:
         if self._client_id:
@@ -62,24 +305,73 @@ class ConnectionManager:
 
     def connect_if_needed(self) -> None:
         with self._lock:
-            if self._connected or self._connecting:
+            if self._connected or self._connecting or self._reconnector.running:
                 return
             if not self._client_id:
                 self.ensure_client_id()
             self._open_mux_connection()
 
-    def subscribe(self, session_id: str, stop_event: Optional[threading.Event] = None) -> SessionSubscription:
+    def client_id_for(self, routing_key: str) -> str:
+        """
+        The client_id a run started with `routing_key` (its idempotency key)
+        should be bound to; opens that client's stream if needed.
+        """
+        client_id = self.ensure_client_id()
+        self.connect_if_needed()
+        return client_id
+
+    def bind(self, session_id: str, client_id: str) -> None:
+        """Records which client_id a session was started on (one stream: nothing to do)."""
+
+    def poke(self, session_id: str) -> None:
+        """Hints that a run is about to change (a stream delivers it anyway: nothing to do)."""
+
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    def shard_stats(self) -> List[ShardStats]:
+        return [self._stream_stats(0)]
+
+    def _stream_stats(self, index: int) -> ShardStats:
+        return ShardStats(
+            index=index,
+            client_id=self._client_id,
+            connected=self._connected,
+            sessions=len(self._sessions),
+            events=self._rate.total,
+            events_per_sec=self._rate.per_second(),
+            lag=self._lag,
+            reconnects=self._resume.stats().reconnects,
+        )
+
+    def subscribe(
+        self,
+        session_id: str,
+        stop_event: Optional[threading.Event] = None,
+        deferred: bool = False,
+    ) -> SessionSubscription:
+        """
+        Subscribes to a session's events. Events that arrived before the
+        first subscription are replayed to it; with `deferred`, they (and any
+        new ones) are held until `start()` so listeners can be attached first.
+        """
         # Kick off connection if not already
         try:
             self.connect_if_needed()
         except Exception:
             pass
 
+        replay: List[RunEvent] = []
         with self._lock:
             ch = self._sessions.get(session_id)
             if not ch:
                 ch = _SessionChannel(session_id)
                 self._sessions[session_id] = ch
+                early = self._pending.take(session_id)
+                if deferred:
+                    ch.backlog = early
+                else:
+                    replay = early
 
             q: AsyncEventQueue[Dict[str, Any]] = AsyncEventQueue()
             ch.subscribers.add(q)
@@ -94,119 +386,218 @@ class ConnectionManager:
                     if ch.subscribers.__len__() == 0 and ch.ended:
                         self._sessions.pop(session_id, None)
 
-            return SessionSubscription(ch.emitter, q, _on_close)
+            sub = SessionSubscription(ch.emitter, q, _on_close, lambda: self._release(ch))
+        for msg in replay:
+            self._dispatcher.submit(session_id, lambda msg=msg: self._dispatch(ch, msg))
+        return sub
+
+    def pending_event_stats(self) -> PendingEventStats:
+        return self._pending.stats()
+
+    def dispatch_stats(self) -> DispatchStats:
+        return self._dispatcher.stats()
+
+    def _release(self, ch: _SessionChannel) -> None:
+        with ch.delivery:
+            backlog, ch.backlog = ch.backlog, None
+            for msg in backlog or ():
+                self._deliver(ch, msg)
+
+    def _dispatch(self, ch: _SessionChannel, msg: RunEvent, received: Optional[float] = None) -> None:
+        if received is not None:
+            self._lag = 0.8 * self._lag + 0.2 * (time.monotonic() - received)
+        with ch.delivery:
+            if ch.backlog is not None:
+                ch.backlog.append(msg)
+                return
+            self._deliver(ch, msg)
+
+    def _deliver(self, ch: _SessionChannel, msg: RunEvent) -> None:
+        for q in list(ch.subscribers):
+            q.push(msg)
+        ch.emitter.emit("run.event", msg)
+        ev_type = msg.type
+        if isinstance(ev_type, str) and _is_final_event(ev_type):
+            ch.ended = True
+            ch.emitter.emit("end", {"type": ev_type})
+            for q in list(ch.subscribers):
+                q.close()
+            ch.subscribers.clear()
+            # Remove channel
+            self._sessions.pop(ch.session_id, None)
+
+    @property
+    def can_resume(self) -> bool:
+        """True when a reconnect will replay missed events via Last-Event-ID."""
+        return self._resume.last_event_id is not None
+
+    def resume_stats(self) -> ResumeStats:
+        return self._resume.stats()
 
     def _emit_all(self, event: str, payload: Any | None = None) -> None:
         for ch in list(self._sessions.values()):
-            ch.emitter.emit(event, payload)
+            self._dispatcher.submit(
+                ch.session_id, lambda ch=ch: ch.emitter.emit(event, payload), block=not self._shared_reader
+            )
+
+    def close(self) -> None:
+        """Closes the stream and stops its reconnects and heartbeat watchdog for good."""
+        with self._lock:
+            self._closed = True
+            watchdog, self._watchdog = self._watchdog, None
+            conn, self._conn = self._conn, None
+        self._reconnector.stop()
+        if isinstance(watchdog, Timer):
+            watchdog.cancel()
+        if conn is not None:
+            conn.close()
 
     def _open_mux_connection(self) -> None:
-        if self._connecting or self._connected:
+        if self._connecting or self._connected or self._closed:
             return
         if not self._client_id:
             self.ensure_client_id()
 
         self._connecting = True
         url = f"{self._base_url}/run/clients/{self._client_id}/events"
-        headers = {"cc-key": self._api_key}
+        headers = {"cc-key": self._api_key, **self._resume.request_headers()}
 
         def on_open() -> None:
             with self._lock:
                 self._connected = True
                 self._connecting = False
+            self._attempt_done.set()
+            self._heartbeat.reset()
+            self._start_watchdog()
             self._emit_all("open")
 
         def on_event(evt: Dict[str, Any]) -> None:
+            if evt.get("event") == "ping":
+                self._heartbeat.ping()
+            else:
+                self._heartbeat.frame()
+            if not self._resume.accept(evt.get("id")):
+                return
             # Expected events: {event: 'ping'| 'run.event', data: {...}}
             if evt.get("event") == "ping":
-                self._emit_all("ping", evt)
+                if self._sessions:
+                    self._emit_all("ping", _decoded(evt))
                 return
             if evt.get("event") == "run.event":
-                raw_data = evt.get("data")
-                data: Dict[str, Any] = {}
-                if isinstance(raw_data, dict):
-                    inner = raw_data.get("data")
-                    if isinstance(inner, dict):
-                        data = inner
-                    else:
-                        data = raw_data
-                payload = data.get("payload") if isinstance(data, dict) else None
-                session_id = None
-                if isinstance(payload, dict):
-                    val = payload.get("session_id") or payload.get("sessionId")
-                    if isinstance(val, str):
-                        session_id = val
-                if session_id is None and isinstance(data, dict):
-                    val = data.get("session_id") or data.get("sessionId")
-                    if isinstance(val, str):
-                        session_id = val
-                if not session_id:
-                    return
-                ch = self._sessions.get(session_id)
-                if not ch:
+                # Routed on the raw text; the body is decoded when a consumer reads it
+                routed = route_frame(evt.get("data"))
+                if routed is None:
                     return
-                msg = {"event": "run.event", "data": data}
-                for q in list(ch.subscribers):
-                    q.push(msg)
-                ch.emitter.emit("run.event", msg)
-                ev_type = data.get("event")
-                if isinstance(ev_type, str) and _is_final_event(ev_type):
-                    ch.ended = True
-                    ch.emitter.emit("end", {"type": ev_type})
-                    for q in list(ch.subscribers):
-                        q.close()
-                    ch.subscribers.clear()
-                    # Remove channel
-                    self._sessions.pop(session_id, None)
+                session_id, msg = routed
+                received = time.monotonic()
+                self._rate.add()
+                with self._lock:
+                    ch = self._sessions.get(session_id)
+                    if not ch:
+                        # Not subscribed (yet); keep it for the first subscriber
+                        self._pending.add(session_id, msg, len(evt.get("raw") or ""))
+                        return
+                # The shared reader pauses on saturated() instead of blocking
+                self._dispatcher.submit(
+                    session_id, lambda: self._dispatch(ch, msg, received), block=not self._shared_reader
+                )
 
         def on_error(err: Exception) -> None:
+            # on_close follows and starts the reconnect
             self._emit_all("error", err)
-            with self._lock:
-                if not self._reconnecting:
-                    self._schedule_reconnect()
 
         def on_close() -> None:
             with self._lock:
                 self._connected = False
                 self._connecting = False
+            self._attempt_done.set()
             self._emit_all("close")
-            with self._lock:
-                if not self._reconnecting:
-                    self._schedule_reconnect()
+            self._reconnector.trigger(len(self._sessions))
 
+        opener = self._runtime.open_sse if self._shared_reader and self._runtime is not None else open_sse
         try:
-            self._conn = open_sse(
+            self._conn = opener(
                 url,
-                SSEHandlers(on_open=on_open, on_event=on_event, on_error=on_error, on_close=on_close),
+                SSEHandlers(
+                    on_open=on_open,
+                    on_event=on_event,
+                    on_error=on_error,
+                    on_close=on_close,
+                    paused=self._dispatcher.saturated,
+                    on_retry=self._outages.set_server_retry,
+                ),
                 headers=headers,
+                decode_json=False,
             )
         except Exception:
-            with self._lock:
-                self._connected = False
-                self._connecting = False
-                if not self._reconnecting:
-                    self._schedule_reconnect()
+            self._connected = False
+            self._connecting = False
+            self._attempt_done.set()
+            self._reconnector.trigger(len(self._sessions))
+
+    def heartbeat_stats(self) -> HeartbeatStats:
+        return self._heartbeat.stats()
 
-    def _schedule_reconnect(self) -> None:
-        if self._reconnecting:
+    def _start_watchdog(self) -> None:
+        if not self._heartbeat.options.enabled:
             return
-        self._reconnecting = True
-
-        def worker() -> None:
-            for delay in self._reconnect_delays:
-                # Notify listeners about reconnect attempt
-                for ch in list(self._sessions.values()):
-                    ch.emitter.emit("reconnect", {"attemptDelayMs": int(delay * 1000)})
-                time.sleep(delay)
-                try:
-                    self._open_mux_connection()
-                    if self._connected:
-                        self._reconnecting = False
-                        return
-                except Exception:
-                    pass
-            # Give up; keep flag false so that new subscribe/connect can reattempt
-            self._reconnecting = False
+        with self._lock:
+            if self._watchdog is not None:
+                return
+            if self._runtime is not None:
+                self._watchdog = self._runtime.call_later(
+                    self._heartbeat.options.check_interval, self._watch_timer, blocking=True
+                )
+            else:
+                self._watchdog = threading.Thread(target=self._watch, name="cloudcruise-heartbeat", daemon=True)
+                self._watchdog.start()
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self._heartbeat.options.check_interval)
+            if not self._check_stall():
+                return
+
+    def _watch_timer(self) -> None:
+        if self._check_stall() and self._runtime is not None:
+            with self._lock:
+                if self._closed:
+                    return
+                self._watchdog = self._runtime.call_later(
+                    self._heartbeat.options.check_interval, self._watch_timer, blocking=True
+                )
+
+    def _check_stall(self) -> bool:
+        """
+        Aborts a stream that went silent so the usual reconnect/resume path
+        takes over. Returns False once the watchdog should stop.
+        """
+        with self._lock:
+            if self._closed or not (self._connected or self._connecting or self._reconnector.running):
+                # Stream is gone for good; on_open starts a new watchdog
+                self._watchdog = None
+                return False
+            stale = self._connected and self._heartbeat.is_stale()
+            conn = self._conn if stale else None
+        if conn is not None:
+            self._heartbeat.record_stall()
+            self._emit_all("stale", self._heartbeat.stats())
+            conn.close()
+        return True
+
+    def _try_connect(self, timeout: float) -> bool:
+        """One reconnect attempt: reopens the stream and waits until it opens or fails."""
+        self._attempt_done.clear()
+        self._open_mux_connection()
+        self._attempt_done.wait(timeout)
+        return self._connected
+
+    def add_outage_check(self, check: OutageCheck) -> None:
+        """
+        Registers `check(reconnected)`, run once after every failed reconnect
+        attempt and once when the stream is back, however many sessions it serves.
+        """
+        self._reconnector.add_check(check)
 
-        t = threading.Thread(target=worker, name="cloudcruise-reconnect", daemon=True)
-        t.start()
+    def reconnect_stats(self) -> ReconnectStats:
+        return self._outages.stats()
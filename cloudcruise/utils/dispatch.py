@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable
+
+
+@dataclass
+class DispatchOptions:
+    # "pool" runs handlers on worker threads; "inline" runs them on the SSE
+    # reader thread (the historical behaviour)
+    mode: str = "pool"
+    max_workers: int = 4
+    # Queued callbacks before the SSE reader blocks (backpressure)
+    max_pending: int = 10_000
+    # Seconds an idle worker thread lingers before exiting
+    idle_timeout: float = 30.0
+
+
+@dataclass
+class DispatchStats:
+    mode: str
+    workers: int
+    pending: int
+    high_water: int
+    submitted: int
+    completed: int
+    # Times a submit had to wait because max_pending was reached
+    blocked: int
+
+
+class EventDispatcher:
+    """
+    Runs event callbacks off the SSE reader thread. Callbacks submitted with
+    the same key (a session id) run serially in submission order; different
+    keys run in parallel on up to `max_workers` threads.
+    """
+
+    def __init__(self, options: DispatchOptions | None = None) -> None:
+        self._options = options or DispatchOptions()
+        if self._options.mode not in ("pool", "inline"):
+            raise ValueError(f"Unknown dispatch mode {self._options.mode!r}; expected 'pool' or 'inline'")
+        self._inline = self._options.mode == "inline"
+        self._queues: Dict[Hashable, Deque[Callable[[], None]]] = {}
+        self._ready: Deque[Hashable] = deque()
+        self._cv = threading.Condition()
+        self._workers = 0
+        self._idle = 0
+        self._pending = 0
+        self._high_water = 0
+        self._submitted = 0
+        self._completed = 0
+        self._blocked = 0
+
+    @property
+    def inline(self) -> bool:
+        return self._inline
+
+    def saturated(self) -> bool:
+        """True while max_pending callbacks are queued: readers should pause."""
+        return not self._inline and self._pending >= self._options.max_pending
+
+    def submit(self, key: Hashable, callback: Callable[[], None], block: bool = True) -> None:
+        """
+        Queues `callback` behind earlier ones of the same key. With `block`
+        the caller waits while the pool is saturated; a caller that must not
+        block (an event loop) checks saturated() and pauses itself instead.
+        """
+        if self._inline:
+            self._submitted += 1
+            self._run(callback)
+            self._completed += 1
+            return
+        with self._cv:
+            if block and self._pending >= self._options.max_pending:
+                self._blocked += 1
+                while self._pending >= self._options.max_pending:
+                    self._cv.wait()
+            self._submitted += 1
+            self._pending += 1
+            self._high_water = max(self._high_water, self._pending)
+            queue = self._queues.get(key)
+            if queue is None:
+                # No callback of this key is queued or running: schedule it
+                self._queues[key] = deque([callback])
+                self._ready.append(key)
+                self._cv.notify_all()
+                if self._idle == 0 and self._workers < self._options.max_workers:
+                    self._start_worker()
+            else:
+                queue.append(callback)
+
+    def _start_worker(self) -> None:
+        self._workers += 1
+        threading.Thread(target=self._work, name="cloudcruise-dispatch", daemon=True).start()
+
+    def _work(self) -> None:
+        while True:
+            with self._cv:
+                while not self._ready:
+                    self._idle += 1
+                    woke = self._cv.wait(self._options.idle_timeout)
+                    self._idle -= 1
+                    if not woke and not self._ready:
+                        self._workers -= 1
+                        return
+                key = self._ready.popleft()
+                callback = self._queues[key].popleft()
+            self._run(callback)
+            with self._cv:
+                self._pending -= 1
+                self._completed += 1
+                if self._queues[key]:
+                    self._ready.append(key)
+                else:
+                    del self._queues[key]
+                self._cv.notify_all()
+
+    @staticmethod
+    def _run(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception:
+            # Handler errors must not kill the worker or the reader
+            pass
+
+    def stats(self) -> DispatchStats:
+        with self._cv:
+            return DispatchStats(
+                mode=self._options.mode,
+                workers=self._workers,
+                pending=self._pending,
+                high_water=self._high_water,
+                submitted=self._submitted,
+                completed=self._completed,
+                blocked=self._blocked,
+            )
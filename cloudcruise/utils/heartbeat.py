@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+
+@dataclass
+class HeartbeatOptions:
+    # Consecutive ping intervals without any frame before the stream is stale
+    missed_pings: int = 3
+    # Assumed ping interval until one has been observed
+    initial_interval: Optional[float] = None
+    # Learned intervals below this are ignored (bursts, replays)
+    min_interval: float = 0.5
+    # Seconds between staleness checks
+    check_interval: float = 1.0
+    enabled: bool = True
+
+
+@dataclass
+class HeartbeatStats:
+    # Learned ping interval (median of recent intervals), None until observed
+    interval: Optional[float]
+    # Standard deviation of recent ping intervals, and the largest deviation seen
+    jitter: float
+    max_jitter: float
+    pings: int
+    # Streams declared stale and reconnected
+    stalls: int
+    # Seconds since the last frame of any kind
+    silence: Optional[float]
+
+
+class HeartbeatMonitor:
+    """
+    Learns the server's ping interval and reports the stream stale once
+    `missed_pings` intervals pass without any frame. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        options: Optional[HeartbeatOptions] = None,
+        window: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.options = options or HeartbeatOptions()
+        self._clock = clock
+        self._intervals: Deque[float] = deque(maxlen=window)
+        self._last_ping: Optional[float] = None
+        self._last_frame: Optional[float] = None
+        self._pings = 0
+        self._stalls = 0
+        self._max_jitter = 0.0
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """A (re)opened stream: restart the silence timer, keep what was learned."""
+        with self._lock:
+            self._last_frame = self._clock()
+            self._last_ping = None
+
+    def ping(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._pings += 1
+            if self._last_ping is not None:
+                gap = now - self._last_ping
+                if gap >= self.options.min_interval:
+                    expected = self._interval()
+                    if expected is not None:
+                        self._max_jitter = max(self._max_jitter, abs(gap - expected))
+                    self._intervals.append(gap)
+            self._last_ping = now
+            self._last_frame = now
+
+    def frame(self) -> None:
+        """Any other frame also proves the stream is alive."""
+        with self._lock:
+            self._last_frame = self._clock()
+
+    def _interval(self) -> Optional[float]:
+        if self._intervals:
+            return statistics.median(self._intervals)
+        return self.options.initial_interval
+
+    def is_stale(self) -> bool:
+        with self._lock:
+            interval = self._interval()
+            if interval is None or self._last_frame is None:
+                return False
+            return self._clock() - self._last_frame > self.options.missed_pings * interval
+
+    def record_stall(self) -> None:
+        with self._lock:
+            self._stalls += 1
+            # Do not report the same silence twice while reconnecting
+            self._last_frame = None
+
+    def stats(self) -> HeartbeatStats:
+        with self._lock:
+            intervals = list(self._intervals)
+            return HeartbeatStats(
+                interval=self._interval(),
+                jitter=statistics.pstdev(intervals) if len(intervals) > 1 else 0.0,
+                max_jitter=self._max_jitter,
+                pings=self._pings,
+                stalls=self._stalls,
+                silence=None if self._last_frame is None else self._clock() - self._last_frame,
+            )
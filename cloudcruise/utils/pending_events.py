@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, List, Tuple
+
+
+@dataclass
+class PendingEventStats:
+    sessions: int
+    events: int
+    # Approximate payload size of the buffered frames
+    bytes: int
+    expired_sessions: int
+    evicted_sessions: int
+    evicted_events: int
+    replayed_events: int
+
+
+class _PendingSession:
+    __slots__ = ("created_at", "events", "bytes")
+
+    def __init__(self, created_at: float) -> None:
+        self.created_at = created_at
+        self.events: Deque[Tuple[Any, int]] = deque()
+        self.bytes = 0
+
+
+class PendingEventBuffer:
+    """
+    Holds events for session ids nobody has subscribed to yet, so a run
+    that emits before its subscriber registers loses nothing. Bounded by
+    `max_sessions` and `max_events_per_session` (oldest first) and by
+    `ttl` seconds per session.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1024,
+        max_events_per_session: int = 64,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_sessions = max_sessions
+        self._max_events = max_events_per_session
+        self._ttl = ttl
+        self._clock = clock
+        self._sessions: "OrderedDict[str, _PendingSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._events = 0
+        self._bytes = 0
+        self._expired = 0
+        self._evicted_sessions = 0
+        self._evicted_events = 0
+        self._replayed = 0
+
+    def add(self, session_id: str, event: Any, size: int = 0) -> None:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = self._sessions[session_id] = _PendingSession(now)
+                while len(self._sessions) > self._max_sessions:
+                    _, oldest = self._sessions.popitem(last=False)
+                    self._drop(oldest)
+                    self._evicted_sessions += 1
+            entry.events.append((event, size))
+            entry.bytes += size
+            self._events += 1
+            self._bytes += size
+            if len(entry.events) > self._max_events:
+                _, dropped = entry.events.popleft()
+                entry.bytes -= dropped
+                self._events -= 1
+                self._bytes -= dropped
+                self._evicted_events += 1
+
+    def take(self, session_id: str) -> List[Any]:
+        """Removes and returns the buffered events of a session, oldest first."""
+        with self._lock:
+            self._expire(self._clock())
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                return []
+            self._drop(entry)
+            self._replayed += len(entry.events)
+            return [event for event, _ in entry.events]
+
+    def _drop(self, entry: _PendingSession) -> None:
+        self._events -= len(entry.events)
+        self._bytes -= entry.bytes
+
+    def _expire(self, now: float) -> None:
+        # Sessions are kept in creation order, so expired ones are at the front
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if now - entry.created_at < self._ttl:
+                return
+            del self._sessions[session_id]
+            self._drop(entry)
+            self._expired += 1
+
+    def stats(self) -> PendingEventStats:
+        with self._lock:
+            self._expire(self._clock())
+            return PendingEventStats(
+                sessions=len(self._sessions),
+                events=self._events,
+                bytes=self._bytes,
+                expired_sessions=self._expired,
+                evicted_sessions=self._evicted_sessions,
+                evicted_events=self._evicted_events,
+                replayed_events=self._replayed,
+            )
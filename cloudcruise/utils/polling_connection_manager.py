@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from ..events.run_event import RunEvent
+from .connection_manager import ConnectionManager, SessionSubscription, _is_final_event
+from .dispatch import DispatchOptions
+from .runtime import Runtime, Timer, get_runtime
+
+
+@dataclass
+class PollingOptions:
+    # A run is first polled this soon after subscribing; every poll that
+    # sees no change multiplies the interval by `backoff`, up to `max_interval`
+    initial_interval: float = 1.0
+    max_interval: float = 15.0
+    backoff: float = 1.5
+    # Interval while a run waits for user input; submitting it polls at once
+    interaction_interval: float = 0.5
+    # GET /run/{session_id} requests in flight at once, over all runs
+    max_concurrency: int = 8
+
+
+@dataclass
+class PollingStats:
+    # Runs currently being polled
+    sessions: int
+    polls: int
+    # Status changes turned into run events
+    changes: int
+    errors: int
+    in_flight: int
+
+
+class _PolledRun:
+    __slots__ = ("session_id", "status", "interval", "timer", "in_flight", "due_now")
+
+    def __init__(self, session_id: str, interval: float) -> None:
+        self.session_id = session_id
+        self.status: Optional[str] = None
+        self.interval = interval
+        self.timer: Optional[Timer] = None
+        self.in_flight = False
+        # Poll again as soon as the one in flight returns
+        self.due_now = False
+
+
+def _event_payload(session_id: str, result: Any) -> Dict[str, Any]:
+    """The event payload a polled run result stands for (see EndRunPayload)."""
+    if not isinstance(result, dict):
+        result = getattr(result, "__dict__", {})
+    payload: Dict[str, Any] = {"session_id": session_id}
+    for key in ("workflow_id", "status", "data", "input_variables", "errors", "file_urls"):
+        if result.get(key) is not None:
+            payload[key] = result[key]
+    return payload
+
+
+class PollingConnectionManager(ConnectionManager):
+    """
+    Drop-in replacement for the SSE connection manager where long-lived
+    streams are blocked: every subscribed run is polled with
+    GET /run/{session_id} from one scheduler (the runtime's timer wheel),
+    and each status change is delivered as the run.event (and, for a final
+    status, the end) the stream would have sent. Polled events carry only
+    what the results endpoint returns; steps between two polls are not seen.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        fetch: Callable[[str], Any],
+        options: Optional[PollingOptions] = None,
+        dispatch: Optional[DispatchOptions] = None,
+        runtime: Optional[Runtime] = None,
+    ) -> None:
+        super().__init__(base_url, api_key, dispatch)
+        self._fetch = fetch
+        self._options = options or PollingOptions()
+        self._timers = runtime or get_runtime()
+        self._polled: Dict[str, _PolledRun] = {}
+        self._poll_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._polls = 0
+        self._changes = 0
+        self._errors = 0
+        self._in_flight = 0
+
+    def connect_if_needed(self) -> None:
+        """There is no stream to open."""
+
+    def close(self) -> None:
+        """Stops polling every run."""
+        with self._poll_lock:
+            self._closed = True
+            runs = list(self._polled.values())
+            self._polled.clear()
+            pool, self._pool = self._pool, None
+        for run in runs:
+            if run.timer is not None:
+                run.timer.cancel()
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def subscribe(
+        self,
+        session_id: str,
+        stop_event: Optional[threading.Event] = None,
+        deferred: bool = False,
+    ) -> SessionSubscription:
+        sub = super().subscribe(session_id, stop_event, deferred)
+        with self._poll_lock:
+            if not self._closed and session_id not in self._polled:
+                run = _PolledRun(session_id, self._options.initial_interval)
+                self._polled[session_id] = run
+                self._schedule(run, run.interval)
+        return sub
+
+    def poke(self, session_id: str) -> None:
+        """Polls a run now, e.g. right after user input was submitted."""
+        with self._poll_lock:
+            run = self._polled.get(session_id)
+            if run is None:
+                return
+            run.interval = self._options.interaction_interval
+            if run.in_flight:
+                run.due_now = True
+                return
+            if run.timer is not None:
+                run.timer.cancel()
+            run.timer = None
+        self._submit(run)
+
+    def _schedule(self, run: _PolledRun, delay: float) -> None:
+        run.timer = self._timers.call_later(delay, lambda: self._submit(run))
+
+    def _submit(self, run: _PolledRun) -> None:
+        with self._poll_lock:
+            if self._closed or run.in_flight or self._polled.get(run.session_id) is not run:
+                return
+            run.in_flight = True
+            run.timer = None
+            self._in_flight += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._options.max_concurrency, thread_name_prefix="cloudcruise-poll"
+                )
+            pool = self._pool
+        pool.submit(self._poll, run)
+
+    def _poll(self, run: _PolledRun) -> None:
+        result: Any = None
+        try:
+            result = self._fetch(run.session_id)
+        except Exception:
+            pass
+        status = None
+        if result is not None:
+            status = result.get("status") if isinstance(result, dict) else getattr(result, "status", None)
+        opts = self._options
+        with self._poll_lock:
+            self._in_flight -= 1
+            self._polls += 1
+            run.in_flight = False
+            changed = isinstance(status, str) and status != run.status
+            if result is None:
+                self._errors += 1
+            if changed:
+                run.status = status
+                self._changes += 1
+            ch = self._sessions.get(run.session_id)
+            if ch is None or ch.ended or not ch.subscribers or (changed and _is_final_event(status)):
+                # Ended, or nobody is listening any more
+                self._polled.pop(run.session_id, None)
+                if not changed:
+                    return
+            elif run.status == "interaction.waiting":
+                run.interval = opts.interaction_interval
+            elif changed:
+                run.interval = opts.initial_interval
+            else:
+                run.interval = min(opts.max_interval, max(run.interval, opts.initial_interval) * opts.backoff)
+            if self._polled.get(run.session_id) is run:
+                delay = 0.0 if run.due_now else run.interval
+                run.due_now = False
+                self._schedule(run, delay)
+        if changed and ch is not None:
+            msg = RunEvent(
+                {
+                    "event": status,
+                    "payload": _event_payload(run.session_id, result),
+                    "timestamp": int(time.time() * 1000),
+                }
+            )
+            received = time.monotonic()
+            self._rate.add()
+            self._dispatcher.submit(run.session_id, lambda: self._dispatch(ch, msg, received))
+
+    def polling_stats(self) -> PollingStats:
+        with self._poll_lock:
+            return PollingStats(
+                sessions=len(self._polled),
+                polls=self._polls,
+                changes=self._changes,
+                errors=self._errors,
+                in_flight=self._in_flight,
+            )
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+
+@dataclass
+class ReconnectPolicy:
+    # Delay before attempt n is drawn from [d * (1 - jitter), d] with
+    # d = min(max_delay, base_delay * multiplier**n); there is no attempt limit
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    # Seconds to wait for a reopened stream to report success or failure
+    connect_timeout: float = 30.0
+    # Never reconnect sooner than the reconnection time the server sent in
+    # an SSE `retry:` field; it also raises base_delay (and max_delay) to it
+    honor_server_retry: bool = True
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random, floor: float = 0.0) -> float:
+        base = max(self.base_delay, floor)
+        capped = min(max(self.max_delay, base), base * self.multiplier ** min(attempt, 64))
+        return max(floor, capped * (1 - self.jitter * rng()))
+
+
+@dataclass
+class ReconnectStats:
+    # Connection attempts made while the stream was down
+    attempts: int
+    # Outages so far, and how many of them ended with the stream back up
+    outages: int
+    recoveries: int
+    # Seconds spent disconnected over all finished outages, and in the current one
+    downtime: float
+    current_outage: Optional[float]
+    # Subscribed sessions at the start of each outage, summed
+    sessions_affected: int
+    # Coalesced status checks run for sessions that lost their stream
+    status_checks: int
+
+
+class OutageTracker:
+    """Reconnect bookkeeping shared by the sync and asyncio connection managers."""
+
+    def __init__(self, policy: Optional[ReconnectPolicy] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.policy = policy or ReconnectPolicy()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        self.attempt = 0
+        self._attempts = 0
+        self._outages = 0
+        self._recoveries = 0
+        self._downtime = 0.0
+        self._sessions = 0
+        self._checks = 0
+        # Reconnection time from the stream's last `retry:` field, in seconds
+        self.server_retry: Optional[float] = None
+
+    @property
+    def down(self) -> bool:
+        return self._started is not None
+
+    def lost(self, sessions: int) -> bool:
+        """Records a lost stream; returns True when this starts a new outage."""
+        with self._lock:
+            if self._started is not None:
+                return False
+            self._started = self._clock()
+            self._outages += 1
+            self._sessions += sessions
+            self.attempt = 0
+            return True
+
+    def set_server_retry(self, retry_ms: int) -> None:
+        """Records a reconnection time the server sent in an SSE `retry:` field."""
+        self.server_retry = retry_ms / 1000
+
+    def next_delay(self, rng: Callable[[], float] = random.random) -> float:
+        with self._lock:
+            floor = self.server_retry if self.policy.honor_server_retry and self.server_retry else 0.0
+            delay = self.policy.delay(self.attempt, rng, floor)
+            self.attempt += 1
+            self._attempts += 1
+            return delay
+
+    def recovered(self) -> None:
+        with self._lock:
+            if self._started is None:
+                return
+            self._downtime += self._clock() - self._started
+            self._started = None
+            self._recoveries += 1
+            self.attempt = 0
+
+    def checked(self) -> None:
+        with self._lock:
+            self._checks += 1
+
+    def stats(self) -> ReconnectStats:
+        with self._lock:
+            return ReconnectStats(
+                attempts=self._attempts,
+                outages=self._outages,
+                recoveries=self._recoveries,
+                downtime=self._downtime,
+                current_outage=None if self._started is None else self._clock() - self._started,
+                sessions_affected=self._sessions,
+                status_checks=self._checks,
+            )
+
+
+# Called once per failed attempt (False) and once when the stream is back (True)
+OutageCheck = Callable[[bool], None]
+
+
+class ReconnectScheduler:
+    """
+    Runs the reconnect loop of one stream on a single thread: capped,
+    jittered exponential backoff and no give-up. After every failed attempt,
+    and once the stream is back, each registered check runs once. That lets
+    callers coalesce per-session recovery work into one batch per attempt.
+
+    With `call_later(delay, fn)` (e.g. the runtime's timer wheel) no thread
+    is held while waiting; each attempt runs as a timer callback instead.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[float], bool],
+        tracker: OutageTracker,
+        on_attempt: Optional[Callable[[float], None]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+        call_later: Optional[Callable[[float, Callable[[], None]], Any]] = None,
+    ) -> None:
+        self._connect = connect
+        self._call_later = call_later
+        self._tracker = tracker
+        self._on_attempt = on_attempt
+        self._sleep = sleep
+        self._rng = rng
+        self._checks: List[OutageCheck] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._stopped = False
+        # The scheduled attempt when run on call_later; cancelled by stop()
+        self._timer: Optional[Any] = None
+        # Streams lost so far; tells a just-reopened stream that died apart from a healthy one
+        self._losses = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def pending(self) -> bool:
+        """True while an attempt is scheduled on call_later."""
+        return self._timer is not None
+
+    def add_check(self, check: OutageCheck) -> None:
+        with self._lock:
+            self._checks.append(check)
+
+    def trigger(self, sessions: int = 0) -> None:
+        """The stream was lost; starts the reconnect loop unless it already runs."""
+        if self._stopped:
+            return
+        self._tracker.lost(sessions)
+        with self._lock:
+            self._losses += 1
+            if self._running or self._stopped:
+                return
+            self._running = True
+        if self._call_later is not None:
+            self._schedule_attempt()
+        else:
+            threading.Thread(target=self._run, name="cloudcruise-reconnect", daemon=True).start()
+
+    def stop(self) -> None:
+        """Ends the loop for good and cancels a scheduled attempt."""
+        with self._lock:
+            self._stopped = True
+            timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+                self._running = False
+
+    def _run_checks(self, reconnected: bool) -> None:
+        with self._lock:
+            checks = list(self._checks)
+        if checks:
+            self._tracker.checked()
+        for check in checks:
+            try:
+                check(reconnected)
+            except Exception:
+                pass
+
+    def _finish(self, losses: int) -> bool:
+        """Ends the loop unless the new stream was lost again meanwhile."""
+        with self._lock:
+            if self._losses == losses or self._stopped:
+                self._running = False
+                return True
+        self._tracker.lost(0)
+        return False
+
+    def _next_delay(self) -> float:
+        delay = self._tracker.next_delay(self._rng)
+        if self._on_attempt is not None:
+            self._on_attempt(delay)
+        return delay
+
+    def _attempt(self) -> bool:
+        """One connection attempt; True once the loop is done."""
+        with self._lock:
+            losses = self._losses
+        try:
+            ok = self._connect(self._tracker.policy.connect_timeout)
+        except Exception:
+            ok = False
+        if not ok:
+            self._run_checks(False)
+            return False
+        self._tracker.recovered()
+        self._run_checks(True)
+        return self._finish(losses)
+
+    def _schedule_attempt(self) -> None:
+        if self._stopped:
+            with self._lock:
+                self._running = False
+            return
+        try:
+            delay = self._next_delay()
+            # Held while scheduling, so the attempt cannot start before _timer is set
+            with self._lock:
+                if self._stopped:
+                    self._running = False
+                    return
+                self._timer = self._call_later(delay, self._timed_attempt)  # type: ignore[misc]
+        except BaseException:
+            with self._lock:
+                self._running = False
+            raise
+
+    def _timed_attempt(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            done = self._stopped or self._attempt()
+        except BaseException:
+            with self._lock:
+                self._running = False
+            raise
+        if not done:
+            self._schedule_attempt()
+        elif self._stopped:
+            with self._lock:
+                self._running = False
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped:
+                self._sleep(self._next_delay())
+                if self._stopped:
+                    break
+                if self._attempt():
+                    return
+        except BaseException:
+            with self._lock:
+                self._running = False
+            raise
+        with self._lock:
+            self._running = False
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Optional
+
+from ..errors import APIConnectionError, APIError, APITimeoutError, CloudCruiseError
+
+
+# Header that lets the API de-duplicate repeated non-idempotent requests
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+@dataclass
+class RetryPolicy:
+    # Total attempts including the first one; 1 disables retries
+    max_attempts: int = 4
+    # Exponential backoff: sleep uniform(0, min(backoff_max, backoff_base * 2**n))
+    backoff_base: float = 0.5
+    backoff_max: float = 20.0
+    # Upper bound in seconds on the whole call, sleeps included (None = unbounded)
+    deadline: Optional[float] = 90.0
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({408, 425, 429, 500, 502, 503, 504}))
+    # Methods that are safe to repeat after the server may have processed them
+    idempotent_methods: FrozenSet[str] = field(
+        default_factory=lambda: frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    )
+    respect_retry_after: bool = True
+    # Also retry other methods when they carry an Idempotency-Key. Only safe
+    # if the server de-duplicates on that header: a start whose response was
+    # lost would otherwise launch a second run
+    retry_idempotency_keyed: bool = False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class RetryState:
+    """
+    Tracks attempts and the deadline of one logical request and decides
+    whether a failed attempt may be retried and after how long.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        method: str,
+        idempotent: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._policy = policy
+        self._clock = clock
+        self._started = clock()
+        self.attempt = 0
+        self._idempotent = method.upper() in policy.idempotent_methods if idempotent is None else idempotent
+
+    def remaining(self) -> Optional[float]:
+        if self._policy.deadline is None:
+            return None
+        return self._policy.deadline - (self._clock() - self._started)
+
+    def _retryable(self, error: CloudCruiseError) -> bool:
+        if isinstance(error, APIError):
+            if error.statusCode not in self._policy.retry_statuses:
+                return False
+            # 429 means the server refused the request without processing it
+            return self._idempotent or error.statusCode == 429
+        if isinstance(error, APITimeoutError):
+            return self._idempotent
+        if isinstance(error, APIConnectionError):
+            return self._idempotent
+        return False
+
+    def next_delay(self, error: CloudCruiseError) -> Optional[float]:
+        """Returns the sleep before the next attempt, or None to give up."""
+        self.attempt += 1
+        if self.attempt >= self._policy.max_attempts or not self._retryable(error):
+            return None
+        cap = min(self._policy.backoff_max, self._policy.backoff_base * (2 ** (self.attempt - 1)))
+        delay = random.uniform(0, cap)
+        if self._policy.respect_retry_after and isinstance(error, APIError) and error.retryAfter is not None:
+            delay = max(delay, error.retryAfter)
+        remaining = self.remaining()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
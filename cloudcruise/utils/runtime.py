@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from .async_sse import stream_sse
+from .sse import SSEConnection, SSEHandlers, open_sse
+
+
+class Timer:
+    __slots__ = ("expires", "callback", "cancelled")
+
+    def __init__(self, expires: int, callback: Callable[[], None]) -> None:
+        self.expires = expires
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel: `levels` wheels of `slots` slots each, level n
+    covering slots**(n+1) ticks. Scheduling and cancelling are O(1); a timer
+    cascades down one level each time its coarser slot comes up, so it is
+    touched at most `levels` times before it fires. Not thread-safe.
+    """
+
+    def __init__(self, tick: float = 0.05, slots: int = 64, levels: int = 4, now: float = 0.0) -> None:
+        if slots & (slots - 1) or slots < 2:
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = levels
+        self._wheels: List[List[List[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._current = int(now / tick)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, delay: float, callback: Callable[[], None], now: Optional[float] = None) -> Timer:
+        """
+        Fires `callback` on the first advance at least `delay` seconds after
+        `now` (default: the wheel's current tick).
+        """
+        start = self._current * self.tick if now is None else now
+        timer = Timer(max(self._current + 1, math.ceil((start + delay) / self.tick)), callback)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def _place(self, timer: Timer) -> None:
+        delta = max(0, timer.expires - self._current)
+        level = 0
+        while level < self._levels - 1 and delta >> (self._bits * (level + 1)):
+            level += 1
+        slot = (timer.expires >> (self._bits * level)) & self._mask
+        self._wheels[level][slot].append(timer)
+
+    def _cascade(self, level: int) -> None:
+        slot = (self._current >> (self._bits * level)) & self._mask
+        if slot == 0 and level + 1 < self._levels:
+            self._cascade(level + 1)
+        timers = self._wheels[level][slot]
+        self._wheels[level][slot] = []
+        for timer in timers:
+            if timer.cancelled:
+                self._count -= 1
+            else:
+                self._place(timer)
+
+    def next_expiry(self) -> Optional[float]:
+        """
+        The time of the next advance that can fire or cascade a timer, or None
+        when the wheel is empty. Never later than the earliest timer's expiry;
+        O(levels * slots), whatever the number of timers.
+        """
+        if not self._count:
+            return None
+        best: Optional[int] = None
+        slots = self._mask + 1
+        for level in range(self._levels):
+            shift = self._bits * level
+            base = self._current >> shift
+            for i in range(1, slots + 1):
+                if self._wheels[level][(base + i) & self._mask]:
+                    # Level 0 fires at that tick; coarser levels cascade there
+                    tick = (base + i) << shift
+                    best = tick if best is None else min(best, tick)
+                    break
+        return None if best is None else best * self.tick
+
+    def advance(self, now: float) -> List[Callable[[], None]]:
+        """Moves the wheel to `now` and returns the callbacks that came due, in order."""
+        target = int(now / self.tick)
+        if not self._count:
+            self._current = max(self._current, target)
+            return []
+        due: List[Callable[[], None]] = []
+        while self._current < target and self._count:
+            self._current += 1
+            if self._current & self._mask == 0:
+                self._cascade(1)
+            slot = self._current & self._mask
+            timers = self._wheels[0][slot]
+            self._wheels[0][slot] = []
+            for timer in timers:
+                if timer.expires > self._current:
+                    # Placed in a lap that has not come round yet
+                    self._wheels[0][slot].append(timer)
+                    continue
+                self._count -= 1
+                if not timer.cancelled:
+                    due.append(timer.callback)
+        self._current = max(self._current, target)
+        return due
+
+
+@dataclass
+class RuntimeStats:
+    # Live SDK threads (named "cloudcruise-*"), the I/O thread included
+    threads: int
+    # Event streams currently read on the I/O thread
+    streams: int
+    # Timers waiting on the wheel, and timers fired so far
+    timers: int
+    timers_fired: int
+    # Wake-ups of the wheel; it sleeps until the next timer is due
+    ticks: int
+    # Workers started for blocking timer callbacks
+    workers: int
+
+
+class Runtime:
+    """
+    The SDK's runtime core: one thread running a selector-driven asyncio
+    loop that reads every event stream, plus a timer wheel on that thread
+    for backoffs and periodic checks. Blocking timer callbacks run on a
+    small worker pool instead, so nothing sleeps on a thread of its own.
+    """
+
+    def __init__(self, tick: float = 0.05, workers: int = 4) -> None:
+        self._tick = tick
+        self._max_workers = workers
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wheel = TimerWheel(tick, now=time.monotonic())
+        # When the pending tick on the loop is due; None when none is set
+        self._wake_at: Optional[float] = None
+        self._tick_handle: Optional[asyncio.TimerHandle] = None
+        self._fired = 0
+        self._ticks = 0
+        self._streams = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="cloudcruise-io", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _worker_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="cloudcruise-worker")
+            return self._pool
+
+    def open_sse(
+        self,
+        url: str,
+        handlers: SSEHandlers,
+        headers: Optional[Dict[str, str]] = None,
+        decode_json: bool = True,
+    ) -> SSEConnection:
+        """
+        Like open_sse, but read on the I/O thread, where the handlers also
+        run; they must not block. Streams that go through an HTTP proxy fall
+        back to open_sse and a thread of their own.
+        """
+        if requests.utils.get_environ_proxies(url):
+            return open_sse(url, handlers, headers=headers, decode_json=decode_json)
+        loop = self._ensure_loop()
+        with self._lock:
+            self._streams += 1
+        future = asyncio.run_coroutine_threadsafe(stream_sse(url, handlers, headers, decode_json=decode_json), loop)
+
+        def done(_) -> None:
+            with self._lock:
+                self._streams -= 1
+
+        future.add_done_callback(done)
+        return SSEConnection(lambda: future.cancel())
+
+    def call_later(self, delay: float, callback: Callable[[], None], blocking: bool = False) -> Timer:
+        """
+        Runs `callback` after `delay` seconds (rounded up to the tick). It
+        runs on the I/O thread, or with `blocking` on a worker thread.
+        """
+        fire = partial(self._submit_blocking, callback) if blocking else callback
+        loop = self._ensure_loop()
+        with self._lock:
+            now = time.monotonic()
+            if not len(self._wheel):
+                # Fast-forward an idle wheel; a busy one is moved only by ticks
+                self._wheel.advance(now)
+            timer = self._wheel.schedule(delay, fire, now)
+            due = timer.expires * self._tick
+            rearm = self._wake_at is None or due < self._wake_at
+            if rearm:
+                self._wake_at = due
+        if rearm:
+            loop.call_soon_threadsafe(self._arm)
+        return timer
+
+    def _submit_blocking(self, callback: Callable[[], None]) -> None:
+        self._worker_pool().submit(callback)
+
+    def _arm(self) -> None:
+        # Runs on the loop: one pending tick, set for the earliest deadline
+        with self._lock:
+            wake_at = self._wake_at
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        if wake_at is not None and self._loop is not None:
+            # A little late rather than early, so the tick finds the timer due
+            delay = max(0.0, wake_at - time.monotonic()) + 0.001
+            self._tick_handle = self._loop.call_later(delay, self._on_tick)
+
+    def _on_tick(self) -> None:
+        self._tick_handle = None
+        with self._lock:
+            due = self._wheel.advance(time.monotonic())
+            self._fired += len(due)
+            self._ticks += 1
+            # Timers set by the callbacks below can only move this earlier
+            self._wake_at = self._wheel.next_expiry()
+        for callback in due:
+            try:
+                callback()
+            except Exception:
+                pass
+        self._arm()
+
+    def stats(self) -> RuntimeStats:
+        with self._lock:
+            pool = self._pool
+            return RuntimeStats(
+                threads=sum(1 for t in threading.enumerate() if t.name.startswith("cloudcruise")),
+                streams=self._streams,
+                timers=len(self._wheel),
+                timers_fired=self._fired,
+                ticks=self._ticks,
+                workers=len(pool._threads) if pool is not None else 0,
+            )
+
+
+_runtime: Optional[Runtime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> Runtime:
+    """The process-wide runtime, created on first use."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = Runtime()
+        return _runtime
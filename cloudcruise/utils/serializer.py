@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Literal, Optional, Union
+
+JsonBackendName = Literal["auto", "orjson", "ujson", "json"]
+
+
+class JsonBackend:
+    """
+    JSON encode/decode used on the SDK's hot paths: request bodies, API
+    responses, stream frames, vault payloads and webhook bodies.
+
+    Output is compact and UTF-8 (no ASCII escaping) for every backend.
+    Values the fast encoders reject, such as non-string dict keys or
+    integers wider than 64 bits, are encoded with the stdlib instead.
+    Decoding is exact too: documents a fast decoder rejects, or (with
+    `lossy_ints`) would turn into floats because they hold a run of 19 or
+    more digits, are decoded with the stdlib.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dumps_bytes: Callable[[Any], bytes],
+        loads: Callable[[Union[str, bytes]], Any],
+        lossy_ints: bool = False,
+    ) -> None:
+        self.name = name
+        self._dumps_bytes = dumps_bytes
+        self._loads = loads
+        self._lossy_ints = lossy_ints
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        try:
+            return self._dumps_bytes(obj)
+        except (TypeError, OverflowError):
+            return _stdlib_dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if self._loads is json.loads:
+            return json.loads(data)
+        if self._lossy_ints and _maybe_wide_int(data):
+            return json.loads(data)
+        try:
+            return self._loads(data)
+        except (ValueError, OverflowError):
+            return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def __repr__(self) -> str:
+        return f"JsonBackend({self.name!r})"
+
+
+# Maps ASCII digits to "0" and every other byte to " "
+_DIGIT_MASK = bytes(0x30 if 0x30 <= b <= 0x39 else 0x20 for b in range(256))
+# Integers of 19+ digits may not fit in 64 bits (int64 min is 19 digits long)
+_LONG_RUN = b"0" * 19
+
+
+def _maybe_wide_int(data: Union[str, bytes]) -> bool:
+    # translate() plus a substring search is several times cheaper than a regex
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return _LONG_RUN in data.translate(_DIGIT_MASK)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _stdlib() -> JsonBackend:
+    return JsonBackend("json", _stdlib_dumps, json.loads)
+
+
+def _orjson() -> Optional[JsonBackend]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    # orjson decodes integers outside the 64-bit range as floats
+    return JsonBackend("orjson", orjson.dumps, orjson.loads, lossy_ints=True)
+
+
+def _ujson() -> Optional[JsonBackend]:
+    try:
+        import ujson
+    except ImportError:
+        return None
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    return JsonBackend("ujson", dumps_bytes, ujson.loads)
+
+
+def load_backend(name: JsonBackendName = "auto") -> JsonBackend:
+    """
+    Returns the named backend; "auto" picks orjson, then ujson, then the
+    stdlib. Raises ValueError for an unknown name and ImportError when the
+    named package is not installed.
+    """
+    if name == "json":
+        return _stdlib()
+    if name == "auto":
+        return _orjson() or _ujson() or _stdlib()
+    loaders = {"orjson": _orjson, "ujson": _ujson}
+    if name not in loaders:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected auto, orjson, ujson or json")
+    backend = loaders[name]()
+    if backend is None:
+        raise ImportError(f"JSON backend {name!r} is not installed (pip install {name})")
+    return backend
+
+
+_backend = load_backend()
+
+
+def get_json_backend() -> JsonBackend:
+    return _backend
+
+
+def set_json_backend(name: JsonBackendName) -> JsonBackend:
+    """
+    Selects the backend used by every client in the process. Exported as
+    cloudcruise.set_json_backend.
+    """
+    global _backend
+    _backend = load_backend(name)
+    return _backend
+
+
+def dumps(obj: Any) -> str:
+    return _backend.dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    return _backend.dumps_bytes(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return _backend.loads(data)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .connection_manager import ConnectionManager, ResumeStats, SessionSubscription, ShardStats
+from .dispatch import DispatchOptions, DispatchStats, EventDispatcher
+from .heartbeat import HeartbeatOptions, HeartbeatStats
+from .lru import LRUCache
+from .pending_events import PendingEventStats
+from .reconnect import OutageCheck, ReconnectPolicy, ReconnectStats
+from .runtime import Runtime
+
+
+@dataclass
+class ShardingOptions:
+    # Streams (client_ids) to begin with; each connects on first use
+    shards: int = 2
+    # Upper bound reached by automatic scale-out
+    max_shards: int = 16
+    # A new shard is added once the shard a run hashes to holds this many
+    # subscribed sessions; 0 disables scale-out
+    scale_out_sessions: int = 500
+    # Points per shard on the hash ring; more points spread keys more evenly
+    virtual_nodes: int = 64
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring over shard indexes. Adding a shard moves only the
+    keys that land on its points, roughly 1/N of them.
+    """
+
+    def __init__(self, virtual_nodes: int = 64) -> None:
+        self._virtual_nodes = virtual_nodes
+        self._points: List[Tuple[int, int]] = []
+
+    def add(self, shard: int) -> None:
+        for i in range(self._virtual_nodes):
+            bisect.insort(self._points, (_hash(f"shard-{shard}#{i}"), shard))
+
+    def node_for(self, key: str) -> int:
+        if not self._points:
+            raise LookupError("The hash ring has no shards")
+        i = bisect.bisect(self._points, (_hash(key), -1))
+        return self._points[i % len(self._points)][1]
+
+    def __len__(self) -> int:
+        return len(self._points) // max(1, self._virtual_nodes)
+
+
+class ShardedConnectionManager:
+    """
+    Spreads sessions over several mux streams, each with its own client_id,
+    stream and reconnect/resume state, so one dropped connection only
+    disturbs the runs on that shard. A run is assigned when it is started by
+    hashing its idempotency key. The assignment is remembered, so a retried
+    start keeps its client_id even after scale-out has changed the ring.
+    Callbacks of all shards share one dispatch pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        options: Optional[ShardingOptions] = None,
+        dispatch: Optional[DispatchOptions] = None,
+        max_tracked_sessions: int = 65536,
+        heartbeat: Optional[HeartbeatOptions] = None,
+        reconnect: Optional[ReconnectPolicy] = None,
+        runtime: Optional[Runtime] = None,
+    ) -> None:
+        self._options = options or ShardingOptions()
+        if self._options.shards < 1 or self._options.max_shards < self._options.shards:
+            raise ValueError("ShardingOptions needs 1 <= shards <= max_shards")
+        self._base_url = base_url
+        self._api_key = api_key
+        self._dispatcher = EventDispatcher(dispatch)
+        self._heartbeat = heartbeat
+        self._reconnect = reconnect
+        self._runtime = runtime
+        self._outage_checks: List[OutageCheck] = []
+        self._ring = HashRing(self._options.virtual_nodes)
+        self._shards: List[ConnectionManager] = []
+        self._by_client: Dict[str, int] = {}
+        # session_id -> shard index, for subscribing after start()
+        self._placement: LRUCache[str, int] = LRUCache(max_tracked_sessions)
+        # routing key -> shard index it was first assigned to
+        self._assigned: LRUCache[str, int] = LRUCache(max_tracked_sessions)
+        self._lock = threading.Lock()
+        for _ in range(self._options.shards):
+            self._add_shard()
+
+    def _add_shard(self) -> ConnectionManager:
+        index = len(self._shards)
+        shard = ConnectionManager(
+            self._base_url,
+            self._api_key,
+            dispatcher=self._dispatcher,
+            heartbeat=self._heartbeat,
+            reconnect=self._reconnect,
+            runtime=self._runtime,
+        )
+        for check in self._outage_checks:
+            shard.add_outage_check(check)
+        self._shards.append(shard)
+        self._by_client[shard.ensure_client_id()] = index
+        self._ring.add(index)
+        return shard
+
+    def _shard_for(self, routing_key: str) -> ConnectionManager:
+        with self._lock:
+            index = self._assigned.get(routing_key)
+            if index is not None:
+                return self._shards[index]
+            index = self._ring.node_for(routing_key)
+            threshold = self._options.scale_out_sessions
+            if (
+                threshold
+                and self._shards[index].session_count() >= threshold
+                and len(self._shards) < self._options.max_shards
+            ):
+                self._add_shard()
+                index = self._ring.node_for(routing_key)
+            self._assigned.put(routing_key, index)
+            return self._shards[index]
+
+    def ensure_client_id(self) -> str:
+        return self._shards[0].ensure_client_id()
+
+    def connect_if_needed(self) -> None:
+        for shard in list(self._shards):
+            shard.connect_if_needed()
+
+    def close(self) -> None:
+        for shard in list(self._shards):
+            shard.close()
+
+    def client_id_for(self, routing_key: str) -> str:
+        return self._shard_for(routing_key).client_id_for(routing_key)
+
+    def bind(self, session_id: str, client_id: str) -> None:
+        index = self._by_client.get(client_id)
+        if index is not None:
+            self._placement.put(session_id, index)
+
+    def poke(self, session_id: str) -> None:
+        """Streams deliver changes as they happen; nothing to do."""
+
+    def subscribe(
+        self,
+        session_id: str,
+        stop_event: Optional[threading.Event] = None,
+        deferred: bool = False,
+    ) -> SessionSubscription:
+        index = self._placement.get(session_id)
+        if index is None:
+            # Not started here (or forgotten); the ring still gives a stable choice
+            index = self._ring.node_for(session_id)
+        return self._shards[index].subscribe(session_id, stop_event, deferred)
+
+    def session_count(self) -> int:
+        return sum(shard.session_count() for shard in self._shards)
+
+    @property
+    def can_resume(self) -> bool:
+        active = [shard for shard in self._shards if shard.session_count()]
+        return bool(active) and all(shard.can_resume for shard in active)
+
+    def shard_stats(self) -> List[ShardStats]:
+        return [shard._stream_stats(i) for i, shard in enumerate(list(self._shards))]
+
+    def resume_stats(self) -> ResumeStats:
+        parts = [shard.resume_stats() for shard in self._shards]
+        return ResumeStats(
+            last_event_id=None,
+            reconnects=sum(p.reconnects for p in parts),
+            resumed=sum(p.resumed for p in parts),
+            duplicates=sum(p.duplicates for p in parts),
+            gaps=sum(p.gaps for p in parts),
+            missed_events=sum(p.missed_events for p in parts),
+        )
+
+    def pending_event_stats(self) -> PendingEventStats:
+        parts = [shard.pending_event_stats() for shard in self._shards]
+        return PendingEventStats(
+            sessions=sum(p.sessions for p in parts),
+            events=sum(p.events for p in parts),
+            bytes=sum(p.bytes for p in parts),
+            expired_sessions=sum(p.expired_sessions for p in parts),
+            evicted_sessions=sum(p.evicted_sessions for p in parts),
+            evicted_events=sum(p.evicted_events for p in parts),
+            replayed_events=sum(p.replayed_events for p in parts),
+        )
+
+    def heartbeat_stats(self) -> HeartbeatStats:
+        """Heartbeats of all shards: the slowest interval, the worst jitter, summed counters."""
+        parts = [shard.heartbeat_stats() for shard in self._shards]
+        intervals = [p.interval for p in parts if p.interval is not None]
+        silences = [p.silence for p in parts if p.silence is not None]
+        return HeartbeatStats(
+            interval=max(intervals) if intervals else None,
+            jitter=max(p.jitter for p in parts),
+            max_jitter=max(p.max_jitter for p in parts),
+            pings=sum(p.pings for p in parts),
+            stalls=sum(p.stalls for p in parts),
+            silence=max(silences) if silences else None,
+        )
+
+    def add_outage_check(self, check: OutageCheck) -> None:
+        """Registers `check` on every shard, including ones added by scale-out."""
+        with self._lock:
+            self._outage_checks.append(check)
+            for shard in self._shards:
+                shard.add_outage_check(check)
+
+    def reconnect_stats(self) -> ReconnectStats:
+        """Reconnects of all shards: summed counters, the longest current outage."""
+        parts = [shard.reconnect_stats() for shard in self._shards]
+        outages = [p.current_outage for p in parts if p.current_outage is not None]
+        return ReconnectStats(
+            attempts=sum(p.attempts for p in parts),
+            outages=sum(p.outages for p in parts),
+            recoveries=sum(p.recoveries for p in parts),
+            downtime=sum(p.downtime for p in parts),
+            current_outage=max(outages) if outages else None,
+            sessions_affected=sum(p.sessions_affected for p in parts),
+            status_checks=sum(p.status_checks for p in parts),
+        )
+
+    def dispatch_stats(self) -> DispatchStats:
+        return self._dispatcher.stats()
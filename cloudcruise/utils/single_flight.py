@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Shares one call between concurrent callers asking for the same key: the
+    first caller runs it, the others wait for and get its result (or its
+    exception). Nothing is remembered once the call returns.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "Future[T]"] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Returns fn()'s result and whether it came from another caller's call."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return call.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import socket
 import threading
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 import requests
-import json
 import re
 
+from .serializer import loads
+
 
 SSEEvent = Dict[str, Any]
 
@@ -17,11 +19,17 @@ class SSEHandlers:
         on_event: Optional[Callable[[SSEEvent], None]] = None,
         on_error: Optional[Callable[[Exception], None]] = None,
         on_close: Optional[Callable[[], None]] = None,
+        paused: Optional[Callable[[], bool]] = None,
+        on_retry: Optional[Callable[[int], None]] = None,
     ) -> None:
         self.on_open = on_open
         self.on_event = on_event
         self.on_error = on_error
         self.on_close = on_close
+        # Polled by the asyncio reader between reads; while True it stops reading
+        self.paused = paused
+        # Called with the reconnection time (ms) whenever a retry: field changes it
+        self.on_retry = on_retry
 
 
 class SSEConnection:
@@ -32,6 +40,16 @@ class SSEConnection:
         self._close()
 
 
+def notify_retry(parser: "SSEParser", handlers: SSEHandlers, seen: Optional[int]) -> Optional[int]:
+    """Passes a changed `retry:` value to on_retry; returns the value now seen."""
+    if parser.retry != seen and parser.retry is not None and handlers.on_retry:
+        try:
+            handlers.on_retry(parser.retry)
+        except Exception:
+            pass
+    return parser.retry
+
+
 def _parse_frame(frame: str) -> SSEEvent:
     event = "message"
     data = ""
@@ -50,21 +68,142 @@ def _parse_frame(frame: str) -> SSEEvent:
             _id = value
     parsed: Any
     try:
-        parsed = None if data == "" else json.loads(data)
+        parsed = None if data == "" else loads(data)
     except Exception:
         parsed = data
     return {"event": event, "data": parsed, "id": _id, "raw": frame}
 
 
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+class SSEParser:
+    """
+    Incremental text/event-stream parser working on raw bytes.
+
+    Each chunk is only searched from where the previous one stopped, so a
+    frame is scanned once no matter how many chunks it arrives in. Complete
+    lines are decoded in one pass (multi-byte characters split across chunks
+    survive). `id:` and `retry:` follow the SSE spec: `last_event_id`
+    persists across events (it is what a reconnect sends as Last-Event-ID),
+    while each event's "id" is only set when that frame carried one.
+    With `decode_json=False` an event's "data" is left as the raw text.
+    """
+
+    def __init__(self, decode_json: bool = True) -> None:
+        self._decode_json = decode_json
+        self._buf = bytearray()
+        self._scan_from = 0
+        self._event = ""
+        self._data: List[str] = []
+        self._lines: List[str] = []
+        self._has_fields = False
+        self._frame_retry: Optional[int] = None
+        self._frame_id: Optional[str] = None
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consumes a chunk and returns the events it completed."""
+        buf = self._buf
+        buf += chunk
+        # A trailing CR may be the first half of a CRLF; leave it for later
+        limit = len(buf) - 1 if buf and buf[-1] == 0x0D else len(buf)
+        last = max(buf.rfind(b"\n", self._scan_from, limit), buf.rfind(b"\r", self._scan_from, limit))
+        if last == -1:
+            self._scan_from = limit
+            return []
+        text = buf[: last + 1].decode("utf-8", errors="replace")
+        del buf[: last + 1]
+        self._scan_from = len(buf) - 1 if buf and buf[-1] == 0x0D else len(buf)
+
+        events: List[SSEEvent] = []
+        lines = _LINE_END.split(text)
+        lines.pop()  # text ends with a line terminator
+        for line in lines:
+            if not line:
+                evt = self._dispatch()
+                if evt is not None:
+                    events.append(evt)
+                continue
+            if line[0] == ":":
+                continue
+            self._lines.append(line)
+            idx = line.find(":")
+            if idx == -1:
+                field, value = line, ""
+            else:
+                field = line[:idx]
+                value = line[idx + 1 :]
+                if value[:1] == " ":
+                    value = value[1:]
+            if field == "data":
+                self._data.append(value)
+            elif field == "event":
+                self._event = value
+            elif field == "id":
+                if "\0" not in value:
+                    self.last_event_id = self._frame_id = value
+            elif field == "retry":
+                if value.isascii() and value.isdigit():
+                    self.retry = self._frame_retry = int(value)
+                continue
+            else:
+                continue
+            self._has_fields = True
+        return events
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        evt: Optional[SSEEvent] = None
+        if self._has_fields:
+            data = "\n".join(self._data)
+            parsed: Any = data
+            if self._decode_json:
+                try:
+                    parsed = None if data == "" else loads(data)
+                except Exception:
+                    pass
+            evt = {
+                "event": self._event or "message",
+                "data": parsed,
+                "id": self._frame_id,
+                "retry": self._frame_retry,
+                "raw": "\n".join(self._lines),
+            }
+        self._event = ""
+        self._data = []
+        self._lines = []
+        self._has_fields = False
+        self._frame_retry = None
+        self._frame_id = None
+        return evt
+
+
+def _abort(resp: requests.Response) -> None:
+    """Unblocks a reader stuck in a socket read, e.g. on a half-open connection."""
+    try:
+        sock = getattr(resp.raw.connection, "sock", None)
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    try:
+        resp.close()
+    except Exception:
+        pass
+
+
 def open_sse(
     url: str,
     handlers: SSEHandlers,
     headers: Optional[Dict[str, str]] = None,
     with_credentials: bool = False,
     stop_event: Optional[threading.Event] = None,
+    decode_json: bool = True,
 ) -> SSEConnection:
     """
     Opens an SSE connection using requests streaming and parses frames.
+    With decode_json=False event data is passed on as text (see SSEParser).
     """
     session = requests.Session()
     req_headers = {
@@ -77,10 +216,14 @@ def open_sse(
     cancelled = threading.Event()
     if stop_event is None:
         stop_event = threading.Event()
+    current: List[requests.Response] = []
 
     def run() -> None:
         try:
             with session.get(url, headers=req_headers, stream=True, timeout=60) as resp:
+                current.append(resp)
+                if cancelled.is_set():
+                    return
                 if not resp.ok:
                     raise RuntimeError(f"SSE HTTP {resp.status_code}")
                 if handlers.on_open:
@@ -88,27 +231,22 @@ def open_sse(
                         handlers.on_open()
                     except Exception:
                         pass
-                buffer = ""
+                parser = SSEParser(decode_json)
+                retry: Optional[int] = None
                 for chunk in resp.iter_content(chunk_size=None):
                     if stop_event.is_set() or cancelled.is_set():
                         break
                     if not chunk:
                         continue
-                    try:
-                        text = chunk.decode("utf-8", errors="ignore")
-                    except Exception:
-                        continue
-                    parts = re.split(r"\r?\n\r?\n", buffer + text)
-                    buffer = parts.pop() if parts else ""
-                    for frame in parts:
-                        evt = _parse_frame(frame)
+                    for evt in parser.feed(chunk):
                         if handlers.on_event:
                             try:
                                 handlers.on_event(evt)
                             except Exception:
                                 pass
+                    retry = notify_retry(parser, handlers, retry)
         except Exception as e:
-            if handlers.on_error:
+            if handlers.on_error and not cancelled.is_set():
                 try:
                     handlers.on_error(e if isinstance(e, Exception) else Exception(str(e)))
                 except Exception:
@@ -126,5 +264,7 @@ def open_sse(
     def _close() -> None:
         cancelled.set()
         stop_event.set()
+        for resp in current:
+            _abort(resp)
 
     return SSEConnection(_close)
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..errors import APIConnectionError, APITimeoutError, api_error_for
+from .retry import parse_retry_after
+from .serializer import loads
+from .single_flight import SingleFlight
+
+
+@dataclass
+class TransportOptions:
+    # Number of per-host connection pools kept alive by the shared session
+    pool_connections: int = 10
+    # Maximum number of connections kept open per host
+    pool_maxsize: int = 32
+    # Block instead of opening throwaway connections once a host pool is exhausted
+    pool_block: bool = False
+    # Reuse connections between requests (sends "Connection: close" when disabled)
+    keep_alive: bool = True
+    # Per-request timeout in seconds
+    timeout: float = 60.0
+    # Concurrent identical GETs (same URL and headers) share one in-flight request
+    coalesce_gets: bool = True
+    # Path prefixes whose GETs are always sent on their own. Run statuses are
+    # excluded by default: a caller that joined late could otherwise get a
+    # status read before it asked
+    coalesce_exclude: Tuple[str, ...] = ("/run/",)
+
+
+@dataclass
+class TransportStats:
+    requests: int
+    new_connections: int
+    reused_connections: int
+    # Calls answered by another caller's identical in-flight GET
+    coalesced: int
+
+
+class _ConnectionCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.checkouts = 0
+        self.new_connections = 0
+        self.coalesced = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self.coalesced += 1
+
+    def snapshot(self) -> TransportStats:
+        with self._lock:
+            reused = max(0, self.checkouts - self.new_connections)
+            return TransportStats(
+                requests=self.requests,
+                new_connections=self.new_connections,
+                reused_connections=reused,
+                coalesced=self.coalesced,
+            )
+
+
+def _counting_pool(base: type, counter: _ConnectionCounter) -> type:
+    # Pools hand out idle connections and only open a socket when the checked
+    # out connection is fresh or was dropped by the server, so every checkout
+    # that does not call connect() is a reuse.
+    def connect(self):  # type: ignore[no-untyped-def]
+        counter.record_new_connection()
+        return base.ConnectionCls.connect(self)
+
+    def _get_conn(self, timeout=None):  # type: ignore[no-untyped-def]
+        counter.record_checkout()
+        return base._get_conn(self, timeout=timeout)
+
+    conn_cls = type(f"Counting{base.ConnectionCls.__name__}", (base.ConnectionCls,), {"connect": connect})
+    return type(f"Counting{base.__name__}", (base,), {"ConnectionCls": conn_cls, "_get_conn": _get_conn})
+
+
+class _CountingAdapter(HTTPAdapter):
+    def __init__(self, counter: _ConnectionCounter, **kwargs: Any) -> None:
+        self._counter = counter
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any) -> None:
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self._counter),
+            "https": _counting_pool(HTTPSConnectionPool, self._counter),
+        }
+
+
+@dataclass
+class ApiResponse:
+    status_code: int
+    # Case-insensitive mapping of the response headers
+    headers: Mapping[str, str]
+    data: Any
+
+
+def decode_response(resp: requests.Response) -> Any:
+    """
+    Returns the decoded body of a CloudCruise API response.
+    Raises a typed APIError carrying the status code for non-2xx responses.
+    """
+    if not resp.ok:
+        error_message = f"HTTP {resp.status_code}: {resp.reason}"
+        body: Any = None
+        try:
+            body = loads(resp.content)
+            error_message = body.get("message") or body.get("error") or error_message
+        except Exception:
+            body = resp.text or None
+        raise api_error_for(
+            resp.status_code,
+            error_message,
+            body,
+            parse_retry_after(resp.headers.get("retry-after")),
+        )
+
+    ctype = resp.headers.get("content-type", "")
+    if "application/json" in ctype:
+        return loads(resp.content)
+    return resp.text
+
+
+class HttpTransport:
+    """
+    Pooled keep-alive HTTP transport shared by every namespace client.
+    Safe to use from multiple threads.
+    """
+
+    def __init__(self, options: Optional[TransportOptions] = None) -> None:
+        self._options = options or TransportOptions()
+        self._counter = _ConnectionCounter()
+        self._session = requests.Session()
+        adapter = _CountingAdapter(
+            self._counter,
+            pool_connections=self._options.pool_connections,
+            pool_maxsize=self._options.pool_maxsize,
+            pool_block=self._options.pool_block,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Identical GETs in flight, shared by the synchronous client
+        self.flights: SingleFlight[Any] = SingleFlight()
+
+    @property
+    def options(self) -> TransportOptions:
+        return self._options
+
+    def coalesce_key(self, method: str, path: str, url: str, headers: Mapping[str, str]) -> Optional[Hashable]:
+        """
+        The key under which a request may share another caller's identical
+        in-flight request, or None when it must be sent on its own.
+        """
+        opts = self._options
+        if method != "GET" or not opts.coalesce_gets:
+            return None
+        if any(path.startswith(prefix) for prefix in opts.coalesce_exclude):
+            return None
+        return (url, tuple(sorted(headers.items())))
+
+    def record_coalesced(self) -> None:
+        self._counter.record_coalesced()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[Any] = None,
+        timeout: Optional[float] = None,
+    ) -> requests.Response:
+        req_headers = dict(headers or {})
+        if not self._options.keep_alive:
+            req_headers["Connection"] = "close"
+        self._counter.record_request()
+        try:
+            return self._session.request(
+                method=method,
+                url=url,
+                headers=req_headers,
+                data=data,
+                timeout=self._options.timeout if timeout is None else timeout,
+            )
+        except requests.Timeout as e:
+            raise APITimeoutError(f"Request timed out: {method} {url}") from e
+        except requests.RequestException as e:
+            raise APIConnectionError(f"Connection error: {method} {url}: {e}") from e
+
+    def stats(self) -> TransportStats:
+        return self._counter.snapshot()
+
+    def close(self) -> None:
+        self._session.close()
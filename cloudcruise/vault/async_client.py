@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+from .types import VaultEntry, GetVaultEntriesFilters
+from .utils import encrypt_sensitive_fields, decrypt_sensitive_fields
+from .client import _check_delete, _check_update, _decrypt_entries, _vault_query_path
+
+
+class AsyncVaultClient:
+    def __init__(self, make_request, encryption_key: str) -> None:
+        self._make_request = make_request
+        self._encryption_key = encryption_key
+
+    async def create(
+        self,
+        domain: str,
+        permissioned_user_id: str,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> VaultEntry:
+        entry: Dict[str, Any] = {
+            "domain": domain,
+            "permissioned_user_id": permissioned_user_id,
+        }
+        if options:
+            entry.update(options)
+
+        processed = encrypt_sensitive_fields(entry, self._encryption_key)
+        response = await self._make_request("POST", "/vault", processed)
+        return decrypt_sensitive_fields(response, self._encryption_key)
+
+    async def get(self, filters: Optional[GetVaultEntriesFilters] = None):
+        path = _vault_query_path(filters)
+        response = await self._make_request("GET", path)
+        return _decrypt_entries(response, filters, self._encryption_key)
+
+    async def update(self, updates: Dict[str, Any]) -> VaultEntry:
+        """
+        Updates an existing vault entry
+        Required fields: permissioned_user_id, user_name, password, domain
+        """
+        _check_update(updates)
+        processed = encrypt_sensitive_fields(dict(updates), self._encryption_key)
+        response = await self._make_request("PUT", "/vault", processed)
+        return decrypt_sensitive_fields(response, self._encryption_key)
+
+    async def delete(self, params: Dict[str, str]) -> None:
+        """
+        Deletes a vault entry by domain and permissioned_user_id
+        params: { "domain": str, "permissioned_user_id": str }
+        """
+        _check_delete(params)
+        await self._make_request("DELETE", "/vault", params)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Dict
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import secrets
 
+from ..utils.serializer import dumps_bytes, loads
+
 
 def _hex_to_bytes(h: str) -> bytes:
     return bytes.fromhex(h)
@@ -21,7 +22,7 @@ def encrypt_data(data: Any, key_hex: str) -> str:
             raise ValueError("Invalid key length; expected 32-byte (256-bit) key in hex")
         iv = secrets.token_bytes(12)
         aesgcm = AESGCM(key)
-        plaintext = json.dumps(data).encode("utf-8")
+        plaintext = dumps_bytes(data)
         ct_tag = aesgcm.encrypt(iv, plaintext, None)  # ciphertext + tag
         # Split tag (last 16 bytes)
         ciphertext, tag = ct_tag[:-16], ct_tag[-16:]
@@ -42,7 +43,7 @@ def decrypt_data(encrypted_hex: str, key_hex: str) -> Any:
         ciphertext = _hex_to_bytes(encrypted_hex[24:-32])
         aesgcm = AESGCM(key)
         plaintext = aesgcm.decrypt(iv, ciphertext + tag, None)
-        return json.loads(plaintext.decode("utf-8"))
+        return loads(plaintext)
     except Exception as e:
         raise RuntimeError(f"Decryption failed: {str(e)}")
 
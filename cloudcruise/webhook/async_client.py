@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .utils import verify_message
+from .types import WebhookPayload, WebhookVerificationOptions
+
+
+class AsyncWebhookClient:
+    async def verify_signature(
+        self,
+        raw_body: bytes,
+        received_signature: str,
+        secret_key: str,
+        options: Optional[WebhookVerificationOptions] = None,
+    ) -> WebhookPayload:
+        # Verification is pure CPU work on an in-memory body; no I/O to await
+        return verify_message(raw_body, received_signature, secret_key, options)
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import hmac
 import hashlib
-import json
 
+from ..utils.serializer import loads
 from .types import VerificationError, WebhookPayload, WebhookVerificationOptions
 
 
@@ -40,7 +40,7 @@ def verify_message(
         raise VerificationError(f"Failed to decode body as UTF-8: {str(e)}", 400)
 
     try:
-        data_json = json.loads(data_string)
+        data_json = loads(data_string)
     except Exception as e:
         raise VerificationError(f"Failed to decode JSON: {str(e)}", 400)
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence
 
 from .types import (
     Workflow,
@@ -9,6 +9,9 @@ from .types import (
     WorkflowPropertySchema,
     InputValidationError,
 )
+from .cache import MetadataCacheStats
+from .validation import CompiledInputValidator
+
 def _client():
     # Lazy import to avoid circular imports during package initialization
     from .._default import get_client as _get_client
@@ -20,10 +23,14 @@ __all__ = [
     "WorkflowMetadata",
     "WorkflowPropertySchema",
     "InputValidationError",
+    "MetadataCacheStats",
+    "CompiledInputValidator",
     # Convenience APIs
     "get_all_workflows",
     "get_workflow_metadata",
     "validate_workflow_input",
+    "validate_many",
+    "invalidate_metadata",
 ]
 
 
@@ -37,3 +44,11 @@ def get_workflow_metadata(workflow_id: str) -> WorkflowMetadata:
 
 def validate_workflow_input(workflow_id: str, payload: Dict[str, Any]) -> None:
     return _client().workflows.validate_workflow_input(workflow_id, payload)
+
+
+def validate_many(workflow_id: str, payloads: Sequence[Dict[str, Any]]) -> List[Optional[InputValidationError]]:
+    return _client().workflows.validate_many(workflow_id, payloads)
+
+
+def invalidate_metadata(workflow_id: Optional[str] = None) -> None:
+    return _client().workflows.invalidate_metadata(workflow_id)
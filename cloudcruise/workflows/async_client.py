@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .types import (
+    Workflow,
+    WorkflowMetadata,
+    InputValidationError,
+)
+from .cache import MetadataCacheStats, WorkflowMetadataCache
+from .client import _metadata_from
+from .validation import CompiledInputValidator, ValidatorCache, input_schema_of
+
+
+class AsyncWorkflowsClient:
+    def __init__(self, make_request, metadata_ttl: float = 300.0) -> None:
+        self._make_request = make_request
+        self._metadata_cache = WorkflowMetadataCache(ttl=metadata_ttl)
+        self._validators = ValidatorCache()
+
+    async def get_all_workflows(self) -> List[Workflow]:
+        return await self._make_request("GET", "/workflows")
+
+    async def get_workflow_metadata(self, workflow_id: str) -> WorkflowMetadata:
+        """
+        Returns workflow metadata, served from a TTL cache when fresh and
+        revalidated with If-None-Match once the TTL has passed
+        """
+        cached = self._metadata_cache.get_fresh(workflow_id)
+        if cached is not None:
+            return cached
+        etag = self._metadata_cache.etag_for(workflow_id)
+        path = f"/workflows/{workflow_id}/metadata"
+        resp = await self._make_request("GET", path, headers={"If-None-Match": etag} if etag else None, raw=True)
+        metadata = _metadata_from(resp, self._metadata_cache, workflow_id)
+        if metadata is None:
+            # Invalidated while revalidating: the 304 has nothing left to renew
+            resp = await self._make_request("GET", path, raw=True)
+            metadata = _metadata_from(resp, self._metadata_cache, workflow_id)
+        return metadata
+
+    def invalidate_metadata(self, workflow_id: Optional[str] = None) -> None:
+        """Forgets cached metadata for one workflow, or for all of them"""
+        self._metadata_cache.invalidate(workflow_id)
+        self._validators.invalidate(workflow_id)
+
+    def metadata_cache_stats(self) -> MetadataCacheStats:
+        return self._metadata_cache.stats()
+
+    async def get_input_validator(self, workflow_id: str) -> CompiledInputValidator:
+        """Returns the compiled input validator for the workflow's current schema"""
+        meta = await self.get_workflow_metadata(workflow_id)
+        return self._validators.get(workflow_id, input_schema_of(meta))
+
+    async def validate_workflow_input(self, workflow_id: str, payload: Dict[str, Any]) -> None:
+        (await self.get_input_validator(workflow_id)).validate(payload)
+
+    async def validate_many(
+        self, workflow_id: str, payloads: Sequence[Dict[str, Any]]
+    ) -> List[Optional[InputValidationError]]:
+        """
+        Validates a batch of payloads against one schema fetch. Returns one
+        entry per payload: None when valid, the InputValidationError otherwise
+        """
+        return (await self.get_input_validator(workflow_id)).check_many(payloads)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class MetadataCacheStats:
+    hits: int
+    misses: int
+    revalidations: int
+    not_modified: int
+    invalidations: int
+    evictions: int
+    size: int
+
+
+@dataclass
+class _Entry:
+    metadata: Any
+    etag: Optional[str]
+    expires_at: float
+
+
+class WorkflowMetadataCache:
+    """
+    TTL cache of workflow metadata keyed by workflow_id.
+
+    Entries past their TTL are kept so their ETag can be used for a
+    conditional request; a 304 answer renews the entry without a body.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._not_modified = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def get_fresh(self, workflow_id: str) -> Optional[Any]:
+        """Returns cached metadata still within its TTL and counts a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is not None and self._clock() < entry.expires_at:
+                self._entries.move_to_end(workflow_id)
+                self._hits += 1
+                return entry.metadata
+            self._misses += 1
+            return None
+
+    def etag_for(self, workflow_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is None or entry.etag is None:
+                return None
+            self._revalidations += 1
+            return entry.etag
+
+    def not_modified(self, workflow_id: str) -> Optional[Any]:
+        """Renews a stale entry after a 304 and returns its metadata."""
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is None:
+                return None
+            self._not_modified += 1
+            entry.expires_at = self._clock() + self._ttl
+            self._entries.move_to_end(workflow_id)
+            return entry.metadata
+
+    def store(self, workflow_id: str, metadata: Any, etag: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries[workflow_id] = _Entry(metadata, etag, self._clock() + self._ttl)
+            self._entries.move_to_end(workflow_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, workflow_id: Optional[str] = None) -> None:
+        """Drops one workflow's metadata, or everything when no id is given."""
+        with self._lock:
+            if workflow_id is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(workflow_id, None) is not None:
+                self._invalidations += 1
+
+    def stats(self) -> MetadataCacheStats:
+        with self._lock:
+            return MetadataCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                revalidations=self._revalidations,
+                not_modified=self._not_modified,
+                invalidations=self._invalidations,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
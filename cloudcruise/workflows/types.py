@@ -43,6 +43,13 @@ class InvalidTypeDetail:
     actual: str
 
 
+@dataclass
+class InvalidValueDetail:
+    field: str
+    constraint: str
+    message: str
+
+
 class InputValidationError(Exception):
     def __init__(
         self,
@@ -50,9 +57,11 @@ class InputValidationError(Exception):
         missing_required: Optional[List[str]] = None,
         invalid_types: Optional[List[InvalidTypeDetail]] = None,
         unknown_keys: Optional[List[str]] = None,
+        invalid_values: Optional[List[InvalidValueDetail]] = None,
     ) -> None:
         super().__init__(message)
         self.missingRequired = missing_required or []
         self.invalidTypes = invalid_types or []
         self.unknownKeys = unknown_keys or []
+        self.invalidValues = invalid_values or []
 
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Sequence, Tuple
+
+from .types import (
+    WorkflowMetadata,
+    WorkflowInputSchema,
+    WorkflowPropertySchema,
+    InputValidationError,
+    InvalidTypeDetail,
+    InvalidValueDetail,
+)
+
+
+_ALLOWED_TYPES = {"array", "boolean", "integer", "number", "object", "string", "null"}
+
+
+def detect_type(v: Any) -> str:
+    if v is None:
+        return "null"
+    if isinstance(v, list):
+        return "array"
+    if isinstance(v, bool):
+        return "boolean"
+    if isinstance(v, int) and not isinstance(v, bool):
+        return "integer"
+    if isinstance(v, float):
+        return "number"
+    if isinstance(v, dict):
+        return "object"
+    return "string" if isinstance(v, str) else type(v).__name__
+
+
+def _expected_types_of(defn: WorkflowPropertySchema) -> List[str]:
+    if defn is None:
+        return []
+    raw = defn
+    if isinstance(defn, dict):
+        raw = defn.get("type")  # type: ignore
+    if raw is None:
+        return []
+    arr = raw if isinstance(raw, list) else [raw]
+    out: List[str] = []
+    for t in arr:  # type: ignore
+        if isinstance(t, str):
+            t = t.lower()
+            if t in _ALLOWED_TYPES:
+                out.append(t)
+    return out
+
+
+def input_schema_of(meta: WorkflowMetadata) -> Any:
+    """Returns the raw input schema from workflow metadata (dict or dataclass)."""
+    raw_schema: Any = None
+    if isinstance(meta, dict):
+        if "input_schema" in meta:
+            raw_schema = meta.get("input_schema")
+        else:
+            m = meta.get("metadata") if isinstance(meta.get("metadata"), dict) else None
+            if isinstance(m, dict):
+                raw_schema = m.get("input_schema")
+    else:
+        try:
+            raw_schema = getattr(meta, "input_schema", None)
+        except Exception:
+            raw_schema = None
+    return raw_schema
+
+
+_FORMATS = {
+    "email": re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+    "uri": re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:[^\s]*$"),
+    "url": re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*://[^\s]+$"),
+    "date": re.compile(r"^\d{4}-\d{2}-\d{2}$"),
+    "date-time": re.compile(r"^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})?$"),
+    "uuid": re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"),
+}
+
+
+def _as_schema_dict(defn: Any) -> Dict[str, Any]:
+    if isinstance(defn, dict):
+        return defn
+    if isinstance(defn, (str, list)):
+        return {"type": defn}
+    if is_dataclass(defn) and not isinstance(defn, type):
+        return {k: v for k, v in asdict(defn).items() if v is not None}
+    return {}
+
+
+def _enum_matches(value: Any, options: Tuple[Any, ...]) -> bool:
+    # True == 1 in Python, but not in JSON Schema
+    for opt in options:
+        if opt == value and isinstance(opt, bool) == isinstance(value, bool):
+            return True
+    return False
+
+
+class _Errors:
+    __slots__ = ("missing", "types", "unknown", "values")
+
+    def __init__(self) -> None:
+        self.missing: List[str] = []
+        self.types: List[InvalidTypeDetail] = []
+        self.unknown: List[str] = []
+        self.values: List[InvalidValueDetail] = []
+
+
+class _Node:
+    """One compiled schema; `$ref`s resolve to shared nodes so recursive schemas terminate."""
+
+    __slots__ = (
+        "accepts", "display", "enum", "min_length", "max_length", "pattern",
+        "format", "properties", "known", "required", "disallow_extras", "extras", "items",
+    )
+
+    def __init__(self) -> None:
+        self.accepts: Optional[FrozenSet[str]] = None
+        self.display = "any"
+        self.enum: Optional[Tuple[Any, ...]] = None
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self.pattern: Optional[Pattern[str]] = None
+        self.format: Optional[Tuple[str, Pattern[str]]] = None
+        self.properties: Optional[Tuple[Tuple[str, "_Node"], ...]] = None
+        self.known: FrozenSet[str] = frozenset()
+        self.required: Tuple[str, ...] = ()
+        self.disallow_extras = False
+        self.extras: Optional["_Node"] = None
+        self.items: Optional["_Node"] = None
+
+    def check(self, value: Any, path: str, errors: _Errors) -> None:
+        act = detect_type(value)
+        if self.accepts is not None and act not in self.accepts:
+            errors.types.append(InvalidTypeDetail(field=path, expected_display=self.display, actual=act))
+            return
+        if self.enum is not None and not _enum_matches(value, self.enum):
+            allowed = ", ".join(json.dumps(e, default=str) for e in self.enum)
+            errors.values.append(InvalidValueDetail(path, "enum", f"must be one of {allowed}"))
+        if act == "string":
+            self._check_string(value, path, errors)
+        elif act == "object":
+            self._check_object(value, path, errors)
+        elif act == "array" and self.items is not None:
+            for i, item in enumerate(value):
+                self.items.check(item, f"{path}[{i}]", errors)
+
+    def _check_string(self, value: str, path: str, errors: _Errors) -> None:
+        if self.min_length is not None and len(value) < self.min_length:
+            errors.values.append(InvalidValueDetail(path, "minLength", f"shorter than {self.min_length}"))
+        if self.max_length is not None and len(value) > self.max_length:
+            errors.values.append(InvalidValueDetail(path, "maxLength", f"longer than {self.max_length}"))
+        if self.pattern is not None and self.pattern.search(value) is None:
+            errors.values.append(InvalidValueDetail(path, "pattern", f"does not match {self.pattern.pattern}"))
+        if self.format is not None and self.format[1].match(value) is None:
+            errors.values.append(InvalidValueDetail(path, "format", f"is not a valid {self.format[0]}"))
+
+    def _check_object(self, value: Dict[str, Any], path: str, errors: _Errors) -> None:
+        prefix = f"{path}." if path else ""
+        for key in self.required:
+            if key not in value:
+                errors.missing.append(prefix + key)
+        if self.properties is not None:
+            for key, node in self.properties:
+                if key in value:
+                    node.check(value[key], prefix + key, errors)
+        if self.disallow_extras or self.extras is not None:
+            for key in value:
+                if key in self.known:
+                    continue
+                if self.extras is not None:
+                    self.extras.check(value[key], prefix + key, errors)
+                else:
+                    errors.unknown.append(prefix + key)
+
+
+class _Compiler:
+    def __init__(self, root: Dict[str, Any]) -> None:
+        self._root = root
+        self._refs: Dict[str, _Node] = {}
+
+    def compile(self, defn: Any) -> _Node:
+        schema = _as_schema_dict(defn)
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            return self._resolve(ref)
+        node = _Node()
+        self._fill(node, schema)
+        return node
+
+    def _resolve(self, ref: str) -> _Node:
+        node = self._refs.get(ref)
+        if node is not None:
+            return node
+        # Registered before filling so self-references resolve to this node
+        node = self._refs[ref] = _Node()
+        target = self._lookup(ref)
+        if target is not None:
+            self._fill(node, _as_schema_dict(target))
+        return node
+
+    def _lookup(self, ref: str) -> Any:
+        # None for remote and dangling references; they compile to "any" and
+        # are left for the API to check
+        if not ref.startswith("#"):
+            return None
+        target: Any = self._root
+        for part in [p for p in ref[1:].split("/") if p]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or part not in target:
+                return None
+            target = target[part]
+        return target
+
+    def _fill(self, node: _Node, schema: Dict[str, Any]) -> None:
+        expected = _expected_types_of(schema)
+        if expected:
+            accepts = set(expected)
+            # Integers also satisfy "number"
+            if "number" in accepts:
+                accepts.add("integer")
+            node.accepts = frozenset(accepts)
+            node.display = " | ".join(expected)
+        if isinstance(schema.get("enum"), list):
+            node.enum = tuple(schema["enum"])
+        if isinstance(schema.get("minLength"), int):
+            node.min_length = schema["minLength"]
+        if isinstance(schema.get("maxLength"), int):
+            node.max_length = schema["maxLength"]
+        if isinstance(schema.get("pattern"), str):
+            try:
+                node.pattern = re.compile(schema["pattern"])
+            except re.error:
+                # ECMA-262 syntax re does not support; left for the API to check
+                node.pattern = None
+        fmt = schema.get("format")
+        if isinstance(fmt, str) and fmt in _FORMATS:
+            node.format = (fmt, _FORMATS[fmt])
+        props = schema.get("properties")
+        if isinstance(props, dict):
+            node.properties = tuple((key, self.compile(sub)) for key, sub in props.items())
+            node.known = frozenset(props)
+        if isinstance(schema.get("required"), list):
+            node.required = tuple(schema["required"])
+        extras = schema.get("additionalProperties")
+        if extras is False:
+            node.disallow_extras = True
+        elif isinstance(extras, dict):
+            node.extras = self.compile(extras)
+        if isinstance(schema.get("items"), (dict, str)):
+            node.items = self.compile(schema["items"])
+
+
+class CompiledInputValidator:
+    """
+    A workflow input schema compiled once into a tree of checks. Supports
+    nested `properties`, `items`, `enum`, `minLength`/`maxLength`, `pattern`,
+    common `format`s and local `$ref`s. Remote or unresolvable `$ref`s and
+    patterns `re` cannot compile accept any value. Reuse it to validate any
+    number of payloads.
+    """
+
+    def __init__(self, raw_schema: Any) -> None:
+        root = _as_schema_dict(raw_schema or WorkflowInputSchema())
+        self._root = _Compiler(root).compile(root)
+
+    def check(self, payload: Dict[str, Any]) -> Optional[InputValidationError]:
+        """Returns the validation error for `payload`, or None when it is valid."""
+        errors = _Errors()
+        self._root.check(payload, "", errors)
+        if not (errors.missing or errors.types or errors.unknown or errors.values):
+            return None
+        parts: List[str] = []
+        if errors.missing:
+            parts.append(f"missing required: {', '.join(errors.missing)}")
+        if errors.types:
+            parts.append("; ".join([f"{e.field}: expected {e.expected_display}, got {e.actual}" for e in errors.types]))
+        if errors.values:
+            parts.append("; ".join([f"{e.field}: {e.message}" for e in errors.values]))
+        if errors.unknown:
+            parts.append(f"unknown keys: {', '.join(errors.unknown)}")
+        msg = f"Workflow input validation failed: {' | '.join(parts)}"
+        return InputValidationError(msg, errors.missing, errors.types, errors.unknown, errors.values)
+
+    def validate(self, payload: Dict[str, Any]) -> None:
+        """Raises InputValidationError when `payload` does not match the schema."""
+        error = self.check(payload)
+        if error is not None:
+            raise error
+
+    def check_many(self, payloads: Sequence[Dict[str, Any]]) -> List[Optional[InputValidationError]]:
+        return [self.check(p) for p in payloads]
+
+
+def _schema_fingerprint(raw_schema: Any) -> str:
+    plain = asdict(raw_schema) if is_dataclass(raw_schema) and not isinstance(raw_schema, type) else raw_schema
+    return json.dumps(plain, sort_keys=True, default=str)
+
+
+class ValidatorCache:
+    """
+    Compiled validators keyed by workflow_id and schema version. The schema
+    object is compared by identity first (cached metadata is returned as the
+    same object) and by content fingerprint otherwise.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[Any, str, CompiledInputValidator]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, workflow_id: str, raw_schema: Any) -> CompiledInputValidator:
+        entry = self._entries.get(workflow_id)
+        if entry is not None and entry[0] is raw_schema:
+            return entry[2]
+        fingerprint = _schema_fingerprint(raw_schema)
+        if entry is not None and entry[1] == fingerprint:
+            validator = entry[2]
+        else:
+            validator = CompiledInputValidator(raw_schema)
+        with self._lock:
+            self._entries[workflow_id] = (raw_schema, fingerprint, validator)
+        return validator
+
+    def invalidate(self, workflow_id: Optional[str] = None) -> None:
+        with self._lock:
+            if workflow_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(workflow_id, None)
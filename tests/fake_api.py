@@ -0,0 +1,199 @@
+"""
+In-process fake of the CloudCruise API used by the offline tests.
+
+Serves workflow metadata, run starts, run results and the multiplexed
+`/run/clients/{client_id}/events` SSE stream. Every started run emits
+`execution.start` and `execution.success` on the stream `event_delay`
+seconds after `POST /run` returns. `fail_after_accept` makes run starts
+fail with a 503 after the run was already launched, like a lost response.
+
+Stream frames carry sequential `id:` fields. Frames of a run only go to the
+stream of the client_id it was started with. A fresh stream receives every
+frame not yet delivered to its client_id; a stream opened with `Last-Event-ID` replays from
+that id (minus `replay_overlap` frames, to exercise de-duplication).
+`drop_streams()` ends all open streams as if the network failed, while
+`stall_streams()` silences them but keeps the socket open (a half-open
+connection). With `ping_interval` set, idle streams send `ping` frames.
+"""
+
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"url": {"type": "string"}},
+    "required": ["url"],
+    "additionalProperties": False,
+}
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        # (client_id of the run or None, frame)
+        self.history: List[Tuple[Optional[str], str]] = []
+        self.replay_overlap = 0
+        self._delivered: Dict[Optional[str], int] = {}
+        self._clients: Dict[str, str] = {}
+        self._generation = 0
+        self._streams = 0
+        self._stall_before = 0
+        self.ping_interval: Optional[float] = None
+        self._cv = threading.Condition()
+        self.requests: List[Dict[str, Any]] = []
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.auto_events = True
+        # Upcoming run starts that are accepted but answered with a 503
+        self.fail_after_accept = 0
+        # Delay before a started run emits its events on the stream
+        self.event_delay = 0.1
+        self._ids = itertools.count(1)
+        self._stopped = threading.Event()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _record(self, body: Any = None) -> None:
+                api.requests.append({"method": self.command, "path": self.path, "headers": dict(self.headers), "body": body})
+
+            def do_GET(self):
+                self._record()
+                if self.path.startswith("/run/clients/"):
+                    self._stream()
+                elif self.path.startswith("/workflows/") and self.path.endswith("/metadata"):
+                    self._json(200, {"input_schema": INPUT_SCHEMA})
+                elif self.path.startswith("/run/"):
+                    session_id = self.path.split("/")[2]
+                    self._json(200, api.results.get(session_id, {"session_id": session_id, "status": "execution.start"}))
+                else:
+                    self._json(404, {"message": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null")
+                self._record(body)
+                if self.path == "/run":
+                    session_id = f"s-{next(api._ids)}"
+                    if isinstance(body, dict) and body.get("client_id"):
+                        api._clients[session_id] = body["client_id"]
+                    api.results[session_id] = {"session_id": session_id, "status": "execution.success", "data": {"ok": True}}
+                    if api.auto_events:
+                        api.emit_later(session_id, ["execution.start", "execution.success"])
+                    if api.fail_after_accept:
+                        api.fail_after_accept -= 1
+                        self._json(503, {"message": "unavailable"})
+                    else:
+                        self._json(200, {"session_id": session_id})
+                else:
+                    self._json(200, {})
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                last_id = self.headers.get("Last-Event-ID")
+                client_id = self.path.split("/")[3]
+                with api._cv:
+                    generation = api._generation
+                    index = api._streams
+                    api._streams += 1
+                    cursor = max(0, int(last_id) - api.replay_overlap) if last_id else api._delivered.get(client_id, 0)
+                last_write = time.monotonic()
+                while not api._stopped.is_set():
+                    with api._cv:
+                        if index < api._stall_before:
+                            api._cv.wait(0.05)
+                            continue
+                        if api._generation != generation:
+                            # Drop the socket mid-stream like a network failure
+                            self.close_connection = True
+                            return
+                        if cursor >= len(api.history):
+                            if api.ping_interval is None or time.monotonic() - last_write < api.ping_interval:
+                                api._cv.wait(0.02)
+                                continue
+                            owner, frame = None, "event: ping\ndata: {}\n\n"
+                        else:
+                            owner, frame = api.history[cursor]
+                            cursor += 1
+                            api._delivered[client_id] = max(api._delivered.get(client_id, 0), cursor)
+                        if owner is not None and owner != client_id:
+                            continue
+                    try:
+                        data = frame.encode("utf-8")
+                        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                        self.wfile.flush()
+                        last_write = time.monotonic()
+                    except OSError:
+                        return
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def emit(self, session_id: str, event: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        data = {"event": event, "payload": {"session_id": session_id, **(payload or {})}, "timestamp": 0}
+        with self._cv:
+            event_id = len(self.history) + 1
+            frame = f"id: {event_id}\nevent: run.event\ndata: {json.dumps(data)}\n\n"
+            self.history.append((self._clients.get(session_id), frame))
+            self._cv.notify_all()
+
+    def send_retry(self, retry_ms: int) -> None:
+        """Sends every stream a frame that only sets the SSE reconnection time."""
+        with self._cv:
+            self.history.append((None, f"retry: {retry_ms}\n\n"))
+            self._cv.notify_all()
+
+    def drop_streams(self) -> None:
+        with self._cv:
+            self._generation += 1
+            self._cv.notify_all()
+
+    def stall_streams(self) -> None:
+        with self._cv:
+            self._stall_before = self._streams
+
+    def stream_clients(self) -> List[str]:
+        return [r["path"].split("/")[3] for r in self.requests if r["path"].startswith("/run/clients/")]
+
+    def stream_headers(self) -> List[Dict[str, str]]:
+        return [r["headers"] for r in self.requests if r["path"].startswith("/run/clients/")]
+
+    def emit_later(self, session_id: str, events: List[str]) -> None:
+        def fire() -> None:
+            for event in events:
+                self.emit(session_id, event)
+
+        timer = threading.Timer(self.event_delay, fire)
+        timer.daemon = True
+        timer.start()
+
+    def __enter__(self) -> "FakeApi":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
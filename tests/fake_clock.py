@@ -0,0 +1,9 @@
+"""Manually advanced clock for tests of TTLs, stalls and other timing rules."""
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
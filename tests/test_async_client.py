@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from cloudcruise import (
+    AsyncCloudCruise,
+    CloudCruiseParams,
+    InputValidationError,
+    PollingOptions,
+    ShardingOptions,
+    StartRunRequest,
+)
+from cloudcruise.utils.async_sse import open_async_sse
+from cloudcruise.utils.sse import SSEHandlers
+
+from fake_api import FakeApi
+
+
+class TestAsyncClient(unittest.TestCase):
+    def _run(self, coro):
+        return asyncio.run(asyncio.wait_for(coro, timeout=10))
+
+    def test_start_iterate_and_wait(self):
+        async def scenario(base_url):
+            async with AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=base_url)) as cc:
+                handle = await cc.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+                seen = []
+                handle.on("end", lambda info: seen.append(info["type"]))
+                events = [msg["data"]["event"] async for msg in handle]
+                result = await handle.wait()
+                return events, seen, result
+
+        with FakeApi() as api:
+            events, seen, result = self._run(scenario(api.base_url))
+        self.assertEqual(events, ["execution.start", "execution.success"])
+        self.assertEqual(seen, ["execution.success"])
+        self.assertEqual(result["status"], "execution.success")
+
+    def test_start_validates_input(self):
+        async def scenario(base_url):
+            async with AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=base_url)) as cc:
+                await cc.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"extra": 1}))
+
+        with FakeApi() as api:
+            with self.assertRaises(InputValidationError):
+                self._run(scenario(api.base_url))
+
+    def test_start_many_yields_each_request(self):
+        async def scenario(base_url):
+            async with AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=base_url)) as cc:
+                requests = [StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}) for _ in range(4)]
+                requests.append(StartRunRequest(workflow_id="wf", run_input_variables={"extra": 1}))
+                return [r async for r in cc.runs.start_many(requests, max_concurrency=2)]
+
+        with FakeApi() as api:
+            results = self._run(scenario(api.base_url))
+            posts = [r for r in api.requests if r["path"] == "/run"]
+        self.assertEqual(sorted(r.index for r in results if r.ok), [0, 1, 2, 3])
+        self.assertEqual([r.index for r in results if not r.ok], [4])
+        self.assertEqual(len(posts), 4)
+
+    def test_wait_all_collects_results(self):
+        async def scenario(base_url):
+            async with AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=base_url)) as cc:
+                handles = [
+                    await cc.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+                    for _ in range(3)
+                ]
+                return handles, await cc.runs.wait_all(handles, timeout=5)
+
+        with FakeApi() as api:
+            handles, completed = self._run(scenario(api.base_url))
+        self.assertEqual([c.handle for c in completed], handles)
+        self.assertTrue(all(c.result["status"] == "execution.success" for c in completed))
+
+    def test_sync_only_options_are_rejected(self):
+        for options in ({"polling": PollingOptions()}, {"sharding": ShardingOptions()}):
+            with self.assertRaises(ValueError) as ctx:
+                AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, **options))
+            self.assertIn(next(iter(options)), str(ctx.exception))
+        AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, shared_runtime=False))
+
+    def test_cancelled_stream_closes_and_propagates(self):
+        async def scenario(base_url):
+            opened = asyncio.Event()
+            calls = []
+            handlers = SSEHandlers(
+                on_open=opened.set,
+                on_error=lambda e: calls.append("error"),
+                on_close=lambda: calls.append("close"),
+            )
+            conn = open_async_sse(f"{base_url}/run/clients/c-1/events", handlers)
+            await opened.wait()
+            conn.close()
+            with self.assertRaises(asyncio.CancelledError):
+                await conn._task
+            return calls
+
+        with FakeApi() as api:
+            self.assertEqual(self._run(scenario(api.base_url)), ["close"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from cloudcruise.utils.async_queue import AsyncEventQueue, AsyncioEventQueue
+
+
+class TestAsyncEventQueue(unittest.TestCase):
+    def test_drop_oldest_and_drop_newest(self):
+        oldest = AsyncEventQueue(maxsize=2, overflow="drop_oldest")
+        newest = AsyncEventQueue(maxsize=2, overflow="drop_newest")
+        for i in range(5):
+            oldest.push(i)
+            newest.push(i)
+        self.assertEqual(oldest.get_many(10), [3, 4])
+        self.assertEqual(newest.get_many(10), [0, 1])
+        stats = oldest.stats()
+        self.assertEqual((stats.pushed, stats.dropped, stats.depth, stats.high_water), (5, 3, 0, 2))
+
+    def test_coalesce_keeps_latest_per_key_in_place(self):
+        q = AsyncEventQueue(maxsize=3, overflow="coalesce", coalesce_key=lambda item: item[0])
+        for item in [("a", 1), ("b", 1), ("a", 2), ("c", 1), ("d", 1)]:
+            q.push(item)
+        # "a" was updated in place, then dropped as the oldest to make room for "d"
+        self.assertEqual(q.get_many(10), [("b", 1), ("c", 1), ("d", 1)])
+        self.assertEqual((q.stats().coalesced, q.stats().dropped), (1, 1))
+        q.push(("a", 3))
+        self.assertEqual(q.get(), ("a", 3))
+
+    def test_block_waits_for_consumer(self):
+        q = AsyncEventQueue(maxsize=1, overflow="block")
+        q.push(1)
+        pushed = threading.Event()
+
+        def producer():
+            q.push(2)
+            pushed.set()
+
+        threading.Thread(target=producer, daemon=True).start()
+        self.assertFalse(pushed.wait(0.1))
+        self.assertEqual(q.get(), 1)
+        self.assertTrue(pushed.wait(1))
+        self.assertEqual(q.get(timeout=1), 2)
+
+    def test_get_timeout_and_close(self):
+        q = AsyncEventQueue()
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            q.get(timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        q.push("x")
+        q.close()
+        self.assertEqual(list(q), ["x"])
+        self.assertEqual(q.get_many(5), [])
+
+    def test_unknown_policy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            AsyncEventQueue(maxsize=1, overflow="spill")
+        with self.assertRaises(ValueError):
+            AsyncEventQueue(maxsize=1, overflow="coalesce")
+
+
+class TestAsyncioEventQueue(unittest.TestCase):
+    def test_bounded_drain(self):
+        async def scenario():
+            q = AsyncioEventQueue(maxsize=2)
+            for i in range(4):
+                q.push(i)
+            first = await q.get_many(10)
+            q.close()
+            return first, [i async for i in q], q.stats().dropped
+
+        self.assertEqual(asyncio.run(scenario()), ([2, 3], [], 2))
+
+    def test_block_is_rejected(self):
+        with self.assertRaises(ValueError):
+            AsyncioEventQueue(maxsize=1, overflow="block")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, DispatchOptions, StartRunRequest
+from cloudcruise.utils.dispatch import EventDispatcher
+from cloudcruise.utils.runtime import get_runtime
+
+from fake_api import FakeApi
+
+
+class TestEventDispatcher(unittest.TestCase):
+    def test_serial_per_key_parallel_across_keys(self):
+        dispatcher = EventDispatcher(DispatchOptions(max_workers=2))
+        order = []
+        fast_done = threading.Event()
+        slow_started = threading.Event()
+
+        def slow(i):
+            slow_started.set()
+            time.sleep(0.2)
+            order.append(("a", i))
+
+        for i in range(3):
+            dispatcher.submit("a", lambda i=i: slow(i))
+        self.assertTrue(slow_started.wait(1))
+        dispatcher.submit("b", fast_done.set)
+        # "b" is not stuck behind the slow "a" callbacks
+        self.assertTrue(fast_done.wait(0.15))
+        deadline = time.monotonic() + 2
+        while dispatcher.stats().pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(order, [("a", 0), ("a", 1), ("a", 2)])
+        stats = dispatcher.stats()
+        self.assertEqual((stats.submitted, stats.completed, stats.pending), (4, 4, 0))
+
+    def test_bounded_queue_blocks_producer(self):
+        dispatcher = EventDispatcher(DispatchOptions(max_workers=1, max_pending=1))
+        release = threading.Event()
+        dispatcher.submit("a", release.wait)
+        submitted = threading.Event()
+        threading.Thread(target=lambda: (dispatcher.submit("a", lambda: None), submitted.set()), daemon=True).start()
+        self.assertFalse(submitted.wait(0.1))
+        release.set()
+        self.assertTrue(submitted.wait(1))
+        self.assertEqual(dispatcher.stats().blocked, 1)
+
+    def test_inline_mode_runs_on_caller_thread(self):
+        dispatcher = EventDispatcher(DispatchOptions(mode="inline"))
+        threads = []
+        dispatcher.submit("a", lambda: threads.append(threading.current_thread()))
+        self.assertEqual(threads, [threading.current_thread()])
+
+
+class TestSlowHandlers(unittest.TestCase):
+    def test_slow_handler_does_not_delay_other_sessions(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            client = CloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url))
+            slow = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            fast = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            slow.on("execution.start", lambda _: time.sleep(1.0))
+            api.emit(slow.sessionId, "execution.start")
+            api.emit(fast.sessionId, "execution.success")
+            started = time.monotonic()
+            fast.wait(timeout=5)
+            self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_saturated_pool_pauses_the_shared_reader_not_the_io_thread(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            dispatch = DispatchOptions(max_workers=1, max_pending=1)
+            client = CloudCruise(
+                CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url, event_dispatch=dispatch)
+            )
+            handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            release = threading.Event()
+            seen = []
+            handle.on("run.event", lambda evt: (release.wait(5), seen.append(evt.type)))
+            for _ in range(3):
+                api.emit(handle.sessionId, "execution.step")
+            api.emit(handle.sessionId, "execution.success")
+            deadline = time.monotonic() + 2
+            while not client.runs.dispatch_stats().pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            # Timers on the I/O thread still fire while the listener is stuck
+            fired = threading.Event()
+            get_runtime().call_later(0.01, fired.set)
+            self.assertTrue(fired.wait(1))
+            release.set()
+            self.assertEqual(handle.wait(timeout=5)["status"], "execution.success")
+            self.assertEqual(seen, ["execution.step"] * 3 + ["execution.success"])
+            self.assertEqual(client.runs.dispatch_stats().blocked, 0)
+
+    def test_inline_callbacks_keep_a_reader_thread(self):
+        with FakeApi() as api:
+            client = CloudCruise(
+                CloudCruiseParams(
+                    api_key="k",
+                    encryption_key="a" * 64,
+                    base_url=api.base_url,
+                    event_dispatch=DispatchOptions(mode="inline"),
+                )
+            )
+            handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            threads = []
+            handle.on("run.event", lambda evt: threads.append(threading.current_thread().name))
+            handle.wait(timeout=5)
+            self.assertTrue(threads)
+            self.assertEqual(set(threads), {"cloudcruise-sse"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, HeartbeatOptions, StartRunRequest
+from cloudcruise.utils.heartbeat import HeartbeatMonitor
+
+from fake_api import FakeApi
+from fake_clock import FakeClock
+
+
+class TestHeartbeatMonitor(unittest.TestCase):
+    def test_learns_interval_and_detects_stall(self):
+        clock = FakeClock()
+        monitor = HeartbeatMonitor(HeartbeatOptions(missed_pings=3), clock=clock)
+        monitor.reset()
+        for t in (10, 20, 31, 40):
+            clock.now = t
+            monitor.ping()
+        stats = monitor.stats()
+        self.assertEqual(stats.interval, 10)
+        # 9s against the running median of 10.5
+        self.assertAlmostEqual(stats.max_jitter, 1.5)
+        self.assertGreater(stats.jitter, 0)
+
+        clock.now = 65
+        monitor.frame()  # any frame keeps the stream alive
+        clock.now = 90
+        self.assertFalse(monitor.is_stale())
+        clock.now = 96
+        self.assertTrue(monitor.is_stale())
+        monitor.record_stall()
+        self.assertFalse(monitor.is_stale())
+        self.assertEqual(monitor.stats().stalls, 1)
+
+    def test_never_stale_before_an_interval_is_known(self):
+        clock = FakeClock()
+        monitor = HeartbeatMonitor(clock=clock)
+        monitor.reset()
+        monitor.ping()
+        clock.now = 1000
+        self.assertFalse(monitor.is_stale())
+        self.assertTrue(HeartbeatMonitor(HeartbeatOptions(initial_interval=30), clock=clock).stats().interval == 30)
+
+
+class TestStallReconnect(unittest.TestCase):
+    def test_half_open_stream_is_reconnected(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            api.ping_interval = 0.1
+            heartbeat = HeartbeatOptions(missed_pings=3, min_interval=0.05, check_interval=0.05)
+            client = CloudCruise(
+                CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url, heartbeat=heartbeat)
+            )
+            handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            stale = []
+            handle.on("stale", stale.append)
+            deadline = time.monotonic() + 5
+            while client.runs.heartbeat_stats().interval is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            api.emit(handle.sessionId, "execution.start")
+            time.sleep(0.2)
+            api.stall_streams()
+            api.emit(handle.sessionId, "execution.success")
+            started = time.monotonic()
+            result = handle.wait(timeout=10)
+
+            self.assertEqual(result["status"], "execution.success")
+            self.assertLess(time.monotonic() - started, 5)
+            stats = client.runs.heartbeat_stats()
+            self.assertEqual(stats.stalls, 1)
+            self.assertEqual(len(stale), 1)
+            self.assertAlmostEqual(stats.interval, 0.1, delta=0.05)
+            self.assertEqual(len(api.stream_headers()), 2)
+            self.assertEqual(api.stream_headers()[-1].get("Last-Event-ID"), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import json
+import unittest
+
+from cloudcruise.utils.connection_manager import peek_run_event, route_frame
+
+
+def _frame(data):
+    return json.dumps({"data": data})
+
+
+class TestLazyRouting(unittest.TestCase):
+    def test_peek_finds_session_and_event_without_decoding(self):
+        text = _frame({"event": "execution.step", "payload": {"session_id": "s-1", "note": 'say \\"event\\": \\"x\\"'}})
+        self.assertEqual(peek_run_event(text), ("s-1", "execution.step"))
+
+    def test_ambiguous_frames_fall_back_to_decoding(self):
+        nested = _frame({"event": "execution.success", "payload": {"session_id": "s-1", "data": {"event": "other"}}})
+        self.assertIsNone(peek_run_event(nested))
+        routed = route_frame(nested)
+        self.assertEqual((routed[0], routed[1].type), ("s-1", "execution.success"))
+
+        two_sessions = _frame({"event": "e", "session_id": "s-2", "payload": {"session_id": "s-1"}})
+        self.assertIsNone(peek_run_event(two_sessions))
+        self.assertEqual(route_frame(two_sessions)[0], "s-1")
+
+    def test_routed_event_decodes_on_first_read(self):
+        session_id, evt = route_frame(_frame({"event": "execution.start", "payload": {"session_id": "s-1"}}))
+        self.assertEqual((session_id, evt.type, evt.is_terminal), ("s-1", "execution.start", False))
+        self.assertIsNone(evt._data)
+        self.assertEqual(evt["data"]["payload"], {"session_id": "s-1"})
+        self.assertEqual(evt.session_id, "s-1")
+
+    def test_unroutable_frames(self):
+        self.assertIsNone(route_frame("not json"))
+        self.assertIsNone(route_frame(_frame({"event": "execution.start", "payload": {}})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams
+from cloudcruise.utils.pending_events import PendingEventBuffer
+
+from fake_api import FakeApi
+from fake_clock import FakeClock
+
+
+class TestPendingEventBuffer(unittest.TestCase):
+    def test_bounds_and_accounting(self):
+        clock = FakeClock()
+        buf = PendingEventBuffer(max_sessions=2, max_events_per_session=2, ttl=10, clock=clock)
+        for i in range(3):
+            buf.add("a", f"a{i}", size=10)
+        buf.add("b", "b0", size=5)
+        stats = buf.stats()
+        self.assertEqual((stats.sessions, stats.events, stats.bytes, stats.evicted_events), (2, 3, 25, 1))
+
+        buf.add("c", "c0", size=1)  # evicts "a", the oldest session
+        self.assertEqual(buf.take("a"), [])
+        self.assertEqual(buf.stats().evicted_sessions, 1)
+
+        clock.now = 11
+        self.assertEqual(buf.take("b"), [])
+        stats = buf.stats()
+        self.assertEqual((stats.sessions, stats.events, stats.bytes, stats.expired_sessions), (0, 0, 0, 2))
+
+    def test_take_returns_events_in_order(self):
+        buf = PendingEventBuffer()
+        buf.add("s", 1)
+        buf.add("s", 2)
+        self.assertEqual(buf.take("s"), [1, 2])
+        self.assertEqual(buf.take("s"), [])
+        self.assertEqual(buf.stats().replayed_events, 2)
+
+
+class TestEarlyEvents(unittest.TestCase):
+    def test_events_before_subscribe_are_replayed(self):
+        with FakeApi() as api:
+            client = CloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url))
+            manager = client._connection_manager
+            manager.ensure_client_id()
+            manager.connect_if_needed()
+            api.results["s-early"] = {"session_id": "s-early", "status": "execution.success"}
+            api.emit("s-early", "execution.start")
+            api.emit("s-early", "execution.success")
+            deadline = time.monotonic() + 5
+            while manager.pending_event_stats().events < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            handle = client.runs.subscribe_to_session("s-early")
+            self.assertTrue(handle.done)
+            self.assertEqual([m["data"]["event"] for m in handle], ["execution.start", "execution.success"])
+            self.assertEqual(handle.wait(timeout=5)["status"], "execution.success")
+            stats = manager.pending_event_stats()
+            self.assertEqual((stats.sessions, stats.replayed_events), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, PollingOptions, StartRunRequest
+from cloudcruise.utils.polling_connection_manager import PollingConnectionManager
+
+from fake_api import FakeApi
+
+
+def _status_gets(api):
+    return [r for r in api.requests if r["method"] == "GET" and r["path"].startswith("/run/s-")]
+
+
+class TestPollingMode(unittest.TestCase):
+    def _client(self, api, **options):
+        return CloudCruise(
+            CloudCruiseParams(
+                api_key="k",
+                encryption_key="a" * 64,
+                base_url=api.base_url,
+                polling=PollingOptions(**options),
+            )
+        )
+
+    def test_status_changes_become_run_events(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            client = self._client(api, initial_interval=0.3, interaction_interval=0.05)
+            handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            sid = handle.sessionId
+            api.results[sid] = {"session_id": sid, "status": "execution.start"}
+            seen = []
+            handle.on("run.event", lambda evt: seen.append(evt.type))
+            waiting = threading.Event()
+            handle.on("interaction.waiting", lambda evt: waiting.set())
+            ends = []
+            handle.on("end", ends.append)
+
+            deadline = time.monotonic() + 5
+            while not seen and time.monotonic() < deadline:
+                time.sleep(0.02)
+            api.results[sid] = {"session_id": sid, "status": "interaction.waiting"}
+            self.assertTrue(waiting.wait(5))
+
+            api.results[sid] = {"session_id": sid, "status": "execution.success", "data": {"ok": True}}
+            polls = len(_status_gets(api))
+            client.runs.submit_user_interaction(sid, {"field": 1})
+            result = handle.wait(timeout=5)
+
+            self.assertEqual(result["status"], "execution.success")
+            self.assertEqual(seen, ["execution.start", "interaction.waiting", "execution.success"])
+            self.assertEqual(ends, [{"type": "execution.success"}])
+            self.assertGreater(len(_status_gets(api)), polls)
+            self.assertEqual(api.stream_clients(), [])
+            stats = client.runs.polling_stats()
+            self.assertEqual(stats.changes, 3)
+            self.assertEqual(stats.sessions, 0)
+
+    def test_many_runs_share_the_poller(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            client = self._client(api, initial_interval=0.05, max_concurrency=2)
+            handles = [
+                client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+                for _ in range(10)
+            ]
+            for handle in handles:
+                self.assertEqual(handle.wait(timeout=10)["status"], "execution.success")
+            # One poll per run: each was already finished when first polled
+            self.assertEqual(len(_status_gets(api)), 10 + 10)  # plus wait()'s own result fetches
+            self.assertIsNone(CloudCruise(
+                CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url)
+            ).runs.polling_stats())
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    def test_unchanged_runs_back_off_to_max_interval(self):
+        polls = []
+
+        def fetch(session_id):
+            polls.append(time.monotonic())
+            return {"session_id": session_id, "status": "execution.start"}
+
+        manager = PollingConnectionManager(
+            "http://localhost",
+            "k",
+            fetch,
+            PollingOptions(initial_interval=0.05, max_interval=0.2, backoff=2.0),
+        )
+        sub = manager.subscribe("s-1")
+        deadline = time.monotonic() + 5
+        while len(polls) < 6 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        run = manager._polled["s-1"]
+        self.assertEqual(run.interval, 0.2)
+        self.assertEqual(run.status, "execution.start")
+
+        sub.close()
+        time.sleep(0.5)
+        self.assertNotIn("s-1", manager._polled)
+
+
+if __name__ == "__main__":
+    unittest.main()
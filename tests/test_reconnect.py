@@ -0,0 +1,151 @@
+import threading
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, ReconnectPolicy, StartRunRequest
+from cloudcruise.utils.reconnect import OutageTracker, ReconnectScheduler
+
+from fake_api import FakeApi
+
+
+class TestReconnectPolicy(unittest.TestCase):
+    def test_delay_is_capped_and_jittered(self):
+        policy = ReconnectPolicy(base_delay=1.0, max_delay=8.0, multiplier=2.0, jitter=0.5)
+        self.assertEqual([policy.delay(n, lambda: 0.0) for n in range(5)], [1.0, 2.0, 4.0, 8.0, 8.0])
+        self.assertEqual(policy.delay(2, lambda: 1.0), 2.0)
+        self.assertEqual(policy.delay(10_000, lambda: 0.0), 8.0)
+
+    def test_server_retry_is_a_floor(self):
+        policy = ReconnectPolicy(base_delay=1.0, max_delay=8.0, multiplier=2.0, jitter=0.5)
+        self.assertEqual([policy.delay(n, lambda: 0.0, floor=3.0) for n in range(3)], [3.0, 6.0, 8.0])
+        self.assertEqual(policy.delay(0, lambda: 1.0, floor=3.0), 3.0)
+        self.assertEqual(policy.delay(5, lambda: 0.0, floor=20.0), 20.0)
+
+
+class TestReconnectScheduler(unittest.TestCase):
+    def test_retries_until_connected_and_runs_checks_once_per_attempt(self):
+        outcomes = iter([False] * 5 + [True])
+        checks = []
+        done = threading.Event()
+
+        def check(reconnected):
+            checks.append(reconnected)
+            if reconnected:
+                done.set()
+
+        tracker = OutageTracker(ReconnectPolicy(base_delay=0.01))
+        scheduler = ReconnectScheduler(lambda timeout: next(outcomes), tracker, sleep=lambda _: None)
+        scheduler.add_check(check)
+        scheduler.trigger(sessions=3)
+        self.assertTrue(done.wait(5))
+
+        deadline = time.monotonic() + 5
+        while scheduler.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(scheduler.running)
+        self.assertEqual(checks, [False] * 5 + [True])
+        stats = tracker.stats()
+        self.assertEqual((stats.attempts, stats.outages, stats.recoveries), (6, 1, 1))
+        self.assertEqual(stats.sessions_affected, 3)
+        self.assertEqual(stats.status_checks, 6)
+        self.assertIsNone(stats.current_outage)
+
+
+class TestBatchedRecovery(unittest.TestCase):
+    def test_lost_sessions_are_checked_in_one_pass(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            client = CloudCruise(
+                CloudCruiseParams(
+                    api_key="k",
+                    encryption_key="a" * 64,
+                    base_url=api.base_url,
+                    reconnect=ReconnectPolicy(base_delay=0.05),
+                )
+            )
+            handles = [
+                client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+                for _ in range(5)
+            ]
+            time.sleep(0.2)
+            # No event ids were seen, so nothing can be resumed: the runs
+            # finished while the stream was down and are found by status
+            api.drop_streams()
+
+            deadline = time.monotonic() + 10
+            while not all(h.done for h in handles) and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            self.assertTrue(all(h.done for h in handles))
+            status_gets = [r for r in api.requests if r["method"] == "GET" and r["path"].startswith("/run/s-")]
+            self.assertEqual(len(status_gets), 5)
+            stats = client.runs.reconnect_stats()
+            self.assertEqual(stats.outages, 1)
+            self.assertEqual(stats.recoveries, 1)
+            self.assertEqual(stats.sessions_affected, 5)
+            self.assertEqual(stats.status_checks, 1)
+            self.assertEqual(client.runs._lost, {})
+
+
+    def test_reconnect_waits_for_the_server_retry_time(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            client = CloudCruise(
+                CloudCruiseParams(
+                    api_key="k",
+                    encryption_key="a" * 64,
+                    base_url=api.base_url,
+                    reconnect=ReconnectPolicy(base_delay=0.01, max_delay=0.01),
+                )
+            )
+            client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            api.send_retry(400)
+            outages = client._connection_manager._outages
+            deadline = time.monotonic() + 5
+            while outages.server_retry is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(outages.server_retry, 0.4)
+
+            api.drop_streams()
+            while client.runs.reconnect_stats().recoveries < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stats = client.runs.reconnect_stats()
+            self.assertEqual(stats.recoveries, 1)
+            self.assertGreaterEqual(stats.downtime, 0.4)
+            client.close()
+
+
+class TestClientClose(unittest.TestCase):
+    def test_close_cancels_pending_reconnects(self):
+        api = FakeApi().__enter__()
+        self.addCleanup(api.__exit__)
+        api.auto_events = False
+        params = CloudCruiseParams(
+            api_key="k",
+            encryption_key="a" * 64,
+            base_url=api.base_url,
+            reconnect=ReconnectPolicy(base_delay=0.05, max_delay=0.05, connect_timeout=1.0),
+        )
+        with CloudCruise(params) as client:
+            client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            reconnector = client._connection_manager._reconnector
+            # Stop accepting connections, then drop the stream: every
+            # reconnect attempt fails and schedules the next one
+            api.server.shutdown()
+            api.server.server_close()
+            api.drop_streams()
+            deadline = time.monotonic() + 5
+            while not reconnector.pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(reconnector.pending)
+
+        self.assertFalse(reconnector.pending)
+        self.assertFalse(reconnector.running)
+        attempts = client.runs.reconnect_stats().attempts
+        time.sleep(0.3)
+        self.assertEqual(client.runs.reconnect_stats().attempts, attempts)
+        self.assertFalse(reconnector.pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
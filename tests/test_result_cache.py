@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, ResultCacheOptions
+from cloudcruise.runs.cache import RunResultCache
+
+from fake_api import FakeApi
+
+
+def _result(session_id, status="execution.success", size=0):
+    return {"session_id": session_id, "status": status, "data": {"blob": "x" * size}}
+
+
+class TestRunResultCache(unittest.TestCase):
+    def test_only_final_results_are_cached(self):
+        cache = RunResultCache()
+        self.assertFalse(cache.store("s-1", _result("s-1", "execution.start")))
+        self.assertTrue(cache.store("s-2", _result("s-2", "execution.failed")))
+        self.assertIsNone(cache.get("s-1"))
+        hit = cache.get("s-2")
+        self.assertEqual(hit["status"], "execution.failed")
+        hit["status"] = "mutated"
+        self.assertEqual(cache.get("s-2")["status"], "execution.failed")
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (2, 1, 1))
+
+    def test_bounded_by_entries_and_bytes(self):
+        cache = RunResultCache(ResultCacheOptions(max_entries=3, max_bytes=2500))
+        for i in range(4):
+            cache.store(f"s-{i}", _result(f"s-{i}"))
+        self.assertIsNone(cache.get("s-0"))
+        self.assertIsNotNone(cache.get("s-1"))
+
+        cache.store("big-1", _result("big-1", size=1000))
+        cache.store("big-2", _result("big-2", size=1000))
+        stats = cache.stats()
+        self.assertLessEqual(stats.bytes, 2500)
+        self.assertIsNotNone(cache.get("big-2"))
+        self.assertFalse(cache.store("huge", _result("huge", size=5000)))
+        self.assertGreaterEqual(stats.evictions, 2)
+
+    def test_concurrent_fetches_share_one_call(self):
+        cache = RunResultCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return _result("s-1")
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.fetch("s-1", fetch))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r["status"] for r in results], ["execution.success"] * 8)
+        self.assertEqual(cache.stats().shared, 7)
+        cache.fetch("s-1", fetch)
+        self.assertEqual(len(calls), 1)
+
+    def test_async_fetches_share_one_task(self):
+        cache = RunResultCache()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return _result("s-1")
+
+        async def main():
+            return await asyncio.gather(*(cache.fetch_async("s-1", fetch) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(cache.stats().shared, 4)
+
+
+class TestRunsClientResultCache(unittest.TestCase):
+    def test_get_results_hits_the_cache_once_final(self):
+        with FakeApi() as api:
+            client = CloudCruise(
+                CloudCruiseParams(
+                    api_key="k", encryption_key="a" * 64, base_url=api.base_url, result_cache=ResultCacheOptions()
+                )
+            )
+            api.results["s-9"] = {"session_id": "s-9", "status": "execution.start"}
+            client.runs.get_results("s-9")
+            client.runs.get_results("s-9")
+            api.results["s-9"] = {"session_id": "s-9", "status": "execution.success", "data": {"ok": True}}
+            for _ in range(3):
+                self.assertEqual(client.runs.get_results("s-9")["data"], {"ok": True})
+
+            gets = [r for r in api.requests if r["path"] == "/run/s-9"]
+            self.assertEqual(len(gets), 3)
+            stats = client.runs.result_cache_stats()
+            self.assertEqual((stats.hits, stats.size), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cloudcruise import (
+    APIError,
+    CloudCruise,
+    CloudCruiseParams,
+    NotFoundError,
+    RetryPolicy,
+    ServerError,
+)
+from cloudcruise.errors import RateLimitError
+from cloudcruise.utils.retry import RetryState, parse_retry_after
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    script = []
+    calls = []
+
+    def _reply(self):
+        type(self).calls.append(self.command)
+        status, headers = type(self).script.pop(0) if type(self).script else (200, {})
+        body = json.dumps({"message": f"status {status}"}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRetry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _ScriptedHandler.calls = []
+        self.client = CloudCruise(
+            CloudCruiseParams(
+                api_key="k",
+                encryption_key="a" * 64,
+                base_url=self.base_url,
+                retry=RetryPolicy(max_attempts=3, backoff_base=0.01, backoff_max=0.02),
+            )
+        )
+
+    def test_get_retries_transient_status(self):
+        _ScriptedHandler.script = [(503, {}), (502, {}), (200, {})]
+        self.assertEqual(self.client.workflows.get_all_workflows(), {"message": "status 200"})
+        self.assertEqual(len(_ScriptedHandler.calls), 3)
+
+    def test_post_not_retried_on_server_error(self):
+        _ScriptedHandler.script = [(503, {}), (200, {})]
+        with self.assertRaises(ServerError) as ctx:
+            self.client.runs.interrupt("s-1")
+        self.assertEqual(ctx.exception.statusCode, 503)
+        self.assertEqual(_ScriptedHandler.calls, ["POST"])
+
+    def test_non_retryable_status_raises_typed_error(self):
+        _ScriptedHandler.script = [(404, {})]
+        with self.assertRaises(NotFoundError) as ctx:
+            self.client.runs.get_results("missing")
+        self.assertIsInstance(ctx.exception, APIError)
+        self.assertIsInstance(ctx.exception, RuntimeError)
+        self.assertEqual(str(ctx.exception), "status 404")
+        self.assertEqual(len(_ScriptedHandler.calls), 1)
+
+    def test_rate_limit_honours_retry_after_and_deadline(self):
+        state = RetryState(RetryPolicy(deadline=1.0), "POST")
+        err = RateLimitError("slow down", 429, retry_after=0.5)
+        self.assertGreaterEqual(state.next_delay(err), 0.5)
+        err = RateLimitError("slow down", 429, retry_after=5.0)
+        self.assertIsNone(state.next_delay(err))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
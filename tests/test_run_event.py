@@ -0,0 +1,73 @@
+import json
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, RunEvent, StartRunRequest
+
+from fake_api import FakeApi
+
+
+STEP = {
+    "event": "execution.step",
+    "payload": {"session_id": "s-1", "workflow_id": "wf", "current_step": "a", "next_step": "b"},
+    "timestamp": 5,
+}
+
+
+class TestRunEvent(unittest.TestCase):
+    def test_reads_as_envelope_and_flattened_event(self):
+        evt = RunEvent(STEP)
+        self.assertEqual(evt["event"], "run.event")
+        self.assertEqual(evt["data"]["event"], "execution.step")
+        self.assertEqual((evt["type"], evt["timestamp"], evt.get("expires_at")), ("execution.step", 5, None))
+        self.assertEqual(evt["_raw"], {"event": "run.event", "data": STEP})
+        self.assertEqual(evt.session_id, "s-1")
+        self.assertEqual(evt.step()["next_step"], "b")
+        self.assertIsNone(evt.ended())
+        self.assertFalse(evt.is_terminal)
+
+    def test_converts_to_plain_dicts(self):
+        evt = RunEvent.from_json(json.dumps(STEP))
+        self.assertIs(type(evt.to_dict()), dict)
+        self.assertEqual(evt.to_dict(), {"event": "run.event", "data": STEP})
+        self.assertEqual(json.loads(json.dumps(dict(evt)))["_raw"]["data"]["event"], "execution.step")
+
+    def test_immutable(self):
+        evt = RunEvent(STEP)
+        with self.assertRaises(AttributeError):
+            evt.type = "execution.success"
+        with self.assertRaises(AttributeError):
+            evt.extra = 1
+
+    def test_json_body_is_decoded_lazily(self):
+        evt = RunEvent.from_json(json.dumps(STEP), event_type="execution.step")
+        self.assertEqual(evt.type, "execution.step")
+        self.assertIsNone(evt._data)
+        self.assertEqual(evt.payload["current_step"], "a")
+        self.assertEqual(evt, RunEvent(STEP))
+
+    def test_type_survives_decoding_through_payload(self):
+        text = json.dumps({"data": {"event": "execution.success", "payload": {"session_id": "s-1"}}})
+        for read in (lambda e: e.payload, lambda e: e.data, lambda e: e["timestamp"]):
+            evt = RunEvent.from_json(text)
+            read(evt)
+            self.assertEqual(evt.type, "execution.success")
+            self.assertTrue(evt.is_terminal)
+            self.assertEqual(evt["type"], "execution.success")
+
+    def test_one_object_per_event_shared_by_listeners_and_iteration(self):
+        with FakeApi() as api:
+            client = CloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url))
+            handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            seen = []
+            handle.on("run.event", seen.append)
+            handle.on("execution.success", seen.append)
+            iterated = list(handle)
+            handle.wait(timeout=5)
+            final = iterated[-1]
+            self.assertIsInstance(final, RunEvent)
+            self.assertTrue(final.is_terminal)
+            self.assertEqual([e for e in seen if e is final], [final, final])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import unittest
+
+from cloudcruise import (
+    AsyncCloudCruise,
+    CancellationToken,
+    CloudCruise,
+    CloudCruiseParams,
+    RunCancelledError,
+    RunStreamOptions,
+    RunTimeoutError,
+    StartRunRequest,
+)
+
+from fake_api import FakeApi
+
+
+def _request():
+    return StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"})
+
+
+class TestRunTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeApi().__enter__()
+        self.addCleanup(self.api.__exit__)
+        self.api.auto_events = False
+        self.client = CloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=self.api.base_url))
+
+    def _interrupts(self):
+        return [r["path"] for r in self.api.requests if r["path"].endswith("/interrupt")]
+
+    def test_wait_timeout_raises_and_can_interrupt(self):
+        handle = self.client.runs.start(_request())
+        with self.assertRaises(RunTimeoutError) as ctx:
+            handle.wait(timeout=0.2)
+        self.assertFalse(ctx.exception.interrupted)
+        self.assertEqual(self._interrupts(), [])
+
+        with self.assertRaises(RunTimeoutError) as ctx:
+            handle.wait(timeout=0.2, interrupt_on_timeout=True)
+        self.assertEqual(ctx.exception.sessionId, handle.sessionId)
+        self.assertTrue(ctx.exception.interrupted)
+        self.assertEqual(self._interrupts(), [f"/run/{handle.sessionId}/interrupt"])
+
+    def test_wait_still_returns_results_before_timeout(self):
+        handle = self.client.runs.start(_request())
+        self.api.emit(handle.sessionId, "execution.success")
+        self.assertEqual(handle.wait(timeout=5)["status"], "execution.success")
+
+    def test_cancel_token_wakes_wait(self):
+        handle = self.client.runs.start(_request())
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel).start()
+        with self.assertRaises(RunCancelledError):
+            handle.wait(cancel_token=token)
+
+    def test_iteration_idle_timeout_from_options(self):
+        handle = self.client.runs.start(_request(), RunStreamOptions(idle_timeout=0.3, interrupt_on_timeout=True))
+        self.api.emit(handle.sessionId, "execution.start")
+        seen = []
+        with self.assertRaises(RunTimeoutError):
+            for msg in handle:
+                seen.append(msg["data"]["event"])
+        self.assertEqual(seen, ["execution.start"])
+        self.assertEqual(len(self._interrupts()), 1)
+
+    def test_cancel_token_stops_iteration(self):
+        handle = self.client.runs.start(_request())
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel).start()
+        with self.assertRaises(RunCancelledError):
+            list(handle.events(cancel_token=token))
+
+    def test_async_wait_timeout(self):
+        async def scenario(base_url):
+            async with AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=base_url)) as cc:
+                handle = await cc.runs.start(_request())
+                with self.assertRaises(RunTimeoutError):
+                    await handle.wait(timeout=0.2, interrupt_on_timeout=True)
+                handle = await cc.runs.start(_request())
+                with self.assertRaises(RunTimeoutError):
+                    async for _ in handle.events(idle_timeout=0.2):
+                        pass
+
+        asyncio.run(asyncio.wait_for(scenario(self.api.base_url), timeout=10))
+        self.assertEqual(len(self._interrupts()), 1)
+
+    def test_async_wait_surfaces_a_stream_timeout_as_is(self):
+        async def scenario(base_url):
+            async with AsyncCloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=base_url)) as cc:
+                handle = await cc.runs.start(_request())
+                stream_error = TimeoutError("SSE read timed out")
+                asyncio.get_running_loop().call_later(0.05, cc._connection_manager._emit_all, "error", stream_error)
+                with self.assertRaises(TimeoutError) as ctx:
+                    await handle.wait()
+                self.assertIs(ctx.exception, stream_error)
+
+        asyncio.run(asyncio.wait_for(scenario(self.api.base_url), timeout=10))
+
+
+if __name__ == "__main__":
+    unittest.main()
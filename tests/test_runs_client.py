@@ -0,0 +1,135 @@
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, RetryPolicy, RunStreamOptions, ServerError, StartRunRequest
+from cloudcruise.utils.rate_limit import RateLimiter
+from cloudcruise.workflows.types import InputValidationError
+
+from fake_api import FakeApi
+
+
+class TestRunsClient(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeApi().__enter__()
+        self.addCleanup(self.api.__exit__)
+        self.client = CloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=self.api.base_url))
+
+    def _posts(self):
+        return [r for r in self.api.requests if r["method"] == "POST" and r["path"] == "/run"]
+
+    def test_start_sends_generated_idempotency_key_header(self):
+        request = StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"})
+        handle = self.client.runs.start(request)
+        self.assertTrue(request.idempotency_key)
+        (post,) = self._posts()
+        self.assertEqual(post["headers"]["Idempotency-Key"], request.idempotency_key)
+        self.assertNotIn("idempotency_key", post["body"])
+        self.assertEqual(handle.wait()["status"], "execution.success")
+
+    def test_retried_start_reattaches_to_existing_session(self):
+        request = StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}, idempotency_key="key-1")
+        first = self.client.runs.start(request)
+        second = self.client.runs.start(request)
+        self.assertEqual(first.sessionId, second.sessionId)
+        self.assertEqual(len(self._posts()), 1)
+
+    def test_start_is_not_replayed_after_the_server_accepted_it(self):
+        self.api.fail_after_accept = 1
+        with self.assertRaises(ServerError):
+            self.client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+        self.assertEqual(len(self._posts()), 1)
+        self.assertEqual(len(self.api.results), 1)
+
+    def test_keyed_start_retries_are_opt_in(self):
+        client = CloudCruise(
+            CloudCruiseParams(
+                api_key="k",
+                encryption_key="a" * 64,
+                base_url=self.api.base_url,
+                retry=RetryPolicy(backoff_base=0.01, retry_idempotency_keyed=True),
+            )
+        )
+        self.api.fail_after_accept = 1
+        handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+        posts = self._posts()
+        self.assertEqual(len(posts), 2)
+        self.assertEqual(posts[0]["headers"]["Idempotency-Key"], posts[1]["headers"]["Idempotency-Key"])
+        self.assertEqual(handle.wait()["status"], "execution.success")
+
+    def test_start_reuses_cached_workflow_metadata(self):
+        for _ in range(3):
+            self.client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+        metadata_gets = [r for r in self.api.requests if r["path"] == "/workflows/wf/metadata"]
+        self.assertEqual(len(metadata_gets), 1)
+        self.assertEqual(len(self._posts()), 3)
+
+    def test_start_many_reports_per_item_failures(self):
+        requests = [
+            StartRunRequest(workflow_id="wf", run_input_variables={"url": str(i)}) for i in range(6)
+        ]
+        requests[2].run_input_variables = {}
+        results = list(self.client.runs.start_many(requests, max_concurrency=3))
+        self.assertEqual(sorted(r.index for r in results), list(range(6)))
+        failed = [r for r in results if not r.ok]
+        self.assertEqual([r.index for r in failed], [2])
+        self.assertIsInstance(failed[0].error, InputValidationError)
+        self.assertEqual(len(self._posts()), 5)
+        metadata_gets = [r for r in self.api.requests if r["path"] == "/workflows/wf/metadata"]
+        self.assertEqual(len(metadata_gets), 1)
+        ok = next(r for r in results if r.ok)
+        self.assertEqual(ok.handle.wait()["status"], "execution.success")
+
+    def test_as_completed_yields_each_run_once(self):
+        self.api.auto_events = False
+        handles = [self.client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"})) for _ in range(4)]
+        for handle in reversed(handles):
+            self.api.emit(handle.sessionId, "execution.success")
+        completed = list(self.client.runs.as_completed(handles + handles[:1], timeout=5, max_fetch_concurrency=2))
+        self.assertEqual(sorted(c.handle.sessionId for c in completed), sorted(h.sessionId for h in handles))
+        self.assertTrue(all(c.ok and c.result["status"] == "execution.success" for c in completed))
+
+    def test_wait_all_returns_input_order_and_times_out(self):
+        self.api.auto_events = False
+        handles = [self.client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"})) for _ in range(3)]
+        self.api.emit(handles[0].sessionId, "execution.success")
+        with self.assertRaises(TimeoutError):
+            self.client.runs.wait_all(handles, timeout=0.5)
+        for handle in handles[1:]:
+            self.api.emit(handle.sessionId, "execution.failed")
+        completed = self.client.runs.wait_all(handles, timeout=5)
+        self.assertEqual([c.handle for c in completed], handles)
+
+    def test_stream_buffer_bounds_come_from_options(self):
+        options = RunStreamOptions(max_buffered_events=1, overflow_policy="drop_oldest")
+        handle = self.client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}), options)
+        handle.wait(timeout=5)
+        self.assertEqual([m["data"]["event"] for m in handle], ["execution.success"])
+        stats = handle.buffer_stats()
+        self.assertEqual((stats.pushed, stats.dropped), (2, 1))
+
+    def test_coalescing_buffer_keys_run_events_by_type(self):
+        self.api.auto_events = False
+        options = RunStreamOptions(max_buffered_events=8, overflow_policy="coalesce")
+        handle = self.client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}), options)
+        self.api.emit(handle.sessionId, "execution.start")
+        self.api.emit(handle.sessionId, "execution.step", {"current_step": "a"})
+        self.api.emit(handle.sessionId, "execution.step", {"current_step": "b"})
+        self.api.emit(handle.sessionId, "execution.success")
+        handle.wait(timeout=5)
+        events = list(handle)
+        self.assertEqual([e.type for e in events], ["execution.start", "execution.step", "execution.success"])
+        self.assertEqual(events[1].payload["current_step"], "b")
+        stats = handle.buffer_stats()
+        self.assertEqual((stats.pushed, stats.coalesced), (4, 1))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_tokens_refill_at_rate(self):
+        now = [0.0]
+        limiter = RateLimiter(2, burst=2, clock=lambda: now[0])
+        self.assertEqual([limiter.reserve() for _ in range(3)], [0.0, 0.0, 0.5])
+        now[0] = 1.0
+        self.assertEqual(limiter.reserve(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
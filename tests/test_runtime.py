@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, StartRunRequest
+from cloudcruise.utils.runtime import Runtime, TimerWheel
+from cloudcruise.utils.sharded_connection_manager import ShardingOptions
+
+from fake_api import FakeApi
+
+
+class TestTimerWheel(unittest.TestCase):
+    def test_fires_in_order_across_levels(self):
+        wheel = TimerWheel(tick=1, slots=4, levels=3)
+        fired = []
+        for delay in (70, 1, 5, 17, 3, 200):
+            wheel.schedule(delay, lambda delay=delay: fired.append(delay))
+        wheel.schedule(10, lambda: fired.append("cancelled")).cancel()
+
+        for now in range(1, 260):
+            for callback in wheel.advance(now):
+                callback()
+        self.assertEqual(fired, [1, 3, 5, 17, 70, 200])
+        self.assertEqual(len(wheel), 0)
+
+    def test_never_fires_early(self):
+        wheel = TimerWheel(tick=0.5, now=100.0)
+        fired = []
+        wheel.schedule(1.2, lambda: fired.append(True))
+        self.assertEqual(wheel.advance(101.0), [])
+        for callback in wheel.advance(101.5):
+            callback()
+        self.assertEqual(fired, [True])
+
+    def test_idle_wheel_fast_forwards(self):
+        wheel = TimerWheel(tick=0.05)
+        self.assertEqual(wheel.advance(86400.0), [])
+        fired = []
+        wheel.schedule(0.1, lambda: fired.append(True))
+        for callback in wheel.advance(86400.1):
+            callback()
+        self.assertEqual(fired, [True])
+
+    def test_next_expiry_is_never_after_a_due_timer(self):
+        rng = random.Random(7)
+        wheel = TimerWheel(tick=1, slots=4, levels=3)
+        expected = []
+        for _ in range(40):
+            delay = rng.randint(1, 150)
+            expected.append(delay)
+            wheel.schedule(delay, lambda delay=delay: fired.append((delay, now)))
+        fired = []
+        now = 0
+        wakes = 0
+        while len(wheel):
+            now = wheel.next_expiry()
+            wakes += 1
+            for callback in wheel.advance(now):
+                callback()
+        self.assertEqual(sorted(fired), sorted((d, d) for d in expected))
+        self.assertLess(wakes, 150)
+        self.assertIsNone(wheel.next_expiry())
+
+
+class TestRuntime(unittest.TestCase):
+    def test_call_later_runs_on_io_thread_or_worker(self):
+        runtime = Runtime(tick=0.01)
+        names = []
+        done = threading.Event()
+
+        def second():
+            names.append(threading.current_thread().name)
+            done.set()
+
+        runtime.call_later(0.02, lambda: names.append(threading.current_thread().name))
+        runtime.call_later(0.05, second, blocking=True)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(names[0], "cloudcruise-io")
+        self.assertTrue(names[1].startswith("cloudcruise-worker"))
+        self.assertEqual(runtime.stats().timers_fired, 2)
+
+    def test_wheel_sleeps_until_the_next_deadline(self):
+        runtime = Runtime(tick=0.01)
+        done = threading.Event()
+        runtime.call_later(0.5, done.set)
+        self.assertTrue(done.wait(5))
+        early = threading.Event()
+        runtime.call_later(1.0, lambda: None)
+        started = time.monotonic()
+        runtime.call_later(0.05, early.set)
+        self.assertTrue(early.wait(5))
+        self.assertLess(time.monotonic() - started, 0.5)
+        # Polling every tick would have taken ~55 wake-ups by now
+        self.assertLess(runtime.stats().ticks, 12)
+
+    def test_streams_share_one_io_thread(self):
+        def reader_threads():
+            return sum(1 for t in threading.enumerate() if t.name == "cloudcruise-sse")
+
+        with FakeApi() as api:
+            before = reader_threads()
+            client = CloudCruise(
+                CloudCruiseParams(
+                    api_key="k",
+                    encryption_key="a" * 64,
+                    base_url=api.base_url,
+                    sharding=ShardingOptions(shards=4),
+                )
+            )
+            handles = [
+                client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+                for _ in range(8)
+            ]
+            for handle in handles:
+                self.assertEqual(handle.wait(timeout=10)["status"], "execution.success")
+
+            stats = client.runs.runtime_stats()
+            # Only shards that got a run open their stream; the runtime is shared
+            client_ids = {r["body"]["client_id"] for r in api.requests if r["path"] == "/run"}
+            self.assertGreater(len(client_ids), 1)
+            self.assertGreaterEqual(stats.streams, len(client_ids))
+            self.assertEqual(reader_threads(), before)
+            self.assertTrue(any(t.name == "cloudcruise-io" for t in threading.enumerate()))
+            self.assertGreaterEqual(stats.threads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import importlib.util
+import unittest
+
+import cloudcruise
+from cloudcruise.utils import serializer
+from cloudcruise.vault.utils import decrypt_data, encrypt_data
+
+KEY = "b" * 64
+BACKENDS = ["json"] + [name for name in ("orjson", "ujson") if importlib.util.find_spec(name)]
+
+
+class TestJsonBackends(unittest.TestCase):
+    def tearDown(self):
+        serializer.set_json_backend("auto")
+
+    def test_backends_agree(self):
+        value = {"name": "café ✓", "url": "https://x/y", "n": [1, 2.5, None, True]}
+        for name in BACKENDS:
+            backend = serializer.load_backend(name)
+            encoded = backend.dumps_bytes(value)
+            self.assertEqual(encoded, serializer.load_backend("json").dumps_bytes(value), name)
+            self.assertEqual(backend.loads(encoded), value, name)
+            self.assertEqual(backend.loads(encoded.decode("utf-8")), value, name)
+
+    def test_values_fast_encoders_reject_fall_back_to_stdlib(self):
+        for name in BACKENDS:
+            backend = serializer.load_backend(name)
+            self.assertEqual(backend.loads(backend.dumps({1: 2**70})), {"1": 2**70}, name)
+
+    def test_wide_integers_decode_exactly(self):
+        text = '{"id": 123456789012345678901234567890, "low": -9223372036854775809, "ok": 18446744073709551615}'
+        expected = {"id": 123456789012345678901234567890, "low": -9223372036854775809, "ok": 18446744073709551615}
+        for name in BACKENDS:
+            backend = serializer.load_backend(name)
+            self.assertEqual(backend.loads(text), expected, name)
+            self.assertEqual(backend.loads(text.encode("utf-8")), expected, name)
+            with self.assertRaises(ValueError):
+                backend.loads("{nope")
+
+    def test_vault_payloads_decrypt_across_backends(self):
+        for writer in BACKENDS:
+            serializer.set_json_backend(writer)
+            secret = encrypt_data({"password": "pä$$"}, KEY)
+            for reader in BACKENDS:
+                serializer.set_json_backend(reader)
+                self.assertEqual(decrypt_data(secret, KEY), {"password": "pä$$"})
+
+    def test_selection(self):
+        self.assertEqual(cloudcruise.set_json_backend("json").name, "json")
+        self.assertEqual(serializer.get_json_backend().name, "json")
+        self.assertEqual(serializer.load_backend("auto").name, BACKENDS[1] if len(BACKENDS) > 1 else "json")
+        with self.assertRaises(ValueError):
+            serializer.load_backend("simdjson")
+        for name in ("orjson", "ujson"):
+            if name not in BACKENDS:
+                with self.assertRaises(ImportError):
+                    serializer.load_backend(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, ServerError, ShardingOptions, StartRunRequest
+from cloudcruise.utils.sharded_connection_manager import HashRing
+
+from fake_api import FakeApi
+
+
+def _request() -> StartRunRequest:
+    return StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"})
+
+
+class TestHashRing(unittest.TestCase):
+    def test_adding_a_shard_moves_few_keys(self):
+        ring = HashRing()
+        for shard in range(4):
+            ring.add(shard)
+        keys = [f"key-{i}" for i in range(4000)]
+        before = {k: ring.node_for(k) for k in keys}
+        counts = [list(before.values()).count(shard) for shard in range(4)]
+        self.assertTrue(all(600 < n < 1400 for n in counts), counts)
+
+        ring.add(4)
+        moved = [k for k in keys if ring.node_for(k) != before[k]]
+        # Only keys claimed by the new shard move
+        self.assertTrue(all(ring.node_for(k) == 4 for k in moved))
+        self.assertLess(len(moved), 1400)
+
+
+class TestShardedStreams(unittest.TestCase):
+    def test_runs_spread_over_shards(self):
+        with FakeApi() as api:
+            params = CloudCruiseParams(
+                api_key="k", encryption_key="a" * 64, base_url=api.base_url, sharding=ShardingOptions(shards=3)
+            )
+            client = CloudCruise(params)
+            handles = [client.runs.start(_request()) for _ in range(12)]
+            for handle in handles:
+                self.assertEqual(handle.wait(timeout=10)["status"], "execution.success")
+
+            client_ids = {r["body"]["client_id"] for r in api.requests if r["path"] == "/run"}
+            self.assertGreater(len(client_ids), 1)
+            self.assertEqual(set(api.stream_clients()), client_ids)
+            stats = client.runs.shard_stats()
+            self.assertEqual(len(stats), 3)
+            self.assertEqual(sum(s.events for s in stats), 24)
+
+    def test_scale_out_adds_shards(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            sharding = ShardingOptions(shards=1, max_shards=3, scale_out_sessions=2)
+            client = CloudCruise(
+                CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url, sharding=sharding)
+            )
+            handles = [client.runs.start(_request()) for _ in range(8)]
+            self.assertEqual(len(client.runs.shard_stats()), 3)
+            for handle in handles:
+                api.emit(handle.sessionId, "execution.success")
+            for handle in handles:
+                self.assertEqual(handle.wait(timeout=10)["status"], "execution.success")
+
+    def test_retried_start_keeps_its_shard_across_scale_out(self):
+        grown = HashRing()
+        for shard in range(3):
+            grown.add(shard)
+        # A key the grown ring would move off the first shard
+        key = next(f"key-{i}" for i in range(100) if grown.node_for(f"key-{i}") != 0)
+
+        with FakeApi() as api:
+            api.auto_events = False
+            sharding = ShardingOptions(shards=1, max_shards=3, scale_out_sessions=1)
+            client = CloudCruise(
+                CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url, sharding=sharding)
+            )
+            api.fail_after_accept = 1
+            request = StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}, idempotency_key=key)
+            with self.assertRaises(ServerError):
+                client.runs.start(request)
+            for _ in range(4):
+                client.runs.start(_request())
+            self.assertEqual(len(client.runs.shard_stats()), 3)
+
+            handle = client.runs.start(request)
+            first, retry = [r["body"]["client_id"] for r in api.requests if r["headers"].get("Idempotency-Key") == key]
+            self.assertEqual(retry, first)
+            api.emit(handle.sessionId, "execution.success")
+            self.assertEqual(handle.wait(timeout=10)["status"], "execution.success")
+
+
+if __name__ == "__main__":
+    unittest.main()
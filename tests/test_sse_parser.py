@@ -0,0 +1,55 @@
+import json
+import unittest
+
+from cloudcruise.utils.sse import SSEParser
+
+
+def _feed_all(parser, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+class TestSSEParser(unittest.TestCase):
+    def test_byte_by_byte_matches_single_chunk(self):
+        stream = (
+            'event: run.event\ndata: {"event": "execution.start", "note": "café ✓"}\n\n'
+            ": keep-alive\n\n"
+            "data: line one\ndata: line two\n\n"
+        ).encode("utf-8")
+        whole = SSEParser().feed(stream)
+        split = _feed_all(SSEParser(), [stream[i : i + 1] for i in range(len(stream))])
+        self.assertEqual(whole, split)
+        self.assertEqual([e["event"] for e in whole], ["run.event", "message"])
+        self.assertEqual(whole[0]["data"]["note"], "café ✓")
+        self.assertEqual(whole[1]["data"], "line one\nline two")
+
+    def test_line_endings(self):
+        parser = SSEParser()
+        events = _feed_all(parser, [b"data: 1\r", b"\n\r", b"\ndata: 2\r\r", b"data: 3\n", b"\n"])
+        self.assertEqual([e["data"] for e in events], [1, 2, 3])
+
+    def test_last_event_id_persists_and_retry_is_parsed(self):
+        parser = SSEParser()
+        events = parser.feed(b"id: 7\nretry: 2500\ndata: {}\n\ndata: {}\n\nid\ndata: {}\n\nretry: x\n\n")
+        self.assertEqual([e["id"] for e in events], ["7", None, ""])
+        self.assertEqual(events[0]["retry"], 2500)
+        self.assertIsNone(events[1]["retry"])
+        self.assertEqual((parser.last_event_id, parser.retry), ("", 2500))
+
+    def test_only_one_leading_space_is_stripped(self):
+        (evt,) = SSEParser().feed(b"data:  padded\n\n")
+        self.assertEqual(evt["data"], " padded")
+
+    def test_large_frame_in_many_chunks(self):
+        payload = json.dumps({"blob": "x" * 200_000}).encode()
+        frame = b"data: " + payload + b"\n\n"
+        parser = SSEParser()
+        events = _feed_all(parser, [frame[i : i + 1000] for i in range(0, len(frame), 1000)])
+        self.assertEqual(len(events), 1)
+        self.assertEqual(len(events[0]["data"]["blob"]), 200_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
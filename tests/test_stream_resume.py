@@ -0,0 +1,53 @@
+import threading
+import unittest
+
+from cloudcruise import CloudCruise, CloudCruiseParams, StartRunRequest
+from cloudcruise.utils.connection_manager import EventResume
+
+from fake_api import FakeApi
+
+
+class TestEventResume(unittest.TestCase):
+    def test_dedup_and_gap_counting(self):
+        resume = EventResume()
+        self.assertEqual(resume.request_headers(), {})
+        self.assertEqual([resume.accept(i) for i in ["1", "2", "2", "5", None]], [True, True, False, True, True])
+        self.assertEqual(resume.request_headers(), {"Last-Event-ID": "5"})
+        stats = resume.stats()
+        self.assertEqual(
+            (stats.reconnects, stats.resumed, stats.duplicates, stats.gaps, stats.missed_events),
+            (1, 1, 1, 1, 2),
+        )
+
+
+class TestStreamResume(unittest.TestCase):
+    def test_reconnect_resumes_from_last_event_id(self):
+        with FakeApi() as api:
+            api.auto_events = False
+            api.replay_overlap = 1
+            client = CloudCruise(CloudCruiseParams(api_key="k", encryption_key="a" * 64, base_url=api.base_url))
+            handle = client.runs.start(StartRunRequest(workflow_id="wf", run_input_variables={"url": "x"}))
+            started = threading.Event()
+            handle.on("execution.start", lambda _: started.set())
+            steps = []
+            handle.on("execution.step", lambda evt: steps.append(evt))
+            api.emit(handle.sessionId, "execution.start")
+            self.assertTrue(started.wait(5))
+
+            api.drop_streams()
+            api.emit(handle.sessionId, "execution.step")
+            api.emit(handle.sessionId, "execution.success")
+            result = handle.wait(timeout=10)
+
+            self.assertEqual(result["status"], "execution.success")
+            self.assertEqual(len(steps), 1)
+            self.assertEqual(api.stream_headers()[-1].get("Last-Event-ID"), "1")
+            stats = client.runs.resume_stats()
+            self.assertEqual((stats.reconnects, stats.resumed, stats.duplicates), (1, 1, 1))
+            # Only the final result fetch; the outage did not trigger a per-session poll
+            result_gets = [r for r in api.requests if r["method"] == "GET" and r["path"] == f"/run/{handle.sessionId}"]
+            self.assertEqual(len(result_gets), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cloudcruise import AsyncCloudCruise, CloudCruise, CloudCruiseParams, TransportOptions
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith(("/slow", "/run/")):
+            time.sleep(0.3)
+        body = json.dumps({"path": self.path, "key": self.headers.get("cc-key")}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _params(self, **options):
+        return CloudCruiseParams(
+            api_key="k",
+            encryption_key="a" * 64,
+            base_url=self.base_url,
+            transport=TransportOptions(**options),
+        )
+
+    def _client(self, **options):
+        return CloudCruise(self._params(**options))
+
+    def _concurrent_gets(self, client, path, n=10):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client._make_request("GET", path))) for _ in range(n)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_keep_alive_reuses_connection(self):
+        client = self._client()
+        for _ in range(5):
+            self.assertEqual(client.workflows.get_all_workflows(), {"path": "/workflows", "key": "k"})
+        stats = client.transport.stats()
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.new_connections, 1)
+        self.assertEqual(stats.reused_connections, 4)
+
+    def test_keep_alive_disabled_opens_new_connections(self):
+        client = self._client(keep_alive=False)
+        for _ in range(3):
+            client.workflows.get_all_workflows()
+        stats = client.transport.stats()
+        self.assertGreaterEqual(stats.new_connections, 3)
+        self.assertEqual(stats.reused_connections, 0)
+
+    def test_concurrent_identical_gets_are_coalesced(self):
+        client = self._client()
+        results = self._concurrent_gets(client, "/slow/metadata")
+        self.assertEqual(results, [{"path": "/slow/metadata", "key": "k"}] * 10)
+        stats = client.transport.stats()
+        self.assertEqual(stats.requests, 1)
+        self.assertEqual(stats.coalesced, 9)
+
+        # Nothing is cached once the request has returned
+        client._make_request("GET", "/slow/metadata")
+        self.assertEqual(client.transport.stats().requests, 2)
+
+    def test_coalesced_callers_get_their_own_copy(self):
+        client = self._client()
+        results = self._concurrent_gets(client, "/slow/metadata", n=4)
+        self.assertEqual(client.transport.stats().coalesced, 3)
+        results[0]["path"] = "mutated"
+        self.assertEqual([r["path"] for r in results[1:]], ["/slow/metadata"] * 3)
+        self.assertEqual(len({id(r) for r in results}), 4)
+
+    def test_run_statuses_are_not_coalesced_by_default(self):
+        client = self._client()
+        self._concurrent_gets(client, "/run/s-1", n=3)
+        self.assertEqual(client.transport.stats().coalesced, 0)
+        self.assertEqual(client.transport.stats().requests, 3)
+
+    def test_coalescing_opt_out_by_path(self):
+        client = self._client(coalesce_exclude=("/slow",))
+        self._concurrent_gets(client, "/slow/live", n=4)
+        self.assertEqual(client.transport.stats().requests, 4)
+        self.assertEqual(client.transport.stats().coalesced, 0)
+
+    def test_async_identical_gets_are_coalesced(self):
+        async def main():
+            async with AsyncCloudCruise(self._params()) as client:
+                results = await asyncio.gather(*(client._make_request("GET", "/slow/run") for _ in range(5)))
+                return results, client.transport.stats()
+
+        results, stats = asyncio.run(main())
+        self.assertEqual(len(results), 5)
+        self.assertEqual((stats.requests, stats.coalesced), (1, 4))
+        self.assertEqual(len({id(r) for r in results}), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
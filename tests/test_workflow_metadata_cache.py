@@ -0,0 +1,68 @@
+import unittest
+
+from requests.structures import CaseInsensitiveDict
+
+from cloudcruise.utils.transport import ApiResponse
+from cloudcruise.workflows.cache import WorkflowMetadataCache
+from cloudcruise.workflows.client import WorkflowsClient
+
+from fake_clock import FakeClock
+
+META = {"input_schema": {"type": "object", "properties": {"url": {"type": "string"}}}}
+
+
+class TestWorkflowMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.clock = FakeClock()
+        self.on_request = None
+
+        def make_request(method, path, body=None, headers=None, raw=False):
+            self.calls.append(headers or {})
+            if self.on_request:
+                self.on_request(headers or {})
+            if (headers or {}).get("If-None-Match") == '"v1"':
+                return ApiResponse(304, {}, "")
+            return ApiResponse(200, CaseInsensitiveDict({"ETag": '"v1"'}), META)
+
+        self.client = WorkflowsClient(make_request)
+        self.client._metadata_cache = WorkflowMetadataCache(ttl=60, clock=self.clock)
+
+    def test_fresh_entries_skip_the_network(self):
+        for _ in range(3):
+            self.client.validate_workflow_input("wf", {"url": "x"})
+        self.assertEqual(len(self.calls), 1)
+        stats = self.client.metadata_cache_stats()
+        self.assertEqual((stats.hits, stats.misses), (2, 1))
+
+    def test_stale_entries_revalidate_with_etag(self):
+        self.client.get_workflow_metadata("wf")
+        self.clock.now = 61
+        self.assertEqual(self.client.get_workflow_metadata("wf"), META)
+        self.assertEqual(self.calls[-1], {"If-None-Match": '"v1"'})
+        self.assertEqual(self.client.metadata_cache_stats().not_modified, 1)
+        # A 304 renews the TTL
+        self.client.get_workflow_metadata("wf")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_invalidate_forces_full_fetch(self):
+        self.client.get_workflow_metadata("wf")
+        self.client.invalidate_metadata("wf")
+        self.client.get_workflow_metadata("wf")
+        self.assertEqual(self.calls, [{}, {}])
+        self.assertEqual(self.client.metadata_cache_stats().invalidations, 1)
+
+    def test_not_modified_after_concurrent_invalidate_refetches(self):
+        self.client.get_workflow_metadata("wf")
+        self.clock.now = 61
+        self.on_request = lambda headers: headers and self.client.invalidate_metadata("wf")
+        self.assertEqual(self.client.get_workflow_metadata("wf"), META)
+        self.assertEqual(self.calls, [{}, {"If-None-Match": '"v1"'}, {}])
+        self.on_request = None
+        self.clock.now = 62
+        self.assertEqual(self.client.get_workflow_metadata("wf"), META)
+        self.assertEqual(len(self.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 
 from cloudcruise.workflows.client import WorkflowsClient
 from cloudcruise.workflows.types import WorkflowMetadata, WorkflowInputSchema, InputValidationError
+from cloudcruise.workflows.validation import CompiledInputValidator
 
 class _FakeClient(WorkflowsClient):
     def __init__(self):
@@ -36,5 +37,143 @@ class TestWorkflowValidation(unittest.TestCase):
         with self.assertRaises(InputValidationError):
             c.validate_workflow_input("wf-1", {"url": "x", "extra": 1})
 
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"url": {"type": "string"}, "attempts": {"type": "number"}},
+    "required": ["url"],
+    "additionalProperties": False,
+}
+
+
+class TestCompiledInputValidator(unittest.TestCase):
+    def test_check_returns_none_for_valid_payload(self):
+        validator = CompiledInputValidator(SCHEMA)
+        self.assertIsNone(validator.check({"url": "x", "attempts": 2}))
+
+    def test_validate_raises_with_details(self):
+        validator = CompiledInputValidator(SCHEMA)
+        with self.assertRaises(InputValidationError) as ctx:
+            validator.validate({"attempts": "two", "extra": 1})
+        err = ctx.exception
+        self.assertEqual(err.missingRequired, ["url"])
+        self.assertEqual([d.field for d in err.invalidTypes], ["attempts"])
+        self.assertEqual(err.unknownKeys, ["extra"])
+
+
+NESTED = {
+    "type": "object",
+    "definitions": {
+        "address": {
+            "type": "object",
+            "properties": {
+                "zip": {"type": "string", "pattern": "^[0-9]{5}$"},
+                "country": {"enum": ["US", "CA"]},
+            },
+            "required": ["zip"],
+            "additionalProperties": False,
+        },
+        "node": {"type": "object", "properties": {"children": {"type": "array", "items": {"$ref": "#/definitions/node"}}}},
+    },
+    "properties": {
+        "email": {"type": "string", "format": "email"},
+        "name": {"type": "string", "minLength": 2, "maxLength": 5},
+        "address": {"$ref": "#/definitions/address"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "tree": {"$ref": "#/definitions/node"},
+    },
+}
+
+
+class TestNestedSchemas(unittest.TestCase):
+    def setUp(self):
+        self.validator = CompiledInputValidator(NESTED)
+
+    def test_valid_nested_payload(self):
+        payload = {
+            "email": "a@b.co",
+            "name": "abc",
+            "address": {"zip": "12345", "country": "US"},
+            "tags": ["x", "y"],
+            "tree": {"children": [{"children": []}]},
+        }
+        self.assertIsNone(self.validator.check(payload))
+
+    def test_nested_errors_are_reported_with_paths(self):
+        err = self.validator.check({
+            "email": "nope",
+            "name": "a",
+            "address": {"country": "MX", "street": "Main"},
+            "tags": ["x", 3],
+            "tree": {"children": [{"children": "leaf"}]},
+        })
+        self.assertEqual(err.missingRequired, ["address.zip"])
+        self.assertEqual(err.unknownKeys, ["address.street"])
+        self.assertEqual(
+            [(d.field, d.actual) for d in err.invalidTypes],
+            [("tags[1]", "integer"), ("tree.children[0].children", "string")],
+        )
+        self.assertEqual(
+            [(d.field, d.constraint) for d in err.invalidValues],
+            [("email", "format"), ("name", "minLength"), ("address.country", "enum")],
+        )
+
+    def test_pattern_and_max_length(self):
+        err = self.validator.check({"name": "toolong", "address": {"zip": "1234"}})
+        self.assertEqual(
+            [(d.field, d.constraint) for d in err.invalidValues],
+            [("name", "maxLength"), ("address.zip", "pattern")],
+        )
+
+    def test_enum_distinguishes_booleans_from_integers(self):
+        validator = CompiledInputValidator({"properties": {"flag": {"enum": [1, 2]}}})
+        self.assertIsNone(validator.check({"flag": 1}))
+        self.assertEqual(validator.check({"flag": True}).invalidValues[0].constraint, "enum")
+
+    def test_unsupported_refs_and_patterns_accept_anything(self):
+        validator = CompiledInputValidator({
+            "properties": {
+                "remote": {"$ref": "https://example.com/schemas/address.json"},
+                "dangling": {"$ref": "#/definitions/missing"},
+                "code": {"type": "string", "pattern": "^\\p{L}+$"},
+                "zip": {"type": "string", "pattern": "^[0-9]{5}$"},
+            },
+            "required": ["zip"],
+        })
+        self.assertIsNone(validator.check({"remote": 1, "dangling": [], "code": "123", "zip": "12345"}))
+        err = validator.check({"code": 5, "zip": "1"})
+        self.assertEqual(err.missingRequired, [])
+        self.assertEqual([d.field for d in err.invalidTypes], ["code"])
+        self.assertEqual([d.field for d in err.invalidValues], ["zip"])
+
+
+class TestValidateMany(unittest.TestCase):
+    def setUp(self):
+        self.schema = dict(SCHEMA)
+        self.calls = 0
+
+        def make_request(method, path, body=None, headers=None, raw=False):
+            self.calls += 1
+            return {"input_schema": self.schema}
+
+        self.client = WorkflowsClient(make_request)
+
+    def test_returns_one_result_per_payload(self):
+        results = self.client.validate_many("wf", [{"url": "a"}, {}, {"url": 1}])
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1].missingRequired, ["url"])
+        self.assertEqual(results[2].invalidTypes[0].actual, "integer")
+        self.assertEqual(self.calls, 1)
+
+    def test_validator_is_compiled_once_per_schema(self):
+        first = self.client.get_input_validator("wf")
+        self.assertIs(self.client.get_input_validator("wf"), first)
+        self.client.invalidate_metadata("wf")
+        self.schema = dict(SCHEMA, required=[])
+        second = self.client.get_input_validator("wf")
+        self.assertIsNot(second, first)
+        self.assertIsNone(second.check({}))
+
+
 if __name__ == "__main__":
     unittest.main()